@@ -0,0 +1,53 @@
+"""
+Benchmark: startup time of the `nameof` call sites in a long function without the persistent cache, with a cold cache
+and with a warm cache. Every run is a new process.
+
+Run: python benchmarks/bench_analysiscache.py [sites] [lines]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+_CHILD = """
+import sys, time
+from pymagic9 import enablecache, nameof, savecache
+
+sites, lines, mode, path = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3], sys.argv[4]
+source = "def sites(nameof):\\n    x = 1\\n" + "    y = 2\\n" * lines + "    y = nameof(x)\\n" * sites
+namespace = {}
+exec(compile(source, "<sites>", "exec"), namespace)
+
+start = time.perf_counter()
+if mode != "none":
+    enablecache(path)
+
+namespace["sites"](nameof)
+end = time.perf_counter()
+if mode != "none":
+    savecache()
+
+print("%.3f" % ((end - start) * 1e3))
+"""
+
+
+def _run(sites, lines, mode, path):
+    output = subprocess.check_output([sys.executable, "-c", _CHILD, str(sites), str(lines), mode, path],
+                                     universal_newlines=True)
+    return float(output)
+
+
+def main(sites=50, lines=2000):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "pymagic9.cache")
+    try:
+        for mode in ("none", "cold", "warm"):
+            elapsed = _run(sites, lines, mode, path)
+            print("%-5s %d nameof call sites after %d lines: %8.3f ms" % (mode, sites, lines, elapsed))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,70 @@
+"""
+Benchmark: `isfunctionincallchain` walking the frames versus the `sys.monitoring` tracker of `trackcallchain` at
+various depths of the call stack, and the cost of the tracking for the calls of a tracked function (the rate of calls)
+and of an untracked one. The tracker requires Python 3.12+.
+
+Run: python3.12 benchmarks/bench_callchain.py [queries] [calls]
+"""
+import sys
+import time
+
+from pymagic9 import isfunctionincallchain, trackcallchain, untrackcallchain
+
+
+def root(depth, func, *args):
+    return _level(depth - 1, func, *args)
+
+
+def _level(depth, func, *args):
+    return _level(depth - 1, func, *args) if depth > 1 else func(*args)
+
+
+def _queries(n):
+    start = time.perf_counter()
+    for _ in range(n):
+        isfunctionincallchain(root)
+
+    return time.perf_counter() - start
+
+
+def tracked():
+    pass
+
+
+def untracked():
+    pass
+
+
+def _calls(func, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+
+    return time.perf_counter() - start
+
+
+def main(queries=10000, calls=1000000):
+    monitoring = hasattr(sys, "monitoring")
+    for depth in (10, 100, 500):
+        walk = root(depth, _queries, queries)
+        line = "depth %-4d frame walk %8.3f us per query" % (depth, walk / queries * 1e6)
+        if monitoring:
+            trackcallchain(root)
+            assert root(depth, isfunctionincallchain, root)
+            monitor = root(depth, _queries, queries)
+            untrackcallchain(root)
+            line += "   tracker %8.3f us per query  x%.1f" % (monitor / queries * 1e6, walk / monitor)
+
+        print(line)
+
+    if monitoring:
+        before = _calls(tracked, calls)
+        trackcallchain(tracked)
+        after, other = _calls(tracked, calls), _calls(untracked, calls)
+        untrackcallchain(tracked)
+        print("calls      untracked %8.3f us per call   tracked %8.3f us per call   other code while tracking "
+              "%8.3f us per call" % (before / calls * 1e6, after / calls * 1e6, other / calls * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,50 @@
+"""
+Benchmark: caller identity helpers versus `inspect.stack()[1]` and `logging.Logger.findCaller`.
+
+Run: python benchmarks/bench_caller.py [depth]
+"""
+import inspect
+import logging
+import sys
+import timeit
+
+from pymagic9 import callerlocation, callermodule, callername
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _at_depth(depth, func):
+    if depth <= 1:
+        return func()
+
+    return _at_depth(depth - 1, func)
+
+
+def _inspect():
+    caller = inspect.stack()[1]
+    return caller.function, caller.frame.f_globals.get('__name__'), (caller.filename, caller.lineno)
+
+
+def _pymagic9():
+    return callername(), callermodule(), callerlocation()
+
+
+def _pymagic9_qualified():
+    return callername(qualified=True), callermodule(), callerlocation()
+
+
+def main(depth=50, number=2000):
+    cases = [
+        ('recursion only', lambda: None, number),
+        ('inspect.stack()[1]', _inspect, number // 100),
+        ('Logger.findCaller', _LOGGER.findCaller, number),
+        ('pymagic9', _pymagic9, number),
+        ('pymagic9 (qualified)', _pymagic9_qualified, number),
+    ]
+    for name, func, n in cases:
+        elapsed = min(timeit.repeat(lambda: _at_depth(depth, func), number=n, repeat=5))
+        print("%-22s %10.2f us per call at depth %d" % (name, elapsed / n * 1e6, depth))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
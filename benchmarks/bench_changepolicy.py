@@ -0,0 +1,55 @@
+"""
+Benchmark: assignment of large containers and arrays to auto-properties under each change policy.
+
+Run: python benchmarks/bench_changepolicy.py [size]
+"""
+import sys
+import timeit
+
+from pymagic9 import PropertyMeta
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _make_class(policy):
+    class Holder(metaclass=PropertyMeta):
+        __changepolicy__ = policy
+
+        value = property(..., ...)
+
+    return Holder
+
+
+def main(size=100000, number=200):
+    values = {
+        'list': lambda: list(range(size)),
+        'dict': lambda: dict.fromkeys(range(size)),
+    }
+    if numpy is not None:
+        values['ndarray'] = lambda: numpy.arange(size)
+
+    for kind, factory in sorted(values.items()):
+        first, second = factory(), factory()  # equal, but not identical values
+        for policy in ('equality', 'identity', 'always'):
+            holder = _make_class(policy)()
+            holder.value = first
+
+            def assign():
+                holder.value = second
+                holder.value = first
+
+            try:
+                assign()
+            except ValueError as e:  # the truth value of an array is ambiguous
+                print("%-8s %-9s %s" % (kind, policy, e))
+                continue
+
+            elapsed = min(timeit.repeat(assign, number=number, repeat=5))
+            print("%-8s %-9s %10.2f us per assignment" % (kind, policy, elapsed / number / 2 * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,47 @@
+"""
+Benchmark: definition of 10k PropertyMeta subclasses that inherit and lightly override auto-properties.
+
+Run: python benchmarks/bench_classcreation.py [classes]
+"""
+import sys
+import time
+
+from pymagic9 import PropertyMeta
+
+
+class Base(metaclass=PropertyMeta):
+    def __init__(self, a):
+        self.a = a
+
+    a = property(...)
+    b = property(..., ...)
+    c = property(..., ...)
+
+
+def hook(self, value):
+    pass
+
+
+def _define(count, attrs):
+    start = time.perf_counter()
+    for i in range(count):
+        PropertyMeta('Sub%d' % i, (Base,), attrs())
+
+    return time.perf_counter() - start
+
+
+def main(count=10000):
+    cases = [
+        ('inherited', lambda: {}),
+        ('redeclared', lambda: {'b': property(..., ...)}),
+        ('overridden', lambda: {'b': property(..., hook)}),
+        ('new', lambda: {'d': property(..., ...), 'e': property(..., hook)}),
+    ]
+    for name, attrs in cases:
+        elapsed = _define(count, attrs)
+        print("%-10s %8.2f ms for %d classes (%6.2f us per class)"
+              % (name, elapsed * 1e3, count, elapsed / count * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,64 @@
+"""
+Benchmark: copying objects with `clone` and `copy.copy` versus reconstructing them through the constructor, for a class
+with a `__dict__` and for a class with `__slots__` (the values of its auto-implemented properties are kept outside of
+the instances, which keep them referenced, so both the constructor and the copies are dominated by the growth of the
+dictionaries of the values).
+
+Run: python benchmarks/bench_clone.py [objects]
+"""
+import copy
+import sys
+import time
+
+from pymagic9 import PropertyMeta
+
+
+def _init(self, name, email, age, active):
+    self.name, self.email, self.age, self.active = name, email, age, active
+
+
+def _make_class(name, **options):
+    namespace = dict(options, __init__=_init, name=property(...), email=property(...), age=property(..., ...),
+                     active=property(..., ...))
+    return PropertyMeta(name, (object, ), namespace)
+
+
+User = _make_class("User")
+SlottedUser = _make_class("SlottedUser", __slots__=())
+
+
+def _constructor(user, n):
+    cls = type(user)
+    for _ in range(n):
+        cls(user.name, user.email, user.age, user.active)
+
+
+def _clone(user, n):
+    for _ in range(n):
+        user.clone()
+
+
+def _clone_override(user, n):
+    for _ in range(n):
+        user.clone(age=42)
+
+
+def _copy(user, n):
+    for _ in range(n):
+        copy.copy(user)
+
+
+def main(n=1000000):
+    for cls in (User, SlottedUser):
+        user = cls("ann", "ann@example.com", 30, True)
+        for name, func in (("constructor", _constructor), ("clone()", _clone), ("clone(age=42)", _clone_override),
+                           ("copy.copy", _copy)):
+            start = time.perf_counter()
+            func(user, n)
+            elapsed = time.perf_counter() - start
+            print("%-11s %-13s %d objects: %7.3f s  %6.3f us per object" % (cls.__name__, name, n, elapsed,
+                                                                            elapsed / n * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,54 @@
+"""
+Benchmark: a derived property as a plain property recomputed on every read and as a computed auto-property kept until
+its dependencies change, for read-heavy and write-heavy mixes of operations.
+
+Run: python benchmarks/bench_computed.py [operations]
+"""
+import sys
+import time
+
+from pymagic9 import PropertyMeta
+
+
+def _full_name(self):
+    return " ".join(part.strip().title() for part in (self.first, self.middle, self.last) if part)
+
+
+class Plain(metaclass=PropertyMeta):
+    first = property(..., ...)
+    middle = property(..., ...)
+    last = property(..., ...)
+    full_name = property(_full_name)
+
+
+class Computed(metaclass=PropertyMeta):
+    __computed__ = {"full_name": ("first", "middle", "last")}
+
+    first = property(..., ...)
+    middle = property(..., ...)
+    last = property(..., ...)
+    full_name = property(_full_name)
+
+
+def _mix(cls, n, reads):
+    person = cls()
+    person.first, person.middle, person.last = "ada", "augusta", "lovelace"
+    start = time.perf_counter()
+    for i in range(n // (reads + 1)):
+        person.last = "lovelace"
+        for _ in range(reads):
+            person.full_name
+
+    return time.perf_counter() - start
+
+
+def main(n=1000000):
+    for title, reads in (("write-heavy (1 read per write)", 1), ("mixed (10 reads per write)", 10),
+                         ("read-heavy (100 reads per write)", 100)):
+        for cls in (Plain, Computed):
+            elapsed = min(_mix(cls, n, reads) for _ in range(3))
+            print("%-33s %-8s %8.3f s" % (title, cls.__name__, elapsed))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
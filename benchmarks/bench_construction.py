@@ -0,0 +1,51 @@
+"""
+Benchmark: instances per second of a PropertyMeta class compared to a plain class and a dataclass with the same fields.
+
+Run: python benchmarks/bench_construction.py [instances]
+"""
+import sys
+import timeit
+
+from dataclasses import dataclass
+
+from pymagic9 import PropertyMeta
+
+
+class Plain(object):
+    def __init__(self, name, age):
+        self.name = name
+        self.age = age
+
+
+@dataclass
+class Data(object):
+    name: str
+    age: int
+
+
+class Readonly(metaclass=PropertyMeta):
+    def __init__(self, name, age):
+        self.name = name
+        self.age = age
+
+    name = property(...)
+    age = property(..., ...)
+
+
+class Ordinary(metaclass=PropertyMeta):
+    def __init__(self, name, age):
+        self.name = name
+        self.age = age
+
+    name = property(..., ...)
+    age = property(..., ...)
+
+
+def main(count=200000):
+    for cls in (Plain, Data, Ordinary, Readonly):
+        elapsed = min(timeit.repeat(lambda: cls("Tom", 24), number=count, repeat=5))
+        print("%-9s %12.0f instances/s" % (cls.__name__, count / elapsed))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,33 @@
+"""
+Benchmark: reads of unset (sparse) auto-properties through ``getattr`` with a default and ``hasattr``, without and with
+a declared default value.
+
+Run: python benchmarks/bench_defaults.py [reads]
+"""
+import sys
+import timeit
+
+from pymagic9 import PropertyMeta
+
+
+class Sparse(metaclass=PropertyMeta):
+    nickname = property(..., ...)
+
+
+class Defaulted(metaclass=PropertyMeta):
+    __fielddefaults__ = {"nickname": None}
+
+    nickname = property(..., ...)
+
+
+def main(n=1000000):
+    for cls in (Sparse, Defaulted):
+        instance = cls()
+        for name, stmt in (("getattr", "getattr(instance, 'nickname', None)"),
+                           ("hasattr", "hasattr(instance, 'nickname')")):
+            elapsed = min(timeit.repeat(stmt, globals={"instance": instance}, number=n, repeat=3))
+            print("%-9s %-8s %8.1f ns per unset read" % (cls.__name__, name, elapsed / n * 1e9))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,56 @@
+"""
+Benchmark: `findlocal` versus a naive walk of `f_locals` for a local variable defined at the root of the call chain.
+
+Run: python benchmarks/bench_findlocal.py [locals]
+"""
+import sys
+import timeit
+
+from pymagic9 import findlocal
+
+
+def _naive(name):
+    frame = sys._getframe(1)
+    while frame:
+        f_locals = frame.f_locals
+        if name in f_locals:
+            return f_locals[name]
+
+        frame = frame.f_back
+
+    raise NameError(name)
+
+
+def _make_level(count):
+    # a function with `count` locals, like a real frame in the middle of a call chain
+    namespace = {}
+    source = "def level(depth, func, *args):\n%s" \
+             "    return level(depth - 1, func, *args) if depth > 1 else func(*args)\n"
+    exec(source % "".join("    x%d = %d\n" % (i, i) for i in range(count)), namespace)
+    return namespace["level"]
+
+
+def _lookups(func, number):
+    start = timeit.default_timer()
+    for _ in range(number):
+        func("request_id")
+
+    return timeit.default_timer() - start
+
+
+def _root(level, depth, func, *args):
+    request_id = 42  # noqa: F841
+    return level(depth, func, *args)
+
+
+def main(count=10, number=1000):
+    level = _make_level(count)
+    for depth in (10, 50, 100, 200):
+        for name, func in (("f_locals walk", _naive), ("findlocal", findlocal)):
+            assert _root(level, depth, func, "request_id") == 42
+            elapsed = min(_root(level, depth, _lookups, func, number) for _ in range(5))
+            print("depth %-4d %-14s %10.2f us per lookup" % (depth, name, elapsed / number * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,69 @@
+"""
+Benchmark: time of a query "which threads are running these functions" over many threads blocked at a realistic stack
+depth: `findrunning` with a list of functions and with a reused frozenset of the functions, versus walking the stacks
+of `sys._current_frames` once per target comparing the code objects.
+
+Run: python benchmarks/bench_findrunning.py [threads] [depth] [targets] [queries]
+"""
+import sys
+import threading
+import time
+
+from pymagic9 import findrunning
+
+
+def _make_handlers(count):
+    # distinct job handlers, each with its own code object
+    namespace = {}
+    for i in range(count):
+        exec("def handler%d(level, depth, event):\n    return level(depth, event)\n" % i, namespace)
+
+    return [namespace["handler%d" % i] for i in range(count)]
+
+
+def _level(depth, event):
+    return _level(depth - 1, event) if depth else event.wait()
+
+
+def _naive(targets):
+    found = []
+    for code in [target.__code__ for target in targets]:
+        for ident, frame in sys._current_frames().items():
+            depth = 0
+            while frame is not None:
+                if frame.f_code is code:
+                    found.append((ident, depth, code))
+
+                depth += 1
+                frame = frame.f_back
+
+    return found
+
+
+def main(threads=128, depth=40, targets=8, queries=50):
+    handlers = _make_handlers(targets)
+    event = threading.Event()
+    workers = [threading.Thread(target=handlers[i % targets], args=(_level, depth, event)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    try:
+        precompiled = frozenset(handlers)
+        assert len(findrunning(precompiled)) == len(_naive(handlers)) == threads
+        for name, func, arg in (("per-target walk", _naive, handlers), ("findrunning(list)", findrunning, handlers),
+                                ("findrunning(frozenset)", findrunning, precompiled)):
+            start = time.perf_counter()
+            for _ in range(queries):
+                func(arg)
+
+            elapsed = (time.perf_counter() - start) / queries * 1e3
+            print("%-23s %d threads, depth %d, %d targets: %8.3f ms per query" % (
+                name, threads, depth, targets, elapsed))
+    finally:
+        event.set()
+        for worker in workers:
+            worker.join()
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""
+Benchmark: insertion of frozen instances into a set (the first insertion computes the hashes, the second one uses the
+cached hashes) for a frozen PropertyMeta class, a class with handwritten ``__eq__`` and ``__hash__`` and a frozen
+dataclass.
+
+Run: python benchmarks/bench_frozen.py [instances]
+"""
+import dataclasses
+import sys
+import time
+
+from pymagic9 import PropertyMeta
+
+
+class FrozenPoint(metaclass=PropertyMeta):
+    __frozen__ = True
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+    x = property(...)
+    y = property(...)
+    z = property(...)
+
+
+class HandwrittenPoint(object):
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and (self.x, self.y, self.z) == (other.x, other.y, other.z)
+
+    def __hash__(self):
+        return hash((self.x, self.y, self.z))
+
+
+@dataclasses.dataclass(frozen=True)
+class DataclassPoint(object):
+    x: int
+    y: int
+    z: int
+
+
+def _insert(points):
+    start = time.perf_counter()
+    set(points)
+    return time.perf_counter() - start
+
+
+def main(n=1000000):
+    for cls in (FrozenPoint, HandwrittenPoint, DataclassPoint):
+        points = [cls(i, str(i), (i, i)) for i in range(n)]
+        first, second = _insert(points), _insert(points)
+        print("%-16s first insertion %8.3f s, second insertion %8.3f s" % (cls.__name__, first, second))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
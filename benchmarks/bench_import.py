@@ -0,0 +1,56 @@
+"""
+Benchmark: import time of the package for different used names, measured by `python -X importtime`.
+
+Run: python benchmarks/bench_import.py [repeat]
+"""
+import re
+import subprocess
+import sys
+
+SCENARIOS = [
+    ("import pymagic9", "import pymagic9"),
+    ("getframe", "from pymagic9 import getframe"),
+    ("nameof", "from pymagic9 import nameof"),
+    ("isemptyfunction", "from pymagic9 import isemptyfunction"),
+    ("PropertyMeta", "from pymagic9 import PropertyMeta"),
+    ("pymagic9.pymagic9 (eager)", "import pymagic9.pymagic9"),
+]
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _import_time(code):
+    """
+    Returns the cumulative import time (us) of the top-level modules imported by the code, and their number.
+
+    """
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", code], check=True,
+                            stderr=subprocess.PIPE, universal_newlines=True).stderr
+    total, modules = 0, 0
+    seen = False
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+
+        # modules imported by the interpreter at startup are reported before the code runs
+        if match.group(4) == "site":
+            seen = True
+            continue
+
+        if seen:
+            modules += 1
+            if len(match.group(3)) == 1:
+                total += int(match.group(2))
+
+    return total, modules
+
+
+def main(repeat=5):
+    for name, code in SCENARIOS:
+        results = [_import_time(code) for _ in range(repeat)]
+        print("%-26s %8.2f ms  (%d modules)" % (name, min(r[0] for r in results) / 1e3, results[0][1]))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,52 @@
+"""
+Benchmark: lookup of instances by a property value with a unique index, with a hash index and by scanning the
+instances, and the cost of a write to an indexed property, for 1M live instances.
+
+Run: python benchmarks/bench_indexes.py [instances] [lookups]
+"""
+import sys
+import time
+
+from pymagic9 import PropertyMeta
+
+
+class Plain(metaclass=PropertyMeta):
+    def __init__(self, i):
+        self.email, self.city = "user%d@example.com" % i, "city%d" % (i % 1000)
+
+    email = property(..., ...)
+    city = property(..., ...)
+
+
+class Indexed(Plain):
+    __indexes__ = {"email": "unique", "city": "hash"}
+
+    email = property(..., ...)
+    city = property(..., ...)
+
+
+def _per_call(func, number):
+    start = time.perf_counter()
+    for i in range(number):
+        func(i)
+
+    return (time.perf_counter() - start) / number
+
+
+def main(n=1000000, lookups=1000):
+    plain = [Plain(i) for i in range(n)]
+    indexed = [Indexed(i) for i in range(n)]
+    scan = _per_call(lambda i: [p for p in plain if p.email == "user%d@example.com" % (i * 997 % n)], 3)
+    unique = _per_call(lambda i: Indexed.lookup("email", "user%d@example.com" % (i * 997 % n)), lookups)
+    bucket = _per_call(lambda i: Indexed.lookup("city", "city%d" % (i % 1000)), lookups)
+    print("lookup by scan            %12.1f us" % (scan * 1e6))
+    print("lookup by unique index    %12.1f us" % (unique * 1e6))
+    print("lookup by hash index      %12.1f us  (%d instances per value)" % (bucket * 1e6, n // 1000))
+
+    for name, instances in (("plain", plain), ("indexed", indexed)):
+        write = _per_call(lambda i: setattr(instances[i], "city", "town%d" % (i % 1000)), min(n, 100000))
+        print("write %-8s            %12.1f ns" % (name, write * 1e9))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,38 @@
+"""
+Benchmark: auto-property reads and writes with the instrumentation disabled, counting and timing.
+
+Run: python benchmarks/bench_instrumentation.py [accesses]
+"""
+import sys
+import timeit
+
+from pymagic9 import instrument, PropertyMeta, uninstrument
+
+
+class Person(metaclass=PropertyMeta):
+    age = property(..., ...)
+
+
+def main(count=1000000):
+    person = Person()
+    person.age = 24
+
+    def read():
+        return person.age
+
+    def write():
+        person.age = 25
+
+    for mode in ('disabled', 'counting', 'timing', 'restored'):
+        if mode in ('counting', 'timing'):
+            instrument(Person, timing=mode == 'timing')
+        else:
+            uninstrument(Person)
+
+        for name, func in (('read', read), ('write', write)):
+            elapsed = min(timeit.repeat(func, number=count, repeat=5))
+            print("%-9s %-6s %8.1f ns per access" % (mode, name, elapsed / count * 1e9))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
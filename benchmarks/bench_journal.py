@@ -0,0 +1,42 @@
+"""
+Benchmark: write throughput of auto-properties without the change journal and with the journal recording the values,
+their reprs or the callers.
+
+Run: python benchmarks/bench_journal.py [writes]
+"""
+import sys
+import time
+
+from pymagic9 import PropertyMeta
+
+
+def _make_class(**options):
+    namespace = dict(options, x=property(..., ...))
+    return PropertyMeta("Point", (object, ), namespace)
+
+
+def _writes(cls, n):
+    point = cls()
+    start = time.perf_counter()
+    for i in range(n):
+        point.x = i
+
+    return n / (time.perf_counter() - start)
+
+
+def main(n=1000000):
+    classes = (
+        ("off", _make_class()),
+        ("values", _make_class(__changejournal__=4096)),
+        ("reprs", _make_class(__changejournal__=4096, __journalrepr__=True)),
+        ("callers", _make_class(__changejournal__=4096, __journalcaller__=True)),
+    )
+    off = None
+    for name, cls in classes:
+        throughput = max(_writes(cls, n) for _ in range(3))
+        off = off or throughput
+        print("journal %-7s %12.0f writes/s  x%.2f" % (name, throughput, throughput / off))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,39 @@
+"""
+Benchmark: time of `memoryusage` (shallow and deep) and of `PropertyMeta.staleinstances` for a class without
+`__dict__` whose stores hold the given number of instances, and of `memoryusage` in the Prometheus format for a
+diagnostics endpoint.
+
+Run: python benchmarks/bench_memoryusage.py [instances]
+"""
+import sys
+import time
+
+from pymagic9 import memoryusage, PropertyMeta
+
+
+class Point(metaclass=PropertyMeta):
+    __slots__ = ()
+
+    def __init__(self, x, y, tags):
+        self.x, self.y, self.tags = x, y, tags
+
+    x = property(...)
+    y = property(...)
+    tags = property(..., ...)
+
+
+def main(n=100000):
+    points = [Point(i, -i, [i, "tag"]) for i in range(n)]
+    del points[::2]  # the deleted points are stale: their values keep them alive
+    for name, func in (("memoryusage", lambda: memoryusage(Point)),
+                       ("memoryusage(deep=True)", lambda: memoryusage(Point, deep=True)),
+                       ("memoryusage(prometheus)", lambda: memoryusage(fmt="prometheus")),
+                       ("staleinstances", Point.staleinstances)):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        print("%-24s %d instances: %8.2f ms  %6.3f us per instance" % (name, n, elapsed * 1e3, elapsed / n * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,73 @@
+"""
+Benchmark: allocations per second and time spent in the garbage collector for a high-churn message class with and
+without the pool of instances. In the cyclic case every message references itself through its headers, so only the
+garbage collector frees the discarded messages (the release breaks the cycle). Expect the pooled messages to be
+allocated more slowly than the plain ones and to spend (almost) no time in the garbage collector in the cyclic case.
+
+Run: python benchmarks/bench_pool.py [messages]
+"""
+import gc
+import sys
+import time
+
+from pymagic9 import PropertyMeta
+
+
+def _init(self, topic, key, payload, cyclic=False):
+    self.topic, self.key, self.payload = topic, key, payload
+    self.headers = {"retries": 0, "message": self if cyclic else None}
+
+
+def _make_class(name, **options):
+    namespace = dict(options, __init__=_init, topic=property(...), key=property(...), payload=property(..., ...),
+                     headers=property(..., ...))
+    return PropertyMeta(name, (object, ), namespace)
+
+
+Message = _make_class("Message")
+PooledMessage = _make_class("PooledMessage", __poolsize__=256)
+
+
+class _GCTimer(object):
+    def __init__(self):
+        self.seconds, self.collections, self._start = 0.0, 0, 0.0
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.seconds += time.perf_counter() - self._start
+            self.collections += 1
+
+
+def _churn(cls, n, release, cyclic):
+    live = []  # a window of live messages, like a queue
+    for i in range(n):
+        live.append(cls("orders", i, [i], cyclic))
+        if len(live) >= 64:
+            message = live.pop(0)
+            if release:
+                cls.release(message)
+
+            del message
+
+
+def main(n=1000000):
+    for cyclic in (False, True):
+        for name, cls, release in (("plain", Message, False), ("pooled", PooledMessage, True)):
+            timer = _GCTimer()
+            gc.collect()
+            gc.callbacks.append(timer)
+            try:
+                start = time.perf_counter()
+                _churn(cls, n, release, cyclic)
+                elapsed = time.perf_counter() - start
+            finally:
+                gc.callbacks.remove(timer)
+
+            print("%-8s %-7s %10.0f messages/s, %5d collections, %8.1f ms in gc" % (
+                "cyclic" if cyclic else "acyclic", name, n / elapsed, timer.collections, timer.seconds * 1e3))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,78 @@
+"""
+Benchmark: throughput (objects per second) of `todict`, `totuple` and `fromdict` versus reading and writing the
+properties one by one, and of exporting the objects to JSON lines with `dumpjsonlines` versus `json.dumps` of the
+dictionaries built by the getters.
+
+Run: python benchmarks/bench_records.py [objects]
+"""
+import io
+import json
+import sys
+import time
+
+from pymagic9 import PropertyMeta
+
+NAMES = ("name", "email", "age", "active", "score")
+
+
+class User(metaclass=PropertyMeta):
+    def __init__(self, name, email, age, active, score):
+        self.name, self.email, self.age, self.active, self.score = name, email, age, active, score
+
+    name = property(...)
+    email = property(...)
+    age = property(..., ...)
+    active = property(..., ...)
+    score = property(..., ...)
+
+
+def _getters(users):
+    for user in users:
+        dict((name, getattr(user, name)) for name in NAMES)
+
+
+def _todict(users):
+    for user in users:
+        user.todict()
+
+
+def _totuple(users):
+    for user in users:
+        user.totuple()
+
+
+def _constructor(records):
+    for record in records:
+        User(**record)
+
+
+def _fromdict(records):
+    fromdict = User.fromdict
+    for record in records:
+        fromdict(record)
+
+
+def _dumps(users):
+    stream = io.StringIO()
+    for user in users:
+        stream.write(json.dumps(dict((name, getattr(user, name)) for name in NAMES)) + "\n")
+
+
+def _dumpjsonlines(users):
+    User.dumpjsonlines(users, io.StringIO())
+
+
+def main(n=200000):
+    users = [User("user%d" % i, "user%d@example.com" % i, i % 90, i % 2 == 0, i * 0.5) for i in range(n)]
+    records = [user.todict() for user in users]
+    for name, func, data in (("getters", _getters, users), ("todict", _todict, users), ("totuple", _totuple, users),
+                             ("constructor", _constructor, records), ("fromdict", _fromdict, records),
+                             ("json.dumps", _dumps, users), ("dumpjsonlines", _dumpjsonlines, users)):
+        start = time.perf_counter()
+        func(data)
+        elapsed = time.perf_counter() - start
+        print("%-13s %d objects: %12.0f objects/s" % (name, n, n / elapsed))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,65 @@
+"""
+Benchmark: pickled fan-out vs shared memory attach of auto-property values for 4-16 worker processes.
+
+Run: python benchmarks/bench_shared.py [instances]
+"""
+import multiprocessing
+import sys
+import time
+
+from pymagic9 import PropertyMeta
+
+
+class Point(metaclass=PropertyMeta):
+    __sharedfields__ = {'x': 'd'}
+    __sharedcapacity__ = 1000000
+
+    x = property(..., ...)
+
+
+def _sum_pickled(values):
+    return sum(values)
+
+
+def _sum_shared(args):
+    store, start, stop = args
+    try:
+        return sum(store.values[start:stop])
+    finally:
+        store.close()
+
+
+def _chunks(count, workers):
+    size = -(-count // workers)
+    return [(i, min(i + size, count)) for i in range(0, count, size)]
+
+
+def main(count=1000000):
+    points = [Point() for _ in range(count)]
+    for i, point in enumerate(points):
+        point.x = float(i)
+
+    store = Point.sharedstore('x')
+    try:
+        for workers in (4, 8, 16):
+            chunks = _chunks(count, workers)
+            with multiprocessing.Pool(workers) as pool:
+                pool.map(_sum_pickled, [[0.0]] * workers)  # warm up
+
+                start = time.perf_counter()
+                pickled = sum(pool.map(_sum_pickled, [[p.x for p in points[a:b]] for a, b in chunks]))
+                pickled_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                shared = sum(pool.map(_sum_shared, [(store, a, b) for a, b in chunks]))
+                shared_time = time.perf_counter() - start
+
+            assert pickled == shared
+            print("workers=%-3d pickled fan-out: %8.2f ms   shared attach: %8.2f ms   speedup: %5.1fx"
+                  % (workers, pickled_time * 1e3, shared_time * 1e3, pickled_time / shared_time))
+    finally:
+        store.unlink()
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
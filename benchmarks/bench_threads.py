@@ -0,0 +1,77 @@
+"""
+Benchmark: throughput (operations per second) of auto-property accesses, construction with readonly properties and
+`findlocal` at depth 10 with 1-16 threads, each thread working with its own instances. On a free-threaded build
+(python3.13t) the throughput should scale with the number of cores.
+
+Run: python3.13t benchmarks/bench_threads.py [operations per thread]
+"""
+import sys
+import threading
+import time
+
+from pymagic9 import findlocal, PropertyMeta
+
+
+class Point(metaclass=PropertyMeta):
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+    x = property(...)
+    y = property(...)
+    z = property(..., ...)
+
+
+def _properties(n):
+    points = [Point(i, i) for i in range(100)]
+    for i in range(n // 100):
+        for point in points:
+            point.z = point.x + point.y + i
+
+    return n // 100 * 100 * 3
+
+
+def _construction(n):
+    for i in range(n):
+        Point(i, i)
+
+    return n
+
+
+def _findlocal(n):
+    request_id = 1  # noqa: F841
+
+    def nested(depth):
+        return nested(depth - 1) if depth else findlocal("request_id")
+
+    for _ in range(n // 10):
+        nested(10)
+
+    return n // 10
+
+
+def _throughput(func, threads, n):
+    operations = []
+    workers = [threading.Thread(target=lambda: operations.append(func(n))) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join()
+
+    return sum(operations) / (time.perf_counter() - start)
+
+
+def main(n=200000):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("GIL %s" % ("enabled" if gil else "disabled"))
+    for name, func in (("get/set", _properties), ("construction", _construction), ("findlocal", _findlocal)):
+        single = None
+        for threads in (1, 2, 4, 8, 16):
+            throughput = _throughput(func, threads, n)
+            single = single or throughput
+            print("%-13s %2d threads: %12.0f ops/s  x%.2f" % (name, threads, throughput, throughput / single))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
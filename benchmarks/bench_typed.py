@@ -0,0 +1,117 @@
+"""
+Benchmark: assignments of validated values to a typed auto-property, to an auto-property with a hand-written
+validating setter, to a property with a generic ``isinstance`` dispatch and (if installed) to a pydantic model with
+``validate_assignment``.
+
+Run: python benchmarks/bench_typed.py [assignments]
+"""
+import sys
+import time
+
+from pymagic9 import PropertyMeta
+
+
+class Typed(metaclass=PropertyMeta):
+    __checktypes__ = True
+
+    price: float = property(..., ...)
+
+
+class TypedValidated(metaclass=PropertyMeta):
+    __checktypes__ = True
+    __fieldvalidators__ = {"price": lambda value: value >= 0}
+
+    price: float = property(..., ...)
+
+
+def _check_price(self, value):
+    if not isinstance(value, float):
+        raise TypeError("'price' must be float")
+
+
+def _validate_price(self, value):
+    if not isinstance(value, float):
+        raise TypeError("'price' must be float")
+
+    if value < 0:
+        raise ValueError("invalid value of 'price'")
+
+
+class Handwritten(metaclass=PropertyMeta):
+    price = property(..., _check_price)
+
+
+class HandwrittenValidated(metaclass=PropertyMeta):
+    price = property(..., _validate_price)
+
+
+_CHECKS = {"price": (float, lambda value: value >= 0)}
+
+
+class Generic(object):
+    def _get_price(self):
+        return self._price
+
+    def _set_price(self, value):
+        self._check("price", value)
+        self._price = value
+
+    @staticmethod
+    def _check(name, value):
+        types, validate = _CHECKS[name]
+        if not isinstance(value, types):
+            raise TypeError("'%s' must be %s" % (name, types))
+
+        if not validate(value):
+            raise ValueError("invalid value of '%s'" % name)
+
+    price = property(_get_price, _set_price)
+
+
+def _pydantic():
+    try:
+        import pydantic
+    except ImportError:
+        return None
+
+    class Model(pydantic.BaseModel):
+        price: float = 0.0
+
+        @pydantic.field_validator("price")
+        @classmethod
+        def _positive(cls, value):
+            if value < 0:
+                raise ValueError("invalid value of 'price'")
+
+            return value
+
+        model_config = pydantic.ConfigDict(validate_assignment=True)
+
+    return Model
+
+
+def _assignments(instance, n):
+    start = time.perf_counter()
+    for i in range(n):
+        instance.price = 1.5
+
+    return time.perf_counter() - start
+
+
+def main(n=1000000):
+    classes = [
+        ("typed", Typed), ("handwritten", Handwritten),
+        ("typed + validator", TypedValidated), ("handwritten + validator", HandwrittenValidated),
+        ("generic + validator", Generic), ("pydantic + validator", _pydantic()),
+    ]
+    for name, cls in classes:
+        if cls is None:
+            print("%-24s not installed" % name)
+            continue
+
+        elapsed = min(_assignments(cls(), n) for _ in range(5))
+        print("%-24s %8.1f ns per assignment" % (name, elapsed / n * 1e9))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
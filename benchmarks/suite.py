@@ -0,0 +1,299 @@
+"""
+Benchmark suite of the public API of pymagic9 with regression gating.
+
+Usage:
+    python benchmarks/suite.py run [--output FILE] [--filter TEXT] [--samples N] [--min-time SECONDS]
+    python benchmarks/suite.py compare BASELINE RESULTS [--threshold FRACTION]
+
+The `run` command writes the results in JSON: for every benchmark, the seconds per loop of each sample and their
+median. The `compare` command compares the medians of two result files and exits with code 1 if any benchmark is slower
+than the baseline by more than the threshold (10% by default). A missing baseline skips the comparison (exit code 0),
+unless --require-baseline is given (exit code 2).
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from pymagic9 import pymagic9 as pm
+
+_timer = getattr(time, "perf_counter", time.time)
+
+# (name, time function, parameter): a time function takes the number of loops and returns the elapsed seconds
+BENCHMARKS = []
+
+
+def benchmark(name, param=None, *values):
+    """
+    Registers the time function for every value of the parameter.
+
+    """
+    def decorator(func):
+        if param is None:
+            BENCHMARKS.append((name, func, None))
+
+        for value in values:
+            BENCHMARKS.append(("%s[%s=%s]" % (name, param, value), func, value))
+
+        return func
+
+    return decorator
+
+
+def _at_depth(depth, func, *args):
+    if depth <= 1:
+        return func(*args)
+
+    return _at_depth(depth - 1, func, *args)
+
+
+def _root(depth, func, *args):
+    return _at_depth(depth - 1, func, *args)
+
+
+def _loop(loops, func, *args):
+    start = _timer()
+    for _ in range(loops):
+        func(*args)
+
+    return _timer() - start
+
+
+@benchmark("getframe", "depth", 10, 100, 500)
+def bench_getframe(loops, depth):
+    return _root(depth, _loop, loops, pm.getframe, depth)
+
+
+@benchmark("_getframe", "depth", 10, 100, 500)
+def bench__getframe(loops, depth):
+    return _root(depth, _loop, loops, pm._getframe, depth)
+
+
+@benchmark("isfunctionincallchain", "depth", 10, 100, 500)
+def bench_isfunctionincallchain(loops, depth):
+    return _root(depth, _loop, loops, pm.isfunctionincallchain, _root)
+
+
+@benchmark("findlocal", "depth", 10, 100, 500)
+def bench_findlocal(loops, depth):
+    # the whole call chain is searched for a missing variable
+    return _root(depth, _loop, loops, pm.findlocal, "missing", -1, None)
+
+
+@benchmark("callername", "qualified", False, True)
+def bench_callername(loops, qualified):
+    return _loop(loops, pm.callername, 0, qualified)
+
+
+def _function(name, lines, body):
+    namespace = {}
+    source = "def %s(loops, nameof, timer):\n%s%s" % (name, "    x = 1\n" * lines, body)
+    exec(source, namespace)
+    return namespace[name]
+
+
+_NAMEOF_BODY = """\
+    start = timer()
+    for _ in range(loops):
+        nameof(x)
+    return timer() - start
+"""
+
+
+@benchmark("nameof", "lines", 10, 100, 1000)
+def bench_nameof(loops, lines):
+    return _function("f", lines, _NAMEOF_BODY)(loops, pm.nameof, _timer)
+
+
+_FUNCTIONS = {
+    "empty": _function("empty", 0, "    pass\n"),
+    "docstring": _function("docstring", 0, '    """docstring"""\n'),
+    "unreachable": _function("unreachable", 0, "    return\n" + "    x = 1\n" * 1000),
+    "long": _function("long", 1000, "    return x\n"),
+}
+
+
+@benchmark("isemptyfunction", "function", "empty", "docstring", "unreachable", "long")
+def bench_isemptyfunction(loops, function):
+    return _loop(loops, pm.isemptyfunction, _FUNCTIONS[function])
+
+
+def _make_class(count=1, prefix="x"):
+    attrs = {"%s%d" % (prefix, i): property(Ellipsis, Ellipsis) for i in range(count)}
+    attrs["name"] = property(Ellipsis)
+
+    def __init__(self, name):
+        self.name = name
+
+    attrs["__init__"] = __init__
+    return pm.PropertyMeta("Bench", (object,), attrs)
+
+
+def _instances(count):
+    if count not in _INSTANCES:
+        cls = _make_class()
+        _INSTANCES[count] = [cls(i) for i in range(count)]
+
+    for instance in _INSTANCES[count]:
+        instance.x0 = 0
+
+    return _INSTANCES[count]
+
+
+_INSTANCES = {}  # instances by their number, created once for all samples
+
+
+@benchmark("PropertyMeta.get", "instances", 1000, 100000)
+def bench_get(loops, instances):
+    objects = _instances(instances)
+    start = _timer()
+    for _ in range(loops):
+        for o in objects:
+            o.x0  # noqa
+
+    return _timer() - start
+
+
+@benchmark("PropertyMeta.set", "instances", 1000, 100000)
+def bench_set(loops, instances):
+    objects = _instances(instances)
+    start = _timer()
+    for i in range(loops):
+        for o in objects:
+            o.x0 = i
+
+    return _timer() - start
+
+
+@benchmark("PropertyMeta.del", "instances", 1000, 100000)
+def bench_del(loops, instances):
+    objects = _instances(instances)
+    elapsed = 0.0
+    for _ in range(loops):
+        for o in objects:
+            o.x0 = 0
+
+        start = _timer()
+        for o in objects:
+            del o.x0
+
+        elapsed += _timer() - start
+
+    return elapsed
+
+
+@benchmark("PropertyMeta.init")
+def bench_init(loops, _):
+    return _loop(loops, _make_class(), "name")
+
+
+@benchmark("PropertyMeta.class", "properties", 1, 10, 100)
+def bench_class(loops, properties):
+    return _loop(loops, _make_class, properties)
+
+
+def _calibrate(func, value, min_time):
+    loops = 1
+    while True:
+        if func(loops, value) >= min_time or loops >= 2 ** 30:
+            return loops
+
+        loops *= 2
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+def run(args):
+    results = {}
+    for name, func, value in BENCHMARKS:
+        if args.filter and args.filter not in name:
+            continue
+
+        loops = _calibrate(func, value, args.min_time)
+        values = [func(loops, value) / loops for _ in range(args.samples)]
+        results[name] = {"loops": loops, "values": values, "median": _median(values)}
+        print("%-45s %12.3f us" % (name, results[name]["median"] * 1e6))
+
+    if args.output:
+        if os.path.dirname(args.output) and not os.path.isdir(os.path.dirname(args.output)):
+            os.makedirs(os.path.dirname(args.output))
+
+        with open(args.output, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "benchmarks": results,
+            }, f, indent=2, sort_keys=True)
+
+    return 0
+
+
+def compare(args):
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["benchmarks"]
+    except (IOError, OSError):
+        print("baseline %s does not exist: create it with 'run --output %s'%s" % (
+            args.baseline, args.baseline, "" if args.require_baseline else ", comparison skipped"))
+        return 2 if args.require_baseline else 0
+
+    with open(args.results) as f:
+        results = json.load(f)["benchmarks"]
+
+    regressions = 0
+    for name in sorted(set(baseline) | set(results)):
+        if name not in results or name not in baseline:
+            print("%-45s %s" % (name, "missing" if name not in results else "new"))
+            continue
+
+        old, new = baseline[name]["median"], results[name]["median"]
+        change = new / old - 1
+        status = ""
+        if change > args.threshold:
+            status, regressions = "REGRESSION", regressions + 1
+
+        print("%-45s %12.3f us %12.3f us %+8.1f%% %s" % (name, old * 1e6, new * 1e6, change * 100, status))
+
+    if regressions:
+        print("%d benchmark(s) regressed by more than %.0f%%" % (regressions, args.threshold * 100))
+        return 1
+
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of pymagic9")
+    subparsers = parser.add_subparsers(dest="command")
+    parser_run = subparsers.add_parser("run", help="run the benchmarks")
+    parser_run.add_argument("--output", "-o", help="JSON file for the results")
+    parser_run.add_argument("--filter", help="run only the benchmarks whose names contain the text")
+    parser_run.add_argument("--samples", type=int, default=5, help="number of samples (default: 5)")
+    parser_run.add_argument("--min-time", type=float, default=0.05, help="minimum seconds of a sample (default: 0.05)")
+    parser_run.set_defaults(handler=run)
+    parser_compare = subparsers.add_parser("compare", help="compare the results with the baseline")
+    parser_compare.add_argument("baseline", help="JSON file of the baseline results")
+    parser_compare.add_argument("results", help="JSON file of the new results")
+    parser_compare.add_argument("--threshold", type=float, default=0.1,
+                                help="allowed slowdown as a fraction of the baseline (default: 0.1)")
+    parser_compare.add_argument("--require-baseline", action="store_true",
+                                help="fail if the baseline does not exist instead of skipping the comparison")
+    parser_compare.set_defaults(handler=compare)
+    args = parser.parse_args(argv)
+    if not getattr(args, "handler", None):
+        parser.print_help()
+        return 2
+
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,69 @@
 PyMagic9 - a library based on calling the stack of frames at runtime and analyzing the code object of frames.
 Basically, it implements some C# features. For example, it contains the `nameof` function and `auto-implemented
 properties`. See the documentation for more information.
+
+The public names are imported lazily from the submodules (`frames`, `bytecode`, `names`, `properties`,
+`cache`) on first access,
+so importing the package costs only what is used.
 """
-from .pymagic9 import getframe, isemptyfunction, isfunctionincallchain, nameof, PropertyMeta
+import sys
 
 __author__ = 'Sam Nazarov'  # Duplicate in setup.cfg
 __version__ = '0.9.0'
 
 # noinspection SpellCheckingInspection
-__all__ = ['getframe', 'isemptyfunction', 'isfunctionincallchain', 'nameof', 'PropertyMeta']
+__all__ = ['accessstats', 'callerlocation', 'callermodule', 'callername', 'disablecache', 'enablecache', 'findlocal',
+           'findrunning', 'getframe', 'instrument', 'isemptyfunction', 'isfunctionincallchain', 'memoryusage', 'nameof',
+           'PropertyMeta', 'savecache', 'SharedFieldStore', 'SharedFieldStoreFull', 'trackcallchain', 'uninstrument',
+           'untrackcallchain']
+
+# submodules of the public names
+_SUBMODULES = {
+    'accessstats': 'properties',
+    'callerlocation': 'frames',
+    'callermodule': 'frames',
+    'callername': 'frames',
+    'disablecache': 'cache',
+    'enablecache': 'cache',
+    'findlocal': 'frames',
+    'findrunning': 'frames',
+    'getframe': 'frames',
+    'instrument': 'properties',
+    'isemptyfunction': 'bytecode',
+    'isfunctionincallchain': 'frames',
+    'memoryusage': 'properties',
+    'nameof': 'names',
+    'PropertyMeta': 'properties',
+    'savecache': 'cache',
+    'SharedFieldStore': 'properties',
+    'SharedFieldStoreFull': 'properties',
+    'trackcallchain': 'frames',
+    'uninstrument': 'properties',
+    'untrackcallchain': 'frames',
+}
+
+
+def __getattr__(name):
+    """
+    Imports the public name from its submodule on first access (PEP 562).
+
+    """
+    try:
+        submodule = _SUBMODULES[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    value = globals()[name] = getattr(__import__(__name__ + '.' + submodule, fromlist=[name]), name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # no module __getattr__ before Python 3.7
+    for _name in __all__:
+        __getattr__(_name)
+
+    del _name
@@ -0,0 +1,16 @@
+from typing import List
+
+from .bytecode import isemptyfunction as isemptyfunction
+from .cache import disablecache as disablecache, enablecache as enablecache, savecache as savecache
+from .frames import callerlocation as callerlocation, callermodule as callermodule, callername as callername, \
+    findlocal as findlocal, findrunning as findrunning, getframe as getframe, \
+    isfunctionincallchain as isfunctionincallchain, trackcallchain as trackcallchain, \
+    untrackcallchain as untrackcallchain
+from .names import nameof as nameof
+from .properties import accessstats as accessstats, instrument as instrument, memoryusage as memoryusage, \
+    PropertyMeta as PropertyMeta, SharedFieldStore as SharedFieldStore, SharedFieldStoreFull as SharedFieldStoreFull, \
+    uninstrument as uninstrument
+
+__author__: str
+__version__: str
+__all__: List[str]
@@ -0,0 +1,225 @@
+"""
+This module provides functions for analyzing the bytecode of code objects, such as `isemptyfunction`.
+"""
+import sys
+
+from opcode import EXTENDED_ARG, HAVE_ARGUMENT
+from types import FunctionType
+
+# noinspection SpellCheckingInspection
+__all__ = ["isemptyfunction"]
+
+
+# noinspection SpellCheckingInspection
+def _unpack_opargs_py2(code):  # pragma: no cover
+    """
+    _unpack_opargs function for python2
+
+    """
+    extended_arg, i = 0, 0
+    while i < len(code):
+        op = ord(code[i])
+        i += 1
+        if op >= HAVE_ARGUMENT:
+            arg = ord(code[i]) | ord(code[i + 1]) * 256 | extended_arg  # type: int | None
+            extended_arg, i = 0, i + 2
+            if op == EXTENDED_ARG:
+                exec("extended_arg = arg * 65536L")  # py3 support
+        else:
+            arg = None
+
+        yield i, op, arg
+
+
+# noinspection SpellCheckingInspection
+def _unpack_opargs_py3(code):
+    """
+    _unpack_opargs function for python3
+
+    This function is a clone of the `dis._unpack_opargs` function from the Python 3.9.6 standard library's `dis`
+    module.
+    """
+    extended_arg = 0
+    for i in range(0, len(code), 2):
+        op = code[i]
+        if op >= HAVE_ARGUMENT:
+            arg = code[i + 1] | extended_arg
+            extended_arg = (arg << 8) if op == EXTENDED_ARG else 0
+        else:
+            arg = None
+
+        yield i, op, arg
+
+
+# noinspection SpellCheckingInspection
+_unpack_opargs = _unpack_opargs_py2 if sys.version_info < (3,) else _unpack_opargs_py3
+_unpack_opargs.__doc__ = """
+Unpacks the opcodes and their arguments from the given bytecode. Works in Python 2.7 and Python 3.
+
+Args:
+    code (bytes): The bytecode to unpack.
+
+Yields:
+    tuple: A tuple containing the offset, opcode, and argument of each opcode.
+
+It takes a bytecode object as input and yields a sequence of tuples containing the offset, opcode, and argument of each
+opcode in the bytecode.
+"""
+del _unpack_opargs_py2, _unpack_opargs_py3
+
+
+# noinspection SpellCheckingInspection
+def isemptyfunction(func):
+    """
+    Checks if a function is empty or not.
+
+    Args:
+        func (function): The function to check.
+
+    Returns:
+        bool: True if the function is empty, False otherwise.
+
+    Raises:
+        TypeError: If the input object is not a function.
+
+    This function determines whether the given function is empty or not. An empty function is defined here as a
+    function that:
+    - may contain operators pass, return;
+    - may only return None;
+    - may contain a documentation string (classic documentation string in triple quotes, in double/single quotes as
+    `str` type, and also in `bytes` type) and comments;
+    - may contain any unreachable code (see `odd_function` in Examples);
+    - may contain statements to have no effect (see `odd_function` in Examples).
+    If something else is present in the function, then it is considered not empty. It can be useful in scenarios where
+    you need to check if a function has any implementation or if it is just a placeholder.
+
+    The definition above may seem strange, but an empty function is defined this way for the sake of compatibility with
+    the versions of Python supported by this project (since the interpreter behaves differently on different versions
+    of Python, a simpler implementation of this function would return different values).
+
+    Examples:
+        >>> def empty_function():
+        ...     pass
+        ...
+        >>> print(isemptyfunction(empty_function))
+        True
+        >>> def empty_function():
+        ...     return
+        ...
+        >>> print(isemptyfunction(empty_function))
+        True
+        >>> def empty_function():
+        ...     return None
+        ...
+        >>> print(isemptyfunction(empty_function))
+        True
+        >>> def empty_function():  # doctest:+SKIP
+        ...     # only in Python3
+        ...     ...
+        ...
+        >>> print(isemptyfunction(empty_function))
+        True
+        >>> def empty_function():
+        ...     \""" docstring \"""
+        ...
+        >>> print(isemptyfunction(empty_function))
+        True
+        >>> def empty_function():
+        ...     "doc"
+        ...
+        >>> print(isemptyfunction(empty_function))
+        True
+        >>> def empty_function():
+        ...     b'Hello World!'
+        ...     return
+        >>> print(isemptyfunction(empty_function))
+        True
+        >>> def empty_function():
+        ...     # comments
+        ...     return
+        ...
+        >>> print(isemptyfunction(empty_function))
+        True
+        >>> def empty_function():
+        ...     \""" docstring \"""
+        ...     return
+        ...
+        >>> print(isemptyfunction(empty_function))
+        True
+        >>> empty_lambda = lambda x: None
+        >>> print(isemptyfunction(empty_lambda))
+        True
+        >>> def non_empty_function():
+        ...     print("Hello, world!")
+        ...
+        >>> print(isemptyfunction(non_empty_function))
+        False
+        >>> def non_empty_function():
+        ...     return 0
+        ...
+        >>> print(isemptyfunction(non_empty_function))
+        False
+        >>> not_empty_lambda = lambda: 0
+        >>> print(isemptyfunction(not_empty_lambda))
+        False
+        >>> # All odd_functions is empty!
+        >>> def odd_function():  # statement (immutable) to have no effect
+        ...     None
+        ...     100
+        ...     True
+        ...     ()
+        ...     "string"
+        ...     b'd\x01'
+        ...     return
+        ...
+        >>> print(isemptyfunction(odd_function))
+        True
+        >>> def odd_function():  # statement (mutable) to have no effect
+        ...     []
+        ...     return
+        ...
+        >>> print(isemptyfunction(odd_function))
+        True
+        >>> def odd_function(): \""" docstring \"""; return; None;  # oneline function and unreachable code
+        >>> print(isemptyfunction(odd_function))
+        True
+        >>> def odd_function():  # unreachable code
+        ...     return
+        ...     a = 2
+        ...
+        >>> print(isemptyfunction(odd_function))
+        True
+    """
+    if not isinstance(func, FunctionType):
+        raise TypeError("'func' argument must be a function")
+
+    code = func.__code__
+    gen_opargs = _unpack_opargs(code.co_code)
+    op, special_op, special_arg = 0, 0, 0
+    for _, op, arg in gen_opargs:
+        if op == 9:  # skip if NOP; py310
+            continue
+
+        if op == 1 and special_op:  # skip when POP_TOP next for special opcode
+            special_op = 0
+            continue
+
+        if op >= HAVE_ARGUMENT:  # special opcode
+            if op == EXTENDED_ARG:
+                continue
+
+            if not special_op:  # skip when first opcode have argument (special opcode)
+                special_op, special_arg = op, arg
+                continue
+
+            return False  # two special opcodes in a row
+
+        break
+
+    if special_op != 100:  # first opcode must be LOAD_CONST
+        return False
+
+    if code.co_consts[special_arg] is not None:  # check for docstring
+        return False
+
+    return op == 83  # second opcode must be RETURN_VALUE
@@ -0,0 +1,9 @@
+from typing import Any, Callable, Generator, List, Optional, Tuple
+
+__all__: List[str]
+
+# noinspection SpellCheckingInspection
+def _unpack_opargs(code: bytes) -> Generator[Tuple[int, int, Optional[int]], None, None]: ...
+
+# noinspection SpellCheckingInspection
+def isemptyfunction(func: Callable[..., Any]) -> bool: ...
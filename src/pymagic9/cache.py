@@ -0,0 +1,300 @@
+"""
+This module provides the persistent on-disk cache of the bytecode analysis results of the `nameof` call sites:
+`enablecache`, `savecache` and `disablecache`.
+"""
+import mmap
+import os
+import struct
+import sys
+import weakref
+import zlib
+
+from types import CodeType
+
+from . import names
+
+# noinspection SpellCheckingInspection
+__all__ = ["AnalysisCache", "disablecache", "enablecache", "savecache"]
+
+try:
+    from importlib.util import MAGIC_NUMBER as _PYTHON_MAGIC
+except ImportError:  # pragma: no cover
+    # noinspection PyDeprecation
+    import imp
+    _PYTHON_MAGIC = imp.get_magic()
+
+try:
+    from hashlib import blake2b as _blake2b
+
+    def _digest(data):
+        return _blake2b(data, digest_size=16).digest()
+except ImportError:  # pragma: no cover
+    from hashlib import sha1 as _sha1
+
+    def _digest(data):
+        return _sha1(data).digest()[:16]
+
+_replace = getattr(os, "replace", os.rename)
+
+_MAGIC = b"PM9A"
+_VERSION = 1
+_HEADER = struct.Struct("<4sH4sII")  # magic, format version, python magic, capacity, count
+_KEY = struct.Struct("<16sii")  # digest of the code object, f_lasti, f_lineno
+_SLOT = struct.Struct("<%dsI" % _KEY.size)  # key, offset of the value in the pool
+_LENGTH = struct.Struct("<H")
+_EMPTY = b"\0" * _KEY.size
+
+_ATEXIT = False  # whether `savecache` is registered to be called at exit
+
+
+def _encode(name):
+    # the result of `nameof` is a name or None
+    return b"N" if name is None else b"S" + name.encode("utf-8")
+
+
+def _decode(data):
+    return None if data == b"N" else data[1:].decode("utf-8")
+
+
+def _constants(code):
+    """
+    Returns the stable representation of the constants of the code object: the code objects are represented by their
+    bytecode and constants, and the items of frozensets are sorted.
+
+    """
+    constants = []
+    for constant in code.co_consts:
+        if isinstance(constant, CodeType):
+            constant = (constant.co_code, _constants(constant))
+        elif isinstance(constant, frozenset):
+            constant = sorted(map(repr, constant))
+
+        constants.append(constant)
+
+    return repr(constants)
+
+
+class AnalysisCache(object):
+    """
+    Persistent cache of the bytecode analysis results in a file.
+
+    Args:
+        path (str): The path of the cache file. It is created by `save` if it does not exist.
+
+    The results are keyed by the hash of the bytecode, constants, names, first line number and line table of the code
+    object and by the instruction and the line of the frame, so they stay valid as long as the code is not changed. The
+    file is specific to the version of Python: a file of another version or format is ignored.
+
+    The file is an open addressing hash table of fixed-size slots followed by the pool of the encoded results. It is
+    memory-mapped on load, so only the slots of the looked-up results are read. New results are kept in memory until
+    `save` writes the merged table to a temporary file and replaces the cache file with it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._map = None
+        self._capacity, self._count, self._pool = 0, 0, 0
+        self._new = {}
+        self._digests = weakref.WeakKeyDictionary()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError):  # no file, or an empty file
+            return
+
+        if len(mapped) >= _HEADER.size:
+            magic, version, python, capacity, count = _HEADER.unpack_from(mapped)
+            pool = _HEADER.size + capacity * _SLOT.size
+            if (magic, version, python) == (_MAGIC, _VERSION, _PYTHON_MAGIC) and len(mapped) >= pool and \
+                    capacity & (capacity - 1) == 0:
+                self._map, self._capacity, self._count, self._pool = mapped, capacity, count, pool
+                return
+
+        mapped.close()
+
+    def __len__(self):
+        return self._count + len(self._new)
+
+    def digest(self, code):
+        """
+        Returns the hash of the code object, computed once per code object.
+
+        """
+        try:
+            return self._digests[code]
+        except KeyError:
+            pass
+
+        lines = getattr(code, "co_linetable", None) or code.co_lnotab
+        data = b"\0".join((code.co_code, _constants(code).encode("utf-8"), repr(code.co_names).encode("utf-8"),
+                           str(code.co_firstlineno).encode("ascii"), lines))
+        digest = self._digests[code] = _digest(data)
+        return digest
+
+    def _find(self, key):
+        mapped = self._map
+        if mapped is None:
+            return None
+
+        mask = self._capacity - 1
+        i = zlib.crc32(key) & mask
+        for _ in range(self._capacity):
+            slot, offset = _SLOT.unpack_from(mapped, _HEADER.size + i * _SLOT.size)
+            if slot == key:
+                return self._value(offset)
+
+            if slot == _EMPTY:
+                break
+
+            i = (i + 1) & mask
+
+        return None
+
+    def _value(self, offset):
+        start = self._pool + offset + _LENGTH.size
+        return self._map[start:start + _LENGTH.unpack_from(self._map, self._pool + offset)[0]]
+
+    def lookup(self, code, lasti, lineno, analyze, *args):
+        """
+        Returns the cached result of the analysis of the code object, or calls `analyze(*args)` and caches its result.
+
+        """
+        key = _KEY.pack(self.digest(code), lasti, -1 if lineno is None else lineno)
+        data = self._new.get(key) or self._find(key)
+        if data is not None:
+            return _decode(data)
+
+        value = analyze(*args)
+        self._new[key] = _encode(value)
+        return value
+
+    def _items(self):
+        mapped = self._map
+        if mapped is not None:
+            for i in range(self._capacity):
+                key, offset = _SLOT.unpack_from(mapped, _HEADER.size + i * _SLOT.size)
+                if key != _EMPTY:
+                    yield key, self._value(offset)
+
+        for item in self._new.items():
+            yield item
+
+    def save(self):
+        """
+        Writes the results to the cache file if there are new results.
+
+        """
+        if not self._new:
+            return
+
+        items = dict(self._items())
+        capacity = 1
+        while capacity < 2 * len(items):
+            capacity *= 2
+
+        table = [None] * capacity
+        pool = []
+        size = 0
+        for key, data in items.items():
+            i = zlib.crc32(key) & (capacity - 1)
+            while table[i] is not None:
+                i = (i + 1) & (capacity - 1)
+
+            table[i] = _SLOT.pack(key, size)
+            pool.append(_LENGTH.pack(len(data)) + data)
+            size += _LENGTH.size + len(data)
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        temporary = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(temporary, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, _PYTHON_MAGIC, capacity, len(items)))
+            f.write(b"".join(_SLOT.pack(_EMPTY, 0) if slot is None else slot for slot in table))
+            f.write(b"".join(pool))
+
+        self.close()
+        _replace(temporary, self.path)
+        self._new = {}
+        self._load()
+
+    def close(self):
+        """
+        Unmaps the cache file. The unsaved results are kept.
+
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._capacity, self._count, self._pool = 0, 0, 0
+
+
+# noinspection SpellCheckingInspection
+def enablecache(path=None):
+    """
+    Enables the persistent cache of the bytecode analysis results of the `nameof` call sites.
+
+    Args:
+        path (str, optional): The path of the cache file. Default is ``__pycache__/pymagic9.<tag>.cache`` in the
+         current directory, where ``<tag>`` is the cache tag of the interpreter (like ``cpython-310``). A relative path
+         is resolved against the current directory at the call, so changing the directory later does not move the
+         file saved at the exit.
+
+    Returns:
+        AnalysisCache: The enabled cache.
+
+    The existing cache file is memory-mapped, and the results found in it are not computed again. The new results are
+    written to the file by `savecache`, by `disablecache` or at the exit of the interpreter. The previously enabled
+    cache is saved and closed.
+
+    Finding a call site of `nameof` scans the line table of the code object up to the line of the call, so the cache
+    pays off for the call sites far from the beginning of long functions. `isemptyfunction` is not cached: its analysis
+    reads only the first instructions of the code and is cheaper than hashing the code object.
+
+    Examples:
+        >>> cache = enablecache("/tmp/pymagic9.cache")  # doctest:+SKIP
+        >>> x = 1
+        >>> nameof(x)  # doctest:+SKIP
+        'x'
+        >>> disablecache()  # doctest:+SKIP
+    """
+    if path is None:
+        tag = getattr(getattr(sys, "implementation", None), "cache_tag", None) or "python%d%d" % sys.version_info[:2]
+        path = os.path.join("__pycache__", "pymagic9.%s.cache" % tag)
+
+    path = os.path.abspath(path)
+    global _ATEXIT
+    disablecache()
+    if not _ATEXIT:
+        import atexit
+        atexit.register(savecache)
+        _ATEXIT = True
+
+    cache = names._CACHE = AnalysisCache(path)
+    return cache
+
+
+# noinspection SpellCheckingInspection
+def savecache():
+    """
+    Writes the new results of the enabled cache to its file.
+
+    """
+    if names._CACHE is not None:
+        names._CACHE.save()
+
+
+# noinspection SpellCheckingInspection
+def disablecache():
+    """
+    Saves and disables the enabled cache.
+
+    """
+    cache, names._CACHE = names._CACHE, None
+    if cache is not None:
+        cache.save()
+        cache.close()
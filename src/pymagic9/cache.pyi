@@ -0,0 +1,22 @@
+from types import CodeType
+from typing import Any, Callable, List, Optional
+
+__all__: List[str]
+
+class AnalysisCache(object):
+    path: str
+    def __init__(self, path: str) -> None: ...
+    def __len__(self) -> int: ...
+    def digest(self, code: CodeType) -> bytes: ...
+    def lookup(self, code: CodeType, lasti: int, lineno: int, analyze: Callable[..., Any], *args: Any) -> Any: ...
+    def save(self) -> None: ...
+    def close(self) -> None: ...
+
+# noinspection SpellCheckingInspection
+def enablecache(path: Optional[str] = ...) -> AnalysisCache: ...
+
+# noinspection SpellCheckingInspection
+def savecache() -> None: ...
+
+# noinspection SpellCheckingInspection
+def disablecache() -> None: ...
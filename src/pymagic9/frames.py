@@ -0,0 +1,606 @@
+"""
+This module provides functions for accessing the stack of frames: `getframe`, `isfunctionincallchain`, `findlocal`,
+`findrunning`, the caller identity helpers `callername`, `callermodule` and `callerlocation`, and the tracking of the
+call chain by `sys.monitoring`: `trackcallchain` and `untrackcallchain`.
+"""
+import sys
+
+from types import CodeType, FunctionType
+
+# noinspection SpellCheckingInspection
+__all__ = ["callerlocation", "callermodule", "callername", "findlocal", "findrunning", "getframe",
+           "isfunctionincallchain", "trackcallchain", "untrackcallchain"]
+
+_HAS_CO_QUALNAME = sys.version_info >= (3, 11)
+
+# qualified names of code objects by code objects, created on first use
+_QUALNAMES = None
+# the flag of the code objects of functions (and not of class bodies and modules)
+_CO_OPTIMIZED = 0x1
+
+# indexes of the local names of code objects by ids of code objects: {id: (weak reference to code, {name: index})}
+_LOCALNAMES = {}
+
+_MISSING = object()
+
+# code objects tracked by `sys.monitoring` by their ids
+_TRACKED = {}
+# numbers of the active frames of the tracked code objects by thread idents: {ident: {id of code: count}}
+_ACTIVE = {}
+# the `sys.monitoring` tool id while code objects are tracked
+_TOOL = None
+_get_ident = None
+# the last frozenset of the targets of `findrunning` and its code objects by their ids
+_TARGETS = (None, {})
+
+
+# noinspection SpellCheckingInspection
+def _getframe(__depth=0):
+    """
+    Polyfill for the built-in sys._getframe function.
+
+    Args:
+        __depth (int, optional): The depth of the call stack to traverse. A value of 0 represents the current frame,
+         1 represents the caller's frame, and so on.
+
+    Returns:
+        FrameType or None: The frame object at the specified depth in the call stack, or None if the depth is out of
+        range.
+
+    Raises:
+        TypeError: If the depth argument is not an integer.
+        ValueError: If call stack is not deep enough.
+
+    This function provides a polyfill for the built-in `sys._getframe` function, which is used to access the call stack
+    frames. It allows you to retrieve the frame object at a specific depth in the call stack.
+
+    The depth argument specifies the number of frames to traverse. A value of 0 or less 0 represents the current frame,
+    1 represents the caller's frame, and so on. If the depth is negative, it will traverse the frames in the opposite
+    direction.
+
+    If the specified depth is out of range (i.e., greater than the number of frames in the call stack), the function
+    raises ValueEror.
+
+    Examples:
+        >>> def foo():
+        ...     frame = _getframe(1)
+        ...     print(frame.f_code.co_name)  # Output: bar
+        >>> def bar():
+        ...     foo()
+        >>> bar()
+        bar
+    """
+
+    if not isinstance(__depth, int):
+        if sys.version_info >= (3, 5):
+            raise TypeError('an integer is required (got type %s)' % type(__depth))
+        elif sys.version_info < (3, ):  # pragma: no cover
+            raise TypeError('an integer is required')
+
+    try:
+        raise TypeError
+    except TypeError:
+        tb = sys.exc_info()[2]
+
+    if tb is None: return None  # noqa E702
+
+    frame = tb.tb_frame.f_back
+    del tb
+
+    if __depth < 0: return frame  # noqa E702
+
+    try:
+        while __depth:  # while i and frame: to disable the exception
+            frame = frame.f_back  # type: ignore #noqa
+            __depth -= 1
+    except AttributeError:
+        raise ValueError('call stack is not deep enough')
+
+    return frame
+
+
+# noinspection PyUnresolvedReferences,SpellCheckingInspection,PyProtectedMember
+getframe = sys._getframe if hasattr(sys, '_getframe') else _getframe
+
+
+# noinspection SpellCheckingInspection
+def isfunctionincallchain(o, __depth=-1):
+    """
+    Determines whether the given function object or code object is present in the call chain.
+
+    Args:
+        o (FunctionType or CodeType): The function object or code object to check.
+        __depth (int, optional): The depth of the call chain to search. Default is -1, which means search the entire
+         call chain.
+
+    Returns:
+        bool: True if the function or code object is found in the call chain, False otherwise.
+
+    Raises:
+        TypeError: If the input object is not a function or code object.
+
+    This function checks if the given function object or code object is present in the call chain of the current
+    execution. The call chain is the sequence of function calls that led to the current point of execution.
+
+    The frames are walked on every call, unless the code object is tracked by `trackcallchain` and the entire call
+    chain is searched: then the number of its active frames in the current thread is looked up.
+
+    Warning:
+         Be careful when debugging in PyCharm - there may be incorrect behavior when a function that is being debugged
+         (a function that has breakpoints) is passed as an argument.
+
+    Examples:
+        >>> def foo():
+        ...     return isfunctionincallchain(foo)
+        ...
+        >>> def bar():
+        ...     return isfunctionincallchain(foo)
+        ...
+        >>> def baz():
+        ...     return foo()
+        ...
+        >>> print(foo())
+        True
+        >>> print(bar())
+        False
+        >>> print(baz())
+        True
+    """
+    if not isinstance(o, (CodeType, FunctionType)):
+        raise TypeError('\'o\' must be code or function')
+
+    code = o if not hasattr(o, "__code__") else o.__code__  # type: ignore
+    if __depth == -1 and id(code) in _TRACKED:
+        counts = _ACTIVE.get(_get_ident())
+        return bool(counts and counts.get(id(code)))
+
+    frame = getframe(1)
+    while frame and __depth:
+        if frame.f_code is code:
+            return True
+
+        __depth -= 1
+        frame = frame.f_back
+
+    return False
+
+
+def _codequalname(code, namespace):
+    """
+    Returns the qualified name of the function of the code object running with the given global namespace.
+
+    The `co_qualname` attribute is used since Python 3.11. Before, the code object is searched once among the functions
+    and classes of the global namespace of its module and the code objects nested in their code (see `_qualnamein`),
+    and the name is cached by the code object. The name of the code object is returned if it is not found (e.g. for the
+    code of a module or a function defined in another module).
+
+    """
+    global _QUALNAMES
+    if _HAS_CO_QUALNAME:
+        return code.co_qualname
+
+    if _QUALNAMES is None:
+        import weakref
+        _QUALNAMES = weakref.WeakKeyDictionary()
+
+    try:
+        return _QUALNAMES[code]
+    except KeyError:
+        pass
+
+    qualname = _qualnamein(code, namespace)
+    _QUALNAMES[code] = qualname
+    return qualname
+
+
+def _qualnamein(code, namespace):
+    """
+    Returns the qualified name of the code object found among the functions (including the decorated ones), the methods
+    of the classes declared in the module and the code objects nested in their code, or the name of the code object.
+    The search costs as much as the module is big (and not the whole heap, as a search among the referrers of the code
+    object would).
+
+    """
+    module = namespace.get("__name__")
+    stack = [(o, "") for o in list(namespace.values())]  # (object, qualified name of the enclosing class + '.')
+    seen = set()
+    while stack:
+        o, prefix = stack.pop()
+        if id(o) in seen:
+            continue
+
+        seen.add(id(o))
+        if isinstance(o, (staticmethod, classmethod)):
+            o = o.__func__
+        elif isinstance(o, property):
+            stack.extend((accessor, prefix) for accessor in (o.fget, o.fset, o.fdel))
+            continue
+
+        if isinstance(o, FunctionType):
+            qualname = getattr(o, "__qualname__", prefix + o.__name__)
+            found = qualname if o.__code__ is code else _nestedqualname(code, o.__code__, qualname)
+            if found is not None:
+                return found
+
+            wrapped = getattr(o, "__wrapped__", None)
+            if wrapped is not None:
+                stack.append((wrapped, prefix))
+        elif isinstance(o, type) and o.__module__ == module:
+            prefix = getattr(o, "__qualname__", prefix + o.__name__) + "."
+            stack.extend((value, prefix) for value in list(vars(o).values()))
+
+    return code.co_name
+
+
+def _nestedqualname(code, parent, qualname):
+    """
+    Returns the qualified name of the code object nested in the code of the function or class with the given qualified
+    name, or None if it is not nested.
+
+    """
+    for const in parent.co_consts:
+        if isinstance(const, CodeType):
+            # the names of the nested code objects of functions (not class bodies) are prefixed with '<locals>'
+            name = "%s.%s%s" % (qualname, "<locals>." if parent.co_flags & _CO_OPTIMIZED else "", const.co_name)
+            found = name if const is code else _nestedqualname(code, const, name)
+            if found is not None:
+                return found
+
+    return None
+
+
+# noinspection SpellCheckingInspection
+def callername(__depth=1, qualified=False):
+    """
+    Returns the name of the function at the given depth of the call stack.
+
+    Args:
+        __depth (int, optional): The depth of the call stack. A value of 0 represents the function calling `callername`,
+         1 represents its caller and so on. Default is 1.
+        qualified (bool, optional): Whether to return the qualified name (`__qualname__`) of the function. Default is
+         False.
+
+    Returns:
+        str: The name of the function, or the qualified name if `qualified` is True.
+
+    Raises:
+        ValueError: If call stack is not deep enough.
+
+    Only the code object of the frame is used, so this is much cheaper than `inspect.stack()`. Before Python 3.11 the
+    qualified name is resolved once per code object and cached.
+
+    Examples:
+        >>> def foo():
+        ...     return callername()
+        ...
+        >>> def bar():
+        ...     return foo()
+        ...
+        >>> print(bar())
+        bar
+    """
+    frame = getframe(__depth + 1)
+    return _codequalname(frame.f_code, frame.f_globals) if qualified else frame.f_code.co_name
+
+
+# noinspection SpellCheckingInspection
+def callermodule(__depth=1):
+    """
+    Returns the name of the module of the function at the given depth of the call stack.
+
+    Args:
+        __depth (int, optional): The depth of the call stack. A value of 0 represents the function calling
+         `callermodule`, 1 represents its caller and so on. Default is 1.
+
+    Returns:
+        str or None: The `__name__` of the global namespace of the frame, or None if it is not defined.
+
+    Raises:
+        ValueError: If call stack is not deep enough.
+
+    Examples:
+        >>> def foo():
+        ...     return callermodule(0)
+        ...
+        >>> print(foo())
+        __main__
+    """
+    return getframe(__depth + 1).f_globals.get("__name__")
+
+
+# noinspection SpellCheckingInspection
+def callerlocation(__depth=1):
+    """
+    Returns the file name and the current line number of the function at the given depth of the call stack.
+
+    Args:
+        __depth (int, optional): The depth of the call stack. A value of 0 represents the function calling
+         `callerlocation`, 1 represents its caller and so on. Default is 1.
+
+    Returns:
+        tuple: The file name of the code object and the current line number of the frame.
+
+    Raises:
+        ValueError: If call stack is not deep enough.
+
+    Examples:
+        >>> def foo():
+        ...     return callerlocation(0)
+        ...
+        >>> print(foo()[1])
+        2
+    """
+    frame = getframe(__depth + 1)
+    return frame.f_code.co_filename, frame.f_lineno
+
+
+def _localnames(code):
+    """
+    Builds the index of the local names of the code object: the positions of the names in `co_varnames`, `co_cellvars`
+    and `co_freevars` by the names. Returns the cache entry: the weak reference to the code object and the index.
+
+    The entry is removed from the cache when the code object is deleted.
+
+    """
+    import weakref
+    key = id(code)
+    names = code.co_varnames + code.co_cellvars + code.co_freevars
+    index = dict((name, i) for i, name in reversed(list(enumerate(names))))
+    entry = _LOCALNAMES[key] = (weakref.ref(code, lambda _: _LOCALNAMES.pop(key, None)), index)
+    return entry
+
+
+# noinspection SpellCheckingInspection
+def findlocal(name, __depth=-1, default=_MISSING):
+    """
+    Finds the value of the local variable with the given name in the call chain.
+
+    Args:
+        name (str): The name of the local variable.
+        __depth (int, optional): The depth of the call chain to search. Default is -1, which means search the entire
+         call chain.
+        default (optional): The value returned if the variable is not found. If it is not given, NameError is raised.
+
+    Returns:
+        The value of the variable in the nearest frame, starting from the function calling `findlocal`, in which the
+        variable is defined and bound.
+
+    Raises:
+        NameError: If the variable is not found and the default value is not given.
+
+    A frame is skipped without touching its locals if the name is not a local, cell or free variable of its code
+    object, which is checked with an index cached per code object. Only the locals of the frames that define the name
+    are read. Since Python 3.13 `f_locals` is a proxy reading the single value; before, it is a snapshot of the locals
+    of that frame.
+
+    Examples:
+        >>> def foo():
+        ...     return findlocal("request_id")
+        ...
+        >>> def bar():
+        ...     request_id = 42
+        ...     return foo()
+        ...
+        >>> print(bar())
+        42
+    """
+    frame = getframe(1)
+    while frame and __depth:
+        code = frame.f_code
+        if name in (_LOCALNAMES.get(id(code)) or _localnames(code))[1]:
+            try:
+                return frame.f_locals[name]
+            except KeyError:  # the variable is not bound yet or is deleted
+                pass
+
+        __depth -= 1
+        frame = frame.f_back
+
+    if default is _MISSING:
+        raise NameError("name %r is not found in the call chain" % name)
+
+    return default
+
+
+# noinspection SpellCheckingInspection
+def findrunning(o, __depth=-1):
+    """
+    Finds the frames of the given functions or code objects in the call stacks of all threads.
+
+    Args:
+        o (FunctionType or CodeType or Iterable): The function object or code object, or an iterable of them. The
+         targets given by a `frozenset` are validated and mapped by the ids of the code objects once for the repeated
+         queries with the same `frozenset` object.
+        __depth (int, optional): The number of the frames searched in every thread. Default is -1, which means search
+         the entire call stacks.
+
+    Returns:
+        list: The ``(thread ident, depth, code object)`` tuples of the found frames. The depth is counted from the
+        innermost frame of the thread, which is the function calling `findrunning` in the current thread.
+
+    Raises:
+        TypeError: If an object is not a function or code object.
+
+    The call stacks are taken by `sys._current_frames` and walked once for all targets, comparing the code objects of
+    the frames by their ids. The stacks of the other threads keep running, so the result is a snapshot.
+
+    Examples:
+        >>> def job(event):
+        ...     event.wait()
+        ...
+        >>> event = threading.Event()  # doctest:+SKIP
+        >>> thread = threading.Thread(target=job, args=(event, ))  # doctest:+SKIP
+        >>> thread.start()  # doctest:+SKIP
+        >>> [ident for ident, depth, code in findrunning(job)] == [thread.ident]  # doctest:+SKIP
+        True
+        >>> event.set()  # doctest:+SKIP
+    """
+    global _TARGETS
+
+    if isinstance(o, frozenset):
+        targets = _TARGETS
+        if targets[0] is o:
+            codes = targets[1]
+        else:
+            codes = dict((id(code), code) for code in _codes(o))
+            _TARGETS = (o, codes)
+    else:
+        if isinstance(o, (CodeType, FunctionType)) or not hasattr(o, "__iter__"):
+            o = (o, )
+
+        codes = dict((id(code), code) for code in _codes(o))
+
+    own = getframe(0)
+    found = []
+    for ident, frame in sys._current_frames().items():
+        if frame is own:
+            frame = frame.f_back
+
+        depth = 0
+        while frame is not None and depth != __depth:
+            code = frame.f_code
+            if id(code) in codes:
+                found.append((ident, depth, code))
+
+            depth += 1
+            frame = frame.f_back
+
+    return found
+
+
+def _codes(functions):
+    codes = []
+    for o in functions:
+        if not isinstance(o, (CodeType, FunctionType)):
+            raise TypeError('\'o\' must be code or function')
+
+        codes.append(o if not hasattr(o, "__code__") else o.__code__)
+
+    return codes
+
+
+def _enter(code, offset, exception=None):
+    # PY_START, PY_RESUME and PY_THROW (the latter is reported for all code objects)
+    key = id(code)
+    if key in _TRACKED:
+        ident = _get_ident()
+        counts = _ACTIVE.get(ident)
+        if counts is None:
+            counts = _ACTIVE[ident] = {}
+
+        counts[key] = counts.get(key, 0) + 1
+
+
+def _leave(code, offset, value):
+    # PY_RETURN, PY_YIELD and PY_UNWIND (the latter is reported for all code objects)
+    key = id(code)
+    if key in _TRACKED:
+        counts = _ACTIVE.get(_get_ident())
+        if counts and counts.get(key):  # not counted if the generator was started before the tracking
+            counts[key] -= 1
+
+
+# noinspection SpellCheckingInspection
+def trackcallchain(*functions):
+    """
+    Tracks the active frames of the given functions or code objects by `sys.monitoring` (PEP 669), so that
+    `isfunctionincallchain` searching the entire call chain for them does not walk the frames.
+
+    Args:
+        *functions (FunctionType or CodeType): The function objects or code objects to track.
+
+    Raises:
+        RuntimeError: If `sys.monitoring` is not available (Python < 3.12) or all its tool ids are in use.
+        TypeError: If an object is not a function or code object.
+
+    The numbers of the active frames of every tracked code object are kept per thread: they are incremented when a
+    frame starts or resumes (PY_START, PY_RESUME, PY_THROW) and decremented when it returns, yields or is unwound by an
+    exception (PY_RETURN, PY_YIELD, PY_UNWIND), so a suspended generator is not in the call chain. The local events are
+    enabled only for the tracked code objects, so the other code runs without overhead, except for the exceptions
+    propagating out of frames and thrown into generators (PY_UNWIND and PY_THROW cannot be enabled per code object).
+    The frames that are already active are counted on tracking. As the package is released for Python < 3.11, only
+    the call chain functions are tested on Python 3.12 (by the ``py312-callchain`` tox environment).
+
+    Examples:
+        >>> def foo():
+        ...     return isfunctionincallchain(foo)
+        ...
+        >>> trackcallchain(foo)  # doctest:+SKIP
+        >>> print(foo())  # doctest:+SKIP
+        True
+        >>> untrackcallchain(foo)  # doctest:+SKIP
+    """
+    global _TOOL, _get_ident
+    monitoring = getattr(sys, "monitoring", None)
+    if monitoring is None:
+        raise RuntimeError("'sys.monitoring' is not available")
+
+    codes = _codes(functions)
+    if _TOOL is None:
+        tool = next((i for i in (4, 3, 5, 2, 1, 0) if monitoring.get_tool(i) is None), None)
+        if tool is None:
+            raise RuntimeError("all 'sys.monitoring' tool ids are in use")
+
+        import threading
+
+        monitoring.use_tool_id(tool, "pymagic9")
+        events = monitoring.events
+        for event, callback in ((events.PY_START, _enter), (events.PY_RESUME, _enter), (events.PY_THROW, _enter),
+                                (events.PY_RETURN, _leave), (events.PY_YIELD, _leave), (events.PY_UNWIND, _leave)):
+            monitoring.register_callback(tool, event, callback)
+
+        monitoring.set_events(tool, events.PY_THROW | events.PY_UNWIND)
+        _TOOL, _get_ident = tool, threading.get_ident
+
+    events = monitoring.events
+    for code in codes:
+        key = id(code)
+        if key in _TRACKED:
+            continue
+
+        monitoring.set_local_events(_TOOL, code, events.PY_START | events.PY_RESUME | events.PY_RETURN |
+                                    events.PY_YIELD)
+        # the frames that are already active are counted at once
+        for ident, frame in sys._current_frames().items():
+            count = 0
+            while frame:
+                count += frame.f_code is code
+                frame = frame.f_back
+
+            if count:
+                _ACTIVE.setdefault(ident, {})[key] = count
+
+        _TRACKED[key] = code
+
+
+# noinspection SpellCheckingInspection
+def untrackcallchain(*functions):
+    """
+    Stops tracking the given functions or code objects (all tracked ones if none are given) by `sys.monitoring`.
+
+    Args:
+        *functions (FunctionType or CodeType): The function objects or code objects to stop tracking.
+
+    Raises:
+        TypeError: If an object is not a function or code object.
+
+    The tool id of `sys.monitoring` is freed when no code objects are tracked.
+    """
+    global _TOOL
+    codes = _codes(functions) if functions else list(_TRACKED.values())
+    if _TOOL is None:
+        return
+
+    monitoring = sys.monitoring  # type: ignore
+    for code in codes:
+        key = id(code)
+        if _TRACKED.pop(key, None) is code:
+            monitoring.set_local_events(_TOOL, code, 0)
+            for counts in list(_ACTIVE.values()):
+                counts.pop(key, None)
+
+    if not _TRACKED:
+        monitoring.set_events(_TOOL, 0)
+        monitoring.free_tool_id(_TOOL)
+        _TOOL = None
+        _ACTIVE.clear()
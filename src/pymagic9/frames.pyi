@@ -0,0 +1,35 @@
+from types import CodeType, FrameType
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+__all__: List[str]
+
+# noinspection SpellCheckingInspection
+def _getframe(__depth: int) -> Optional[FrameType]: ...
+
+# noinspection SpellCheckingInspection
+getframe: Callable[[int],  Optional[FrameType]]
+
+# noinspection SpellCheckingInspection
+def isfunctionincallchain(o: Union[Callable[[Any], Any], CodeType], __depth: int = ...) -> bool: ...
+
+# noinspection SpellCheckingInspection
+def callername(__depth: int = ..., qualified: bool = ...) -> str: ...
+
+# noinspection SpellCheckingInspection
+def callermodule(__depth: int = ...) -> Optional[str]: ...
+
+# noinspection SpellCheckingInspection
+def callerlocation(__depth: int = ...) -> Tuple[str, int]: ...
+
+# noinspection SpellCheckingInspection
+def findrunning(o: Union[Callable[..., Any], CodeType, Iterable[Union[Callable[..., Any], CodeType]]],
+                __depth: int = ...) -> List[Tuple[int, int, CodeType]]: ...
+
+# noinspection SpellCheckingInspection
+def trackcallchain(*functions: Union[Callable[..., Any], CodeType]) -> None: ...
+
+# noinspection SpellCheckingInspection
+def untrackcallchain(*functions: Union[Callable[..., Any], CodeType]) -> None: ...
+
+# noinspection SpellCheckingInspection
+def findlocal(name: str, __depth: int = ..., default: Any = ...) -> Any: ...
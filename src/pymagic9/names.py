@@ -0,0 +1,68 @@
+"""
+This module provides the `nameof` function that determines the name of an object by the bytecode of the calling frame.
+"""
+import dis
+import sys
+
+from opcode import hasname
+
+from .bytecode import _unpack_opargs
+from .frames import getframe
+
+# noinspection SpellCheckingInspection
+__all__ = ["nameof"]
+
+# the persistent cache of the analysis results of the call sites, set by `pymagic9.cache.enablecache`
+_CACHE = None
+
+
+# noinspection SpellCheckingInspection,PyUnusedLocal
+def nameof(o):
+    """
+    Returns the name of an object.
+
+    Args:
+        o (object): The object for which to retrieve the name.
+
+    Returns:
+        str: The name of the object or empty string.
+
+    This function correctly determines the 'name' of an object, without being tied to the object itself.
+    It can be used to retrieve the name of variables, functions, classes, modules, and more. An empty string will be
+    returned if an explicit value or call is passed to the `nameof` function as an argument.
+
+    The results are stored by the call sites in the persistent cache if it is enabled by `enablecache`.
+
+    Examples:
+        >>> var1 = [1, 2]
+        >>> var2 = var1
+        >>> print(nameof(var1))
+        var1
+        >>> print(nameof(var2))
+        var2
+        >>> print(nameof(123))  # doctest:+SKIP
+        empty string ("")
+    """
+    frame = getframe(1)
+    if _CACHE is not None:
+        return _CACHE.lookup(frame.f_code, frame.f_lasti, frame.f_lineno, _nameof, frame)
+
+    return _nameof(frame)
+
+
+def _nameof(frame):
+    """
+    Returns the name of the object passed to `nameof` by the bytecode of the calling frame (see `nameof`).
+
+    """
+    f_code, f_lineno = frame.f_code, frame.f_lineno
+
+    for line in dis.findlinestarts(f_code):
+        if f_lineno == line[1]:
+            ind = -3 if sys.version_info < (3,) else -2
+            _, op, arg = next(_unpack_opargs(f_code.co_code[:frame.f_lasti][ind:]))
+
+            if op not in hasname:
+                return ''
+
+            return f_code.co_names[arg]
@@ -0,0 +1,6 @@
+from typing import Any, List, Optional
+
+__all__: List[str]
+
+# noinspection SpellCheckingInspection
+def nameof(o: Any) -> Optional[str]: ...
@@ -0,0 +1,3156 @@
+"""
+This module provides the `PropertyMeta` metaclass for auto-implemented properties and the tools around it.
+"""
+import gc
+import itertools
+import operator
+import struct
+import sys
+import threading
+import time
+import weakref
+
+from collections import Counter, namedtuple
+from functools import wraps
+from multipledispatch import dispatch, Dispatcher
+from types import CodeType, FunctionType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .bytecode import isemptyfunction
+
+# noinspection SpellCheckingInspection
+__all__ = ["accessstats", "ChangeJournal", "instrument", "memoryusage", "PropertyMeta", "SharedFieldStore",
+           "SharedFieldStoreFull", "uninstrument"]
+
+
+class SharedFieldStoreFull(Exception):
+    """
+    Raised by `SharedFieldStore` when the values of ``capacity`` instances are stored and one more is written.
+
+    """
+
+
+# noinspection SpellCheckingInspection
+class SharedFieldStore(object):
+    """
+    Storage of a fixed-width auto-implemented property placed in `multiprocessing.shared_memory`.
+
+    Args:
+        fmt (str): The `struct` format character of the stored values (for example, ``'d'``, ``'q'``, ``'?'``).
+        capacity (int): The maximum number of instances whose values can be stored at the same time.
+        name (str, optional): The name of an existing shared memory block to attach to.
+
+    Raises:
+        RuntimeError: If `multiprocessing.shared_memory` is not available (Python < 3.8).
+        ValueError: If the format is not a single fixed-width format character.
+
+    The shared memory block consists of two arrays: ``values`` (one item of the given format per slot) and
+    ``present`` (one byte per slot, 1 if the slot holds a value). In the owner process the store behaves like the
+    dictionary of an auto-implemented property: it is indexed by ``(instance,)`` keys, a slot is allocated on the first
+    write and released when the value is deleted or the instance is garbage collected (the store references the
+    instances weakly, except the instances that do not support weak references, which are kept alive until their values
+    are deleted). The store holds the values of at most ``capacity`` live instances at the same time: writing the value
+    of one more instance raises `SharedFieldStoreFull` (the block cannot grow, as other processes map it).
+
+    The block is created by `open` in the process that calls it first, at the latest by the first write, and not when
+    the store (or the class declaring the property) is created, so the processes importing the class (like the workers
+    started by the *spawn* method) do not create blocks of their own. Other processes attach to the block of the owner
+    by name: by ``cls.sharedstore(name).open(block)`` (so the store of the class reads the values of the owner), by
+    unpickling the store or by `SharedFieldStore.attach`, and read the values zero-copy through the ``values`` and
+    ``present`` memory views using the slot numbers returned by `slot`. Only the owner process allocates slots, so
+    attached stores are intended for reading.
+
+    The owner is responsible for releasing the block with `unlink` when it is no longer needed.
+
+    Examples:
+        >>> class Point(metaclass=PropertyMeta):  # doctest:+SKIP
+        ...     __sharedfields__ = {'x': 'd'}
+        ...
+        ...     x = property(..., ...)
+        ...
+        >>> point = Point()  # doctest:+SKIP
+        >>> point.x = 1.5  # doctest:+SKIP
+        >>> store = Point.sharedstore('x')  # doctest:+SKIP
+        >>> store.values[store.slot(point)]  # doctest:+SKIP
+        1.5
+    """
+
+    def __init__(self, fmt, capacity, name=None):
+        try:
+            from multiprocessing import shared_memory  # noqa: F401  # imported here as it is heavy and rarely used
+        except ImportError:  # pragma: no cover
+            raise RuntimeError("'multiprocessing.shared_memory' is not available")
+
+        if not isinstance(fmt, str) or len(fmt) != 1:
+            raise ValueError("'fmt' must be a single fixed-width format character")
+
+        struct.calcsize(fmt)
+        self.format, self.capacity = fmt, capacity
+        self._shm = None  # type: Any
+        self._owner = False
+        self._values = self._present = None  # type: Optional[memoryview]
+        self._slots = {}  # type: Dict[int, int]  # slots by the ids of the instances
+        self._refs = {}  # type: Dict[int, Any]  # weak references to the instances (or their keys) by their ids
+        self._free = []  # type: List[int]
+        self._next = 0
+        # slots are allocated and released and the block is created under the lock, which is reentrant as the slots of
+        # the collected instances are released by the callbacks of the weak references in any thread at any time
+        self._lock = threading.RLock()
+        if name is not None:
+            self.open(name)
+
+    @classmethod
+    def attach(cls, name, fmt, capacity):
+        """
+        Attaches to the shared memory block of an existing store.
+
+        """
+        return cls(fmt, capacity, name)
+
+    def open(self, name=None):
+        """
+        Creates the shared memory block of the store, or attaches the store to the existing block with the given name
+        (the values stored in this process are dropped). Does nothing if the store is already open without a new name.
+
+        Args:
+            name (str, optional): The name of the block of the owner store.
+
+        Returns:
+            SharedFieldStore: The store itself.
+        """
+        from multiprocessing import shared_memory
+
+        with self._lock:
+            if self._shm is not None and (name is None or name == self._shm.name):
+                return self
+
+            if self._shm is not None:
+                self._release()
+
+            itemsize = struct.calcsize(self.format)
+            capacity = self.capacity
+            if name is None:
+                shm = shared_memory.SharedMemory(create=True, size=max(capacity * (itemsize + 1), 1))
+            elif sys.version_info >= (3, 13):
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            else:
+                shm = shared_memory.SharedMemory(name=name)
+
+            buf = shm.buf
+            self._values = buf[:capacity * itemsize].cast(self.format)
+            self._present = buf[capacity * itemsize:capacity * (itemsize + 1)]
+            self._shm, self._owner = shm, name is None
+            self._slots, self._refs, self._free, self._next = {}, {}, [], 0
+
+        return self
+
+    @property
+    def name(self):
+        """
+        The name of the shared memory block (the block is created if the store is not open).
+
+        """
+        return self.open()._shm.name
+
+    @property
+    def values(self):
+        """
+        The memory view of the values by the slot numbers (the block is created if the store is not open).
+
+        """
+        return self._values if self._shm is not None else self.open()._values
+
+    @property
+    def present(self):
+        """
+        The memory view of the flags (1 if the slot holds a value) by the slot numbers (the block is created if the
+        store is not open).
+
+        """
+        return self._present if self._shm is not None else self.open()._present
+
+    @property
+    def nbytes(self):
+        """
+        The size of the shared memory block (0 if the store is not open).
+
+        """
+        return 0 if self._shm is None else self._values.nbytes + self._present.nbytes
+
+    def __reduce__(self):
+        return SharedFieldStore.attach, (self.name, self.format, self.capacity)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key):
+        return id(key[0]) in self._slots
+
+    def __getitem__(self, key):
+        slot = self._slots[id(key[0])]
+        return self._values[slot]  # type: ignore
+
+    def get(self, key, default=None):
+        slot = self._slots.get(id(key[0]))
+        return default if slot is None else self._values[slot]  # type: ignore
+
+    def __setitem__(self, key, value):
+        try:
+            slot = self._slots[id(key[0])]
+        except KeyError:
+            if self._shm is None:
+                self.open()
+
+            with self._lock:
+                slot = self._allocate(key, value)
+        else:
+            self._values[slot] = value  # type: ignore
+
+    def _allocate(self, key, value):
+        ident = id(key[0])
+        slot = self._slots.get(ident)
+        if slot is not None:  # allocated by another thread
+            self._values[slot] = value
+            return slot
+
+        try:
+            ref = weakref.ref(key[0], lambda _, ident=ident: self._collect(ident))  # type: Any
+        except TypeError:  # the instance is kept alive by its key
+            ref = key
+
+        # the slot is taken before anything else, as the callbacks releasing slots may run in between
+        if self._free:
+            slot = self._free.pop()
+        elif self._next < self.capacity:
+            slot, self._next = self._next, self._next + 1
+        else:
+            raise SharedFieldStoreFull("shared field store is full (capacity %d)" % self.capacity)
+
+        try:
+            self._values[slot] = value
+        except Exception:
+            self._free.append(slot)
+            raise
+
+        self._present[slot] = 1
+        self._slots[ident], self._refs[ident] = slot, ref
+        return slot
+
+    def __delitem__(self, key):
+        with self._lock:
+            ident = id(key[0])
+            slot = self._slots.pop(ident)
+            del self._refs[ident]
+            self._present[slot] = 0
+            self._free.append(slot)
+
+    def _collect(self, ident):
+        # releases the slot of the garbage collected instance
+        with self._lock:
+            slot = self._slots.pop(ident, None)
+            if slot is not None:
+                del self._refs[ident]
+                if self._present is not None:
+                    self._present[slot] = 0
+
+                self._free.append(slot)
+
+    def _heldkeys(self):
+        # the keys of the instances kept alive by the store
+        return [ref for ref in list(self._refs.values()) if type(ref) is tuple]
+
+    def slot(self, instance):
+        """
+        Returns the slot number of the value of the instance.
+
+        Raises:
+            KeyError: If the instance has no value in this store.
+        """
+        return self._slots[id(instance)]
+
+    def _release(self):
+        self._values.release()
+        self._present.release()
+        self._shm.close()
+
+    def close(self):
+        """
+        Releases the memory views and closes the shared memory block in this process (the store can be opened again).
+
+        """
+        with self._lock:
+            if self._shm is not None:
+                self._release()
+                self._shm = self._values = self._present = None
+
+    def unlink(self):
+        """
+        Closes the store and destroys the shared memory block (only for the owner of the block).
+
+        """
+        shm, owner = self._shm, self._owner
+        self.close()
+        if shm is not None and owner:
+            shm.unlink()
+
+
+# noinspection SpellCheckingInspection
+class ChangeJournal(object):
+    """
+    Fixed-size ring buffer of the recent writes and deletes of auto-implemented properties.
+
+    Args:
+        capacity (int): The number of the retained entries. When the journal is full, the oldest entries are
+         overwritten.
+        caller (bool, optional): Whether to record the code object of the function that made the change. Default is
+         False.
+        userepr (bool, optional): Whether to record the ``repr`` of the values instead of the values themselves.
+         Default is False.
+
+    Raises:
+        ValueError: If the capacity is not positive.
+
+    The slots of the buffer are allocated in advance, and every change costs one tuple put into the next slot, so the
+    memory of the journal does not grow and the writes are not slowed down by it. Unless ``userepr`` is true, the
+    journal keeps references to the last ``capacity`` old and new values (the values are alive until their entries are
+    overwritten); the ``repr`` of the values is safe for mutable values, but costs more per write.
+
+    Entries are `ChangeJournal.Entry` tuples: the sequence number of the change, the `time.monotonic` timestamp, the
+    ``id`` of the instance, the name of the property, the action (``'create'`` for the first write, ``'set'`` or
+    ``'delete'``), the old and the new value (None if there is no such value) and the caller code object (or None).
+
+    Examples:
+        >>> class Account(metaclass=PropertyMeta):  # doctest:+SKIP
+        ...     __changejournal__ = 1024
+        ...
+        ...     balance = property(..., ...)
+        ...
+        >>> account = Account()  # doctest:+SKIP
+        >>> account.balance = 100  # doctest:+SKIP
+        >>> account.balance = 50  # doctest:+SKIP
+        >>> [(entry.action, entry.old, entry.new) for entry in Account.changejournal().entries()]  # doctest:+SKIP
+        [('create', None, 100), ('set', 100, 50)]
+    """
+    Entry = namedtuple("Entry", ["sequence", "timestamp", "instance", "name", "action", "old", "new", "caller"])
+
+    def __init__(self, capacity, caller=False, userepr=False):
+        if capacity <= 0:
+            raise ValueError("'capacity' must be positive")
+
+        self.capacity, self.caller, self.userepr = capacity, caller, userepr
+        self._slots = [None] * capacity  # type: List[Optional[Tuple[Any, ...]]]
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return self.capacity - self._slots.count(None)
+
+    def entries(self):
+        """
+        Returns the retained entries from the oldest to the newest.
+
+        """
+        slots = sorted(slot for slot in list(self._slots) if slot is not None)
+        return [self.Entry(*slot[:4] + _journaled_values(slot[4], slot[5]) + slot[6:]) for slot in slots]
+
+    def dump(self, stream=None):
+        """
+        Writes the retained entries as lines of text from the oldest to the newest.
+
+        Args:
+            stream (file, optional): The text stream to write to. Default is ``sys.stderr``.
+        """
+        stream = sys.stderr if stream is None else stream
+        for entry in self.entries():
+            caller = entry.caller
+            stream.write("%d %.6f 0x%x %s %s %r -> %r%s\n" % (
+                entry.sequence, entry.timestamp, entry.instance, entry.name, entry.action, entry.old, entry.new,
+                "" if caller is None else " at %s:%d %s" % (caller.co_filename, caller.co_firstlineno, caller.co_name)
+            ))
+
+    def clear(self):
+        """
+        Discards all entries.
+
+        """
+        self._slots[:] = [None] * self.capacity
+
+
+def _journaled_values(old, new):
+    """
+    Returns the action, the old and the new value of the journal entry by the recorded values.
+
+    """
+    if new is _MISSING:
+        return "delete", None if old is _MISSING else old, None
+
+    return ("create", None, new) if old is _MISSING else ("set", old, new)
+
+
+class _IndexRef(weakref.ref):
+    """
+    Weak reference to an indexed instance with the indexed value and the id of the instance.
+
+    """
+    __slots__ = ("value", "key")
+
+
+class _ValueIndex(object):
+    """
+    Hash index of the instances by the values of an auto-implemented property. The instances are held by weak
+    references, and the entries of the collected instances are removed by the callbacks of the references.
+
+    """
+
+    def __init__(self, name, unique):
+        self.name, self.unique = name, unique
+        # value -> reference (unique) or value -> {id of the instance: reference}
+        self.entries = {}  # type: Dict[Any, Any]
+        entries = self.entries
+
+        def _collect(ref):
+            if unique:
+                if entries.get(ref.value) is ref:
+                    del entries[ref.value]
+            else:
+                refs = entries.get(ref.value)
+                if refs is not None and refs.get(ref.key) is ref:
+                    del refs[ref.key]
+                    if not refs:
+                        del entries[ref.value]
+
+        self._collect = _collect
+
+    def check(self, instance, value):
+        """
+        Raises ValueError if another instance has the value of the unique property.
+
+        """
+        ref = self.entries.get(value)
+        if ref is not None:
+            other = ref()
+            if other is not None and other is not instance:
+                raise ValueError("duplicate value of the unique property '%s': %r" % (self.name, value))
+
+    def pop(self, instance, value):
+        """
+        Removes the instance indexed by the value and returns its weak reference (or None).
+
+        """
+        entries = self.entries
+        if self.unique:
+            ref = entries.get(value)
+            if ref is not None and ref() is instance:
+                del entries[value]
+                return ref
+
+            return None
+
+        refs = entries.get(value)
+        if refs is None:
+            return None
+
+        ref = refs.pop(id(instance), None)
+        if not refs:
+            del entries[value]
+
+        return ref
+
+    def discard(self, instance, value):
+        """
+        Removes the instance indexed by the value.
+
+        """
+        self.pop(instance, value)
+
+    def lookup(self, value):
+        """
+        Returns the instance with the value (or None) if the index is unique, otherwise the list of the instances.
+
+        """
+        if self.unique:
+            ref = self.entries.get(value)
+            return None if ref is None else ref()
+
+        refs = self.entries.get(value)
+        if refs is None:
+            return []
+
+        instances = [ref() for ref in list(refs.values())]
+        return [instance for instance in instances if instance is not None]
+
+
+class _InstancePool(object):
+    """
+    Bounded pool of the released instances of a class reused by its constructor.
+
+    """
+
+    def __init__(self, capacity, plans):
+        self.capacity = capacity
+        # the pooled instances by their ids, in the order of the releases: one dictionary serves both as the stack of
+        # the instances and as the check of the repeated releases
+        self.instances = {}  # type: Dict[int, Any]
+        # the auto-implemented properties are cleared by their deleters to update the indexes and the journals and to
+        # call the custom deleters, the others are cleared with the __dict__
+        self.clearers = [(_peeker(plan.fields), plan.prop.fdel) for plan in plans.values() if _hooked(plan)]
+
+
+def _hooked(plan):
+    """
+    Returns whether the auto-implemented property has to be cleared by its deleter rather than with the ``__dict__``.
+
+    """
+    fdel = plan.prop.fdel
+    if fdel is None:
+        return False
+
+    if not isinstance(plan.fields, _InstanceFields) or any(getattr(fdel, mark, None) for mark in _LAYERS):
+        return True
+
+    return plan.kind != "computed" and plan.signature[2] is not _AUTO  # a custom deleter
+
+
+def _pooled(new, pool):
+    """
+    Wraps ``__new__`` of the class to return the pooled instances. An instance that is still referenced outside the
+    pool (or by weak references) after its release is dropped instead of being reused.
+
+    """
+    instances, popitem = pool.instances, pool.instances.popitem
+    refs, getrefcount, getweakrefcount = _REFS if _REFS is not None else -1, sys.getrefcount, weakref.getweakrefcount
+    plain = new is object.__new__
+
+    def __new__(cls, *args, **kwargs):
+        while instances:
+            instance = popitem()[1]
+            if getrefcount(instance) <= refs and not getweakrefcount(instance):
+                return instance
+
+        return new(cls) if plain else new(cls, *args, **kwargs)
+
+    __new__.__unpooled__ = new  # type: ignore
+    return __new__
+
+
+def _inheritedplans(cls):
+    """
+    Returns the plans of the properties inherited from all bases of the class: a name resolves to the plan of the first
+    base in the MRO that defines the name, or to no plan if that base defines it otherwise. The properties of the
+    instrumented bases are resolved to their uninstrumented originals.
+
+    """
+    plans = {}  # type: Dict[str, _PropertyPlan]
+    for base in reversed(cls.__mro__[1:]):
+        own = base.__dict__.get("_PropertyMeta__plans") or {}
+        instrumented = _INSTRUMENTED.get(base)
+        originals = instrumented[1] if instrumented else {}  # type: Dict[str, Optional[property]]
+        for key, value in base.__dict__.items():
+            if key in originals:
+                value = originals[key]
+                if value is None:  # the inherited property instrumented in the base
+                    continue
+
+            plan = own.get(key)
+            if plan is not None and plan.prop is value:
+                plans[key] = plan
+            elif key in plans:
+                del plans[key]
+
+    return plans
+
+
+def _copying(cls, plans):
+    """
+    Returns how the instances of the class are copied: the auto-implemented properties whose values are not copied
+    with the ``__dict__`` (the name, the function that returns the value or `_MISSING` and the function that writes the
+    value to the copy) and the names of the slots.
+
+    """
+    properties = []
+    for key, plan in plans.items():
+        fields, fset = plan.fields, plan.prop.fset
+        layered = fset is not None and any(getattr(fset, mark, None) for mark in _LAYERS)
+        if isinstance(fields, _InstanceFields) and not layered:
+            continue
+
+        # the setters of the journaled properties record the copying, the copies are not indexed (like the unpickled
+        # instances) until the indexed properties are assigned
+        properties.append((key, _peeker(fields), _unindexedwriter(key, fields, fset) if layered else _writer(fields)))
+
+    slots = []
+    for base in cls.__mro__:
+        names = base.__dict__.get("__slots__", ())
+        for name in (names, ) if isinstance(names, str) else names:
+            if name.startswith("__") and not name.endswith("__"):
+                name = "_%s%s" % (base.__name__.lstrip("_"), name)
+
+            if name not in ("__dict__", "__weakref__") and name not in slots:
+                slots.append(name)
+
+    return properties, tuple(slots)
+
+
+def _writer(fi):
+    def _wrapper(self, value):
+        fi[(self,)] = value
+
+    return _wrapper
+
+
+def _unindexedwriter(key, fields, fset):
+    """
+    Returns the layered setter without the index layers (recording the changes in the journal of the setter, if any).
+
+    """
+    journal = getattr(fset, "__journal__", None)
+    while True:
+        inner = getattr(fset, "__accessor__", None) or getattr(fset, "__unindexed__", None)
+        if inner is None:
+            break
+
+        fset = inner
+
+    return fset if journal is None else _journaled(fset, fields, key, journal)
+
+
+def _defined(cls, name):
+    """
+    Returns the attribute defined in the class or in its bases (None if it is not defined).
+
+    """
+    for base in cls.__mro__:
+        if name in base.__dict__:
+            return base.__dict__[name]
+
+    return None
+
+
+def _copy(self):
+    """
+    Returns the shallow copy of the instance with the values of all auto-implemented properties.
+
+    """
+    return _copied(self, None, None)
+
+
+def _deepcopy(self, memo):
+    """
+    Returns the deep copy of the instance with the deep copies of the values of all auto-implemented properties.
+
+    """
+    return _copied(self, memo, None)
+
+
+def _clone(self, **overrides):
+    """
+    Returns the shallow copy of the instance with the values of all auto-implemented properties, where the given
+    properties (or other attributes) are assigned the new values.
+
+    Args:
+        **overrides: The new values by the names of the properties. The readonly properties can also be assigned, as
+         in the initializer of the copy.
+
+    Returns:
+        The copy of the instance.
+
+    Examples:
+        >>> class Point(metaclass=PropertyMeta):  # doctest:+SKIP
+        ...     def __init__(self, x, y):
+        ...         self.x, self.y = x, y
+        ...
+        ...     x = property(...)
+        ...     y = property(...)
+        ...
+        >>> point = Point(1, 2).clone(y=3)  # doctest:+SKIP
+        >>> point.x, point.y  # doctest:+SKIP
+        (1, 3)
+    """
+    return _copied(self, None, overrides)
+
+
+def _copied(self, memo, overrides):
+    """
+    Copies the instance (deeply if ``memo`` is given) in one pass: the ``__dict__`` and the slots are copied as is, the
+    values of the auto-implemented properties kept elsewhere or hooked by indexes and journals are written by their
+    setters within the initialization window of the copy, as are the overrides.
+
+    """
+    cls = self.__class__
+    properties, slots = cls._PropertyMeta__copying
+    new = cls.__new__(cls)
+    convert = None
+    if memo is not None:
+        from copy import deepcopy
+
+        memo[id(self)] = new
+
+        def convert(value):
+            return deepcopy(value, memo)
+
+    fields = getattr(self, "__dict__", None)
+    if fields:
+        state = fields.copy()
+        for key, _, _ in properties:
+            state.pop(key, None)
+
+        if overrides:
+            state.pop(_HASH, None)
+            for key in overrides:
+                state.pop(key, None)
+
+        if convert is not None:
+            state = dict((key, convert(value)) for key, value in state.items())
+
+        new.__dict__.update(state)
+
+    for name in slots:
+        value = getattr(self, name, _MISSING)
+        if value is not _MISSING:
+            object.__setattr__(new, name, value if convert is None else convert(value))
+
+    key, window = id(new), _INITIALIZING.ids
+    window.add(key)
+    try:
+        for name, peek, write in properties:
+            value = peek(self)
+            if value is not _MISSING and not (overrides and name in overrides):
+                write(new, value if convert is None else convert(value))
+
+        if overrides:
+            for name, value in overrides.items():
+                setattr(new, name, value)
+    finally:
+        window.discard(key)
+
+    return new
+
+
+def _records(plans):
+    """
+    Returns the names of the auto-implemented properties of the class whose values are stored (in the order of the
+    declarations, the inherited properties first) and its generated ``todict``, ``totuple`` and ``fromdict`` methods.
+
+    The values kept in the ``__dict__`` of the instances are read at once by `operator.itemgetter`, the other values
+    (and the unset ones) are peeked without exceptions, and only the unset values are read by the getters (for the
+    defaults). ``fromdict`` updates the ``__dict__`` of the new instance at once with the values that the setters would
+    store as is, and calls the setters for the rest (typed, indexed, journaled and custom properties).
+
+    """
+    recorded = [(key, plan) for key, plan in plans.items() if plan.kind in ("ordinary", "readonly", "custom")]
+    names = tuple(key for key, _ in recorded)
+    peekers = tuple((key, _peeker(plan.fields)) for key, plan in recorded)
+    writers = {}  # type: Dict[str, Optional[Callable[[Any, Any], None]]]
+    for key, plan in recorded:
+        signature = plan.signature[1:] if plan.signature[0] == "frozen" else plan.signature
+        fset = plan.prop.fset
+        plain = isinstance(plan.fields, _InstanceFields) and plan.kind != "custom" and signature[8] is None and \
+            not any(getattr(fset, mark, None) for mark in _LAYERS)
+        writers[key] = None if plain else fset
+
+    direct = frozenset(key for key, fset in writers.items() if fset is None)
+
+    def _peek(self):
+        values = []
+        for name, peek in peekers:
+            value = peek(self)
+            values.append(getattr(self, name, None) if value is _MISSING else value)
+
+        return values
+
+    get = None
+    if names and all(isinstance(plan.fields, _InstanceFields) for _, plan in recorded):
+        get = operator.itemgetter(*names) if len(names) > 1 else lambda fields: (fields[names[0]], )
+
+    def todict(self):
+        """
+        Returns the values of the auto-implemented properties of the instance by their names (without the unset
+        properties).
+
+        """
+        if get is not None:
+            try:
+                return dict(zip(names, get(self.__dict__)))
+            except KeyError:  # unset values or defaults
+                pass
+
+        record = {}
+        for name, peek in peekers:
+            value = peek(self)
+            if value is _MISSING:
+                value = getattr(self, name, _MISSING)
+
+            if value is not _MISSING:
+                record[name] = value
+
+        return record
+
+    def totuple(self):
+        """
+        Returns the values of the auto-implemented properties of the instance in the order of `autoproperties` (None for
+        the unset properties).
+
+        """
+        if get is not None:
+            try:
+                return get(self.__dict__)
+            except KeyError:  # unset values or defaults
+                pass
+
+        return tuple(_peek(self))
+
+    def fromdict(cls, data):
+        """
+        Creates the instance from the values of the auto-implemented properties by their names (as returned by
+        ``todict``) without calling the initializer. The readonly properties are assigned as in the initializer, the
+        omitted properties are left unset.
+
+        Raises:
+            TypeError: If a name is not the name of an auto-implemented property.
+        """
+        new = cls.__new__(cls)
+        key, window = id(new), _INITIALIZING.ids
+        window.add(key)
+        try:
+            if direct and direct.issuperset(data):
+                new.__dict__.update(data)
+                return new
+
+            for name, value in data.items():
+                try:
+                    fset = writers[name]
+                except KeyError:
+                    raise TypeError("'%s' is not an auto-implemented property of '%s'" % (name, cls.__name__))
+
+                if fset is None:
+                    new.__dict__[name] = value
+                else:
+                    fset(new, value)
+        finally:
+            window.discard(key)
+
+        return new
+
+    for method in (todict, totuple, fromdict):
+        method.__records__ = names
+
+    return names, todict, totuple, classmethod(fromdict)
+
+
+def _refs():
+    """
+    Returns the reference count of an instance popped from the pool into a local variable that is not referenced
+    elsewhere (None if the reference counts are not available).
+
+    """
+    if not hasattr(sys, "getrefcount"):  # pragma: no cover
+        return None
+
+    instances = {0: object()}
+    instance = instances.popitem()[1]
+    return sys.getrefcount(instance)
+
+
+_REFS = _refs()
+
+
+class _InstanceFields(object):
+    """
+    Storage of the values of an auto-implemented property in the ``__dict__`` of the instances under the name of the
+    property (the property is a data descriptor, so it takes precedence over the instance attribute).
+
+    """
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _InitializationWindow(threading.local):
+    """
+    Ids of the instances whose initializers are running in the current thread.
+
+    """
+
+    def __init__(self):
+        self.ids = set()  # type: Set[int]
+
+
+# storage of values keyed by ``(instance,)``: for instances without ``__dict__`` and for shared memory
+_FIELDS_TYPES = (dict, SharedFieldStore)
+_SHARED_CAPACITY = 1024
+_ACCESSORS_NS = {}  # type: Dict[str, Dispatcher]
+_AUTO = Ellipsis
+
+# The plan of an auto-implemented property: the kind ('ordinary', 'readonly', 'custom' setter or only 'deleter'), the
+# format of the shared storage (or None), the storage of values, the signature of the declaration and the generated
+# property.
+_PropertyPlan = namedtuple("_PropertyPlan", ["kind", "storage", "fields", "signature", "prop"])
+# The checks of the values of a typed auto-implemented property: the name of the property, the types of the values (or
+# None), the converter and the validator (or None).
+_TypeCheck = namedtuple("_TypeCheck", ["name", "types", "convert", "validate"])
+
+
+@dispatch(_FIELDS_TYPES, namespace=_ACCESSORS_NS)  # noqa: F811
+def _deleter(fi):  # noqa: F811
+    def _wrapper(self):
+        try:
+            del fi[(self,)]
+        except KeyError:
+            raise AttributeError(
+                "auto-implemented field does not exist or has already been erased"
+            )
+
+    return _wrapper
+
+
+@dispatch(_InstanceFields, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _deleter(fi):  # noqa: F811
+    name = fi.name
+
+    def _wrapper(self):
+        try:
+            del self.__dict__[name]
+        except KeyError:
+            raise AttributeError(
+                "auto-implemented field does not exist or has already been erased"
+            )
+
+    return _wrapper
+
+
+# deleter for overriding an existing deleter
+# noinspection SpellCheckingInspection
+@dispatch(FunctionType, _FIELDS_TYPES, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _deleter(_fdel, fi):  # noqa: F811
+    def _wrapper(self, *args):
+        try:
+            del fi[(self,)]
+        except KeyError:
+            pass
+        finally:
+            return _fdel(self, *args)
+
+    return _wrapper
+
+
+# noinspection SpellCheckingInspection
+@dispatch(FunctionType, _InstanceFields, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _deleter(_fdel, fi):  # noqa: F811
+    name = fi.name
+
+    def _wrapper(self, *args):
+        self.__dict__.pop(name, None)
+        return _fdel(self, *args)
+
+    return _wrapper
+
+
+@dispatch(_FIELDS_TYPES, namespace=_ACCESSORS_NS)  # noqa: F811
+def _getter(fi):  # noqa: F811
+    def _wrapper(self):
+        try:
+            return fi[(self,)]
+        except KeyError:
+            raise AttributeError(
+                "auto-implemented field does not exist or has already been erased"
+            )
+
+    return _wrapper
+
+
+@dispatch(_InstanceFields, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _getter(fi):  # noqa: F811
+    name = fi.name
+
+    def _wrapper(self):
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError(
+                "auto-implemented field does not exist or has already been erased"
+            )
+
+    return _wrapper
+
+
+@dispatch(_FIELDS_TYPES, object, namespace=_ACCESSORS_NS)  # noqa: F811
+def _setter(fi, changed):  # noqa: F811
+    if changed is None:
+        def _wrapper(self, value):
+            fi[(self,)] = value
+
+        return _wrapper
+
+    def _wrapper(self, value):  # noqa: F811
+        try:
+            old = fi[(self,)]
+        except KeyError:
+            pass
+        else:
+            if not changed(old, value):
+                return
+
+        fi[(self,)] = value
+
+    return _wrapper
+
+
+@dispatch(_InstanceFields, object, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(fi, changed):  # noqa: F811
+    name = fi.name
+    if changed is None:
+        def _wrapper(self, value):
+            self.__dict__[name] = value
+
+        return _wrapper
+
+    def _wrapper(self, value):  # noqa: F811
+        fields = self.__dict__
+        try:
+            old = fields[name]
+        except KeyError:
+            pass
+        else:
+            if not changed(old, value):
+                return
+
+        fields[name] = value
+
+    return _wrapper
+
+
+# setter for readonly properties
+@dispatch(_FIELDS_TYPES, _InitializationWindow, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(fi, window):  # noqa: F811
+    def _wrapper(self, value):
+        key = (self,)
+        if key not in fi and id(self) in window.ids:
+            fi[key] = value
+
+            return
+
+        raise AttributeError("'property' is readonly")
+
+    return _wrapper
+
+
+@dispatch(_InstanceFields, _InitializationWindow, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(fi, window):  # noqa: F811
+    name = fi.name
+
+    def _wrapper(self, value):
+        fields = self.__dict__
+        if name not in fields and id(self) in window.ids:
+            fields[name] = value
+
+            return
+
+        raise AttributeError("'property' is readonly")
+
+    return _wrapper
+
+
+@dispatch(_FIELDS_TYPES, _InitializationWindow, _TypeCheck, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(fi, window, check):  # noqa: F811
+    return _typed(_setter(fi, window), check)
+
+
+@dispatch(_InstanceFields, _InitializationWindow, _TypeCheck, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(fi, window, check):  # noqa: F811
+    name = fi.name
+    _, types, convert, validate = check
+
+    # the checks are inlined to not pay for a call per assignment
+    def _wrapper(self, value):
+        if convert is not None:
+            value = convert(value)
+
+        if types is not None and not isinstance(value, types):
+            raise _mistyped(check, value)
+
+        if validate is not None and not validate(value):
+            raise ValueError("invalid value of '%s': %r" % (name, value))
+
+        fields = self.__dict__
+        if name not in fields and id(self) in window.ids:
+            fields[name] = value
+
+            return
+
+        raise AttributeError("'property' is readonly")
+
+    # the setter of the values converted beforehand (by the indexes)
+    _wrapper.__unconverted__ = _wrapper if convert is None else _setter(fi, window, check._replace(convert=None))
+    return _wrapper
+
+
+# setter for typed properties
+@dispatch(_FIELDS_TYPES, object, _TypeCheck, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(fi, changed, check):  # noqa: F811
+    return _typed(_setter(fi, changed), check)
+
+
+@dispatch(_InstanceFields, object, _TypeCheck, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(fi, changed, check):  # noqa: F811
+    name = fi.name
+    _, types, convert, validate = check
+    if convert is None and types is not None and changed is operator.ne:
+        return _checkedsetter(name, check)
+
+    # the checks are inlined to not pay for a call per assignment
+    def _wrapper(self, value):
+        if convert is not None:
+            value = convert(value)
+
+        if types is not None and not isinstance(value, types):
+            raise _mistyped(check, value)
+
+        if validate is not None and not validate(value):
+            raise ValueError("invalid value of '%s': %r" % (name, value))
+
+        fields = self.__dict__
+        if changed is not None:
+            try:
+                old = fields[name]
+            except KeyError:
+                pass
+            else:
+                if not changed(old, value):
+                    return
+
+        fields[name] = value
+
+    # the setter of the values converted beforehand (by the indexes)
+    _wrapper.__unconverted__ = _wrapper if convert is None else _setter(fi, changed, check._replace(convert=None))
+    return _wrapper
+
+
+def _checkedsetter(name, check):
+    """
+    Returns the typed setter of the property stored in the ``__dict__`` specialized for the most common case: the
+    values are not converted, their type is checked and they are compared by equality (the comparison is inlined).
+
+    """
+    _, types, _, validate = check
+    if validate is None:
+        def _wrapper(self, value):
+            if not isinstance(value, types):
+                raise _mistyped(check, value)
+
+            fields = self.__dict__
+            if name in fields and not fields[name] != value:
+                return
+
+            fields[name] = value
+    else:
+        def _wrapper(self, value):  # noqa: F811
+            if not isinstance(value, types):
+                raise _mistyped(check, value)
+
+            if not validate(value):
+                raise ValueError("invalid value of '%s': %r" % (name, value))
+
+            fields = self.__dict__
+            if name in fields and not fields[name] != value:
+                return
+
+            fields[name] = value
+
+    _wrapper.__unconverted__ = _wrapper
+    return _wrapper
+
+
+def _typed(accessor, check):
+    """
+    Wraps the setter to convert, check the type of and validate the assigned value.
+
+    """
+    name, types, convert, validate = check
+    if not any(check[1:]):
+        return accessor
+
+    def _wrapper(self, value):
+        if convert is not None:
+            value = convert(value)
+
+        if types is not None and not isinstance(value, types):
+            raise _mistyped(check, value)
+
+        if validate is not None and not validate(value):
+            raise ValueError("invalid value of '%s': %r" % (name, value))
+
+        accessor(self, value)
+
+    # the setter of the values converted beforehand (by the indexes)
+    _wrapper.__unconverted__ = _wrapper if convert is None else _typed(accessor, check._replace(convert=None))
+    return _wrapper
+
+
+def _unconverted(fset):
+    """
+    Returns the setter of the typed property that does not convert the assigned values (already converted).
+
+    """
+    inner = getattr(fset, "__invalidated__", None)
+    if inner is not None:
+        return _invalidating(_unconverted(inner), fset.__dependents__)
+
+    return getattr(fset, "__unconverted__", fset)
+
+
+def _mistyped(check, value):
+    types = check.types if isinstance(check.types, tuple) else (check.types, )
+    return TypeError("'%s' must be %s, not %s" % (
+        check.name, " or ".join(t.__name__ for t in types), type(value).__name__))
+
+
+# the types accepted by the numeric annotations
+_NUMERIC_TOWER = {float: (int, float), complex: (int, float, complex)}  # type: Dict[type, Tuple[type, ...]]
+
+
+def _annotationtypes(name, annotation, cls):
+    """
+    Returns the types of the values checked by the annotation of the property: a class or a tuple of classes, the
+    classes of ``Optional`` and ``Union`` annotations or the origin of the generic annotations (like ``list`` for
+    ``List[int]``). As in type checkers, ``float`` accepts ``int`` and ``complex`` accepts ``int`` and ``float``. String
+    annotations and forward references are evaluated in the namespace of the module of the class (where the class
+    itself is also known) and throw the ``TypeError`` exception if they cannot be resolved. Other annotations (``Any``,
+    type variables) are not checked (None is returned).
+
+    """
+    if isinstance(annotation, str) or hasattr(annotation, "__forward_arg__"):
+        source = getattr(annotation, "__forward_arg__", annotation)
+        try:
+            annotation = eval(source, vars(sys.modules[cls.__module__]), {cls.__name__: cls})
+        except Exception:
+            raise TypeError("the annotation %r of '%s' cannot be resolved in the module '%s'" % (
+                source, name, cls.__module__))
+
+    if annotation is None:
+        return type(None)
+
+    if isinstance(annotation, tuple):
+        return annotation
+
+    if isinstance(annotation, type):
+        if annotation is object or annotation.__module__ == "typing":
+            return None
+
+        return _NUMERIC_TOWER.get(annotation, annotation)
+
+    origin = getattr(annotation, "__origin__", None)
+    if origin is Union or type(annotation).__name__ == "UnionType":  # Optional[X], Union[X, Y] or X | Y
+        types = tuple(_annotationtypes(name, arg, cls) for arg in annotation.__args__)
+        return None if None in types else tuple(t for ts in types for t in (ts if isinstance(ts, tuple) else (ts, )))
+
+    return origin if isinstance(origin, type) else None
+
+
+# getter of properties with a default value
+@dispatch(_FIELDS_TYPES, object, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _getter(fi, default):  # noqa: F811
+    def _wrapper(self):
+        return fi.get((self,), default)
+
+    return _wrapper
+
+
+@dispatch(_InstanceFields, object, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _getter(fi, default):  # noqa: F811
+    name = fi.name
+
+    def _wrapper(self):
+        return self.__dict__.get(name, default)
+
+    return _wrapper
+
+
+def _factory(factory):
+    """
+    Returns the getter of the default value made by the factory (the value is kept by the getter of computed
+    properties).
+
+    """
+    def _wrapper(self):
+        return factory()
+
+    return _wrapper
+
+
+# getter of computed properties and of properties with a default factory
+@dispatch(FunctionType, _FIELDS_TYPES, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _getter(_fget, fi):  # noqa: F811
+    def _wrapper(self):
+        key = (self,)
+        try:
+            return fi[key]
+        except KeyError:
+            value = fi[key] = _fget(self)
+            return value
+
+    return _wrapper
+
+
+@dispatch(FunctionType, _InstanceFields, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _getter(_fget, fi):  # noqa: F811
+    name = fi.name
+
+    def _wrapper(self):
+        fields = self.__dict__
+        value = fields.get(name, _MISSING)  # misses are frequent, so they do not raise
+        if value is _MISSING:
+            value = fields[name] = _fget(self)
+
+        return value
+
+    return _wrapper
+
+
+def _discard(self):
+    """
+    Deleter of computed properties: the kept value is discarded by the generated deleter, and there is nothing else to
+    do.
+
+    """
+
+
+def _invalidating(accessor, dependents, delete=False):
+    """
+    Wraps the setter or the deleter of a dependency to discard the computed values of the dependent properties (given by
+    their storages) after the change.
+
+    """
+    if accessor is None:
+        return None
+
+    if all(isinstance(fi, _InstanceFields) for fi in dependents):
+        names = tuple(fi.name for fi in dependents)
+
+        def _forget(self):
+            fields = self.__dict__
+            for name in names:
+                fields.pop(name, None)
+    else:
+        def _forget(self):  # noqa: F811
+            key = (self,)
+            for fi in dependents:
+                fi.pop(key, None)
+
+    if delete:
+        def _wrapper(self):
+            accessor(self)
+            _forget(self)
+    else:
+        def _wrapper(self, value):  # noqa: F811
+            accessor(self, value)
+            _forget(self)
+
+    _wrapper.__invalidated__ = accessor  # type: ignore
+    return _layer(_wrapper, accessor, "__dependents__", dependents)
+
+
+def _layer(wrapper, accessor, mark, value):
+    """
+    Marks the wrapper of the accessor with the value of its layer (``__dependents__`` of the computed properties,
+    ``__index__`` or ``__journal__``) and the values of the layers of the wrapped accessor, so the layers already added
+    are not added again.
+
+    """
+    for name in _LAYERS:
+        setattr(wrapper, name, getattr(accessor, name, None))
+
+    setattr(wrapper, mark, value)
+    return wrapper
+
+
+def _initializer(init, peekers):
+    """
+    Wraps the initializer of the class to open the initialization window of readonly properties for the instance while
+    the initializer is running. An instance whose readonly properties are all set (returned again by a ``__new__``
+    interning the instances) is already initialized, so it is not initialized again.
+
+    """
+    def __init__(self, *args, **kwargs):
+        key, window = id(self), _INITIALIZING.ids
+        if key in window:  # the window is already opened by the initializer of a subclass
+            return init(self, *args, **kwargs)
+
+        for peek in peekers:
+            if peek(self) is _MISSING:
+                break
+        else:
+            return None
+
+        window.add(key)
+        try:
+            return init(self, *args, **kwargs)
+        finally:
+            window.discard(key)
+
+    if isinstance(init, FunctionType):
+        __init__ = wraps(init)(__init__)
+
+    __init__.__initializer__ = True  # type: ignore
+    return __init__
+
+
+# ids of instances whose initializers are running, per thread
+_INITIALIZING = _InitializationWindow()
+
+
+def _values(plans):
+    """
+    Returns the function that returns the values of the auto-implemented properties of the instance (`_MISSING` for the
+    properties without values).
+
+    """
+    names = tuple(plans)
+    if len(names) > 1 and all(isinstance(plan.fields, _InstanceFields) for plan in plans.values()):
+        get = operator.itemgetter(*names)
+
+        def _wrapper(self):
+            fields = self.__dict__
+            try:
+                return get(fields)
+            except KeyError:  # unset values or defaults
+                return tuple(getattr(self, name, _MISSING) for name in names)
+
+        return _wrapper
+
+    def _wrapper(self):  # noqa: F811
+        return tuple(getattr(self, name, _MISSING) for name in names)
+
+    return _wrapper
+
+
+def _eq(values):
+    def __eq__(self, other):
+        if other is self:
+            return True
+
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+
+        return values(self) == values(other)
+
+    __eq__._generated = True
+    return __eq__
+
+
+def _ne(values):  # pragma: no cover
+    eq = _eq(values)
+
+    def __ne__(self, other):
+        result = eq(self, other)
+        return result if result is NotImplemented else not result
+
+    __ne__._generated = True
+    return __ne__
+
+
+def _hash(plans, values):
+    """
+    Returns the ``__hash__`` of the frozen class, specialized by its properties like `_values`: if all values are kept
+    in the ``__dict__``, they are hashed as a tuple taken from the ``__dict__`` at once, without a call per hash.
+
+    """
+    window = _INITIALIZING
+
+    def _computed(self, fields):
+        result = hash(values(self))
+        if id(self) not in window.ids:  # the values are final after the initialization
+            fields[_HASH] = result
+
+        return result
+
+    names = tuple(plans)
+    if len(names) > 1 and all(isinstance(plan.fields, _InstanceFields) for plan in plans.values()):
+        get = operator.itemgetter(*names)
+
+        def __hash__(self):
+            fields = self.__dict__
+            result = fields.get(_HASH)
+            if result is None:
+                try:
+                    # all values are set, so they are final (even while the instance is being initialized)
+                    result = fields[_HASH] = hash(get(fields))
+                except KeyError:  # unset values or defaults
+                    return _computed(self, fields)
+
+            return result
+    else:
+        def __hash__(self):  # noqa: F811
+            fields = self.__dict__
+            result = fields.get(_HASH)
+            return _computed(self, fields) if result is None else result
+
+    __hash__._generated = True
+    return __hash__
+
+
+def _repr(names, values):
+    def __repr__(self):
+        items = zip(names, values(self))
+        return "%s(%s)" % (getattr(self.__class__, "__qualname__", self.__class__.__name__),
+                           ", ".join("%s=%r" % item for item in items if item[1] is not _MISSING))
+
+    __repr__._generated = True
+    return __repr__
+
+
+def _generatable(cls, name, attrs):
+    """
+    Returns whether the method of the frozen class can be generated: it is not defined in the class body, and the bases
+    inherit it from `object` or have it generated.
+
+    """
+    if name in attrs:
+        return False
+
+    for base in cls.__mro__[1:]:
+        if name in base.__dict__:
+            method = base.__dict__[name]
+            return base is object or getattr(method, "_generated", False)
+
+    return True
+
+
+def _getstate(self):
+    """
+    Returns the state of the instance of the frozen class without the cached hash (it is not valid in other processes).
+
+    """
+    state = self.__dict__.copy()
+    state.pop(_HASH, None)
+    return state
+
+
+@dispatch(_FIELDS_TYPES, namespace=_ACCESSORS_NS)  # noqa: F811
+def _peeker(fi):  # noqa: F811
+    def _wrapper(self):
+        try:
+            return fi[(self,)]
+        except KeyError:
+            return _MISSING
+
+    return _wrapper
+
+
+@dispatch(_InstanceFields, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _peeker(fi):  # noqa: F811
+    name = fi.name
+
+    def _wrapper(self):
+        return self.__dict__.get(name, _MISSING)
+
+    return _wrapper
+
+
+def _journaled(accessor, fields, name, journal, delete=False):
+    """
+    Wraps the setter or the deleter to record the changes of the property in the journal. The stored value is read
+    back after the write, so the converted value is recorded, and the writes that did not replace the stored object
+    (skipped by the change policy) are not recorded. The values are compared by identity only, as the change policy of
+    the property has already decided whether to write.
+
+    """
+    if accessor is None:
+        return None
+
+    slots, capacity, sequence = journal._slots, journal.capacity, journal._sequence
+    caller, convert = journal.caller, repr if journal.userepr else None
+    peek = _peeker(fields)
+    if delete:
+        def _wrapper(self):
+            old = peek(self)
+            accessor(self)
+            if convert is not None and old is not _MISSING:
+                old = convert(old)
+
+            i = next(sequence)
+            slots[i % capacity] = (i, _monotonic(), id(self), name, old, _MISSING,
+                                   sys._getframe(1).f_code if caller else None)
+    elif isinstance(fields, _InstanceFields):  # the most common case, the stored value is read inline
+        def _wrapper(self, value):  # noqa: F811
+            old = self.__dict__.get(name, _MISSING)
+            accessor(self, value)
+            new = self.__dict__.get(name, _MISSING)
+            if new is old or new is _MISSING:
+                return
+
+            if convert is not None:
+                old, new = old if old is _MISSING else convert(old), convert(new)
+
+            i = next(sequence)
+            slots[i % capacity] = (i, _monotonic(), id(self), name, old, new,
+                                   sys._getframe(1).f_code if caller else None)
+    else:
+        def _wrapper(self, value):  # noqa: F811
+            old = peek(self)
+            accessor(self, value)
+            new = peek(self)
+            if new is old or new is _MISSING:
+                return
+
+            if convert is not None:
+                old, new = old if old is _MISSING else convert(old), convert(new)
+
+            i = next(sequence)
+            slots[i % capacity] = (i, _monotonic(), id(self), name, old, new,
+                                   sys._getframe(1).f_code if caller else None)
+
+    _wrapper.__accessor__ = accessor  # type: ignore
+    return _layer(_wrapper, accessor, "__journal__", journal)
+
+
+def _indexed(accessor, fields, index, delete=False, convert=None):
+    """
+    Wraps the setter or the deleter to keep the instance in the index of the values of the property. The instance is
+    indexed by the stored value: the assigned value is converted by ``convert`` once, to check the uniqueness and the
+    hashability of the key before the write, and the converted value is assigned by the setter (which does not convert
+    it again). The weak reference of the old entry of the instance is reused for the new one.
+
+    """
+    if accessor is None:
+        return None
+
+    peek, entries, collect = _peeker(fields), index.entries, index._collect
+    if delete:
+        def _wrapper(self):
+            old = peek(self)
+            accessor(self)
+            if old is not _MISSING:
+                index.discard(self, old)
+    elif index.unique:
+        def _wrapper(self, value):  # noqa: F811
+            if convert is not None:
+                value = convert(value)
+
+            index.check(self, value)
+            old = peek(self)
+            accessor(self, value)
+            value = peek(self)
+            if old is value:
+                return
+
+            ref = None if old is _MISSING else index.pop(self, old)
+            if value is _MISSING:  # not stored by the custom setter
+                return
+
+            if ref is None:
+                ref = _IndexRef(self, collect)
+                ref.key = id(self)
+
+            ref.value = value
+            entries[value] = ref
+    else:
+        def _wrapper(self, value):  # noqa: F811
+            if convert is not None:
+                value = convert(value)
+
+            hash(value)  # unhashable values are rejected before the write
+            old = peek(self)
+            accessor(self, value)
+            value = peek(self)
+            if old is value:
+                return
+
+            key, ref = id(self), None
+            if old is not _MISSING:
+                refs = entries.get(old)
+                if refs is not None:
+                    ref = refs.pop(key, None)
+                    if not refs:
+                        del entries[old]
+
+            if value is _MISSING:  # not stored by the custom setter
+                return
+
+            if ref is None:
+                ref = _IndexRef(self, collect)
+                ref.key = key
+
+            ref.value = value
+            refs = entries.get(value)
+            if refs is None:
+                entries[value] = {key: ref}
+            else:
+                refs[key] = ref
+
+    _wrapper.__unindexed__ = accessor  # type: ignore
+    return _layer(_wrapper, accessor, "__index__", index)
+
+
+# marks of the layers of the wrapped accessors
+_LAYERS = ("__dependents__", "__index__", "__journal__")
+# key of the cached hash in the __dict__ of the instances of frozen classes
+_HASH = "_PropertyMeta__hash"
+_MISSING = object()
+
+
+# setter for overriding an existing setter
+# noinspection SpellCheckingInspection
+@dispatch(FunctionType, _FIELDS_TYPES, object, bool, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(_fset, fi, changed, onchange):  # noqa: F811
+    def _wrapper(self, value):
+        try:
+            old = fi[(self,)]
+        except KeyError:
+            pass
+        else:
+            if changed is not None and not changed(old, value):
+                return None if onchange else _fset(self, value)
+
+        fi[(self,)] = value
+
+        return _fset(self, value)
+
+    return _wrapper
+
+
+# noinspection SpellCheckingInspection
+@dispatch(FunctionType, _InstanceFields, object, bool, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(_fset, fi, changed, onchange):  # noqa: F811
+    name = fi.name
+
+    def _wrapper(self, value):
+        fields = self.__dict__
+        try:
+            old = fields[name]
+        except KeyError:
+            pass
+        else:
+            if changed is not None and not changed(old, value):
+                return None if onchange else _fset(self, value)
+
+        fields[name] = value
+
+        return _fset(self, value)
+
+    return _wrapper
+
+
+# noinspection SpellCheckingInspection
+@dispatch(FunctionType, _FIELDS_TYPES, object, bool, _TypeCheck, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(_fset, fi, changed, onchange, check):  # noqa: F811
+    return _typed(_setter(_fset, fi, changed, onchange), check)
+
+
+# noinspection SpellCheckingInspection
+@dispatch(FunctionType, _InstanceFields, object, bool, _TypeCheck, namespace=_ACCESSORS_NS)  # type: ignore # noqa: F811
+def _setter(_fset, fi, changed, onchange, check):  # noqa: F811
+    name = fi.name
+    _, types, convert, validate = check
+
+    # the checks are inlined to not pay for a call per assignment
+    def _wrapper(self, value):
+        if convert is not None:
+            value = convert(value)
+
+        if types is not None and not isinstance(value, types):
+            raise _mistyped(check, value)
+
+        if validate is not None and not validate(value):
+            raise ValueError("invalid value of '%s': %r" % (name, value))
+
+        fields = self.__dict__
+        try:
+            old = fields[name]
+        except KeyError:
+            pass
+        else:
+            if changed is not None and not changed(old, value):
+                return None if onchange else _fset(self, value)
+
+        fields[name] = value
+
+        return _fset(self, value)
+
+    # the setter of the values converted beforehand (by the indexes)
+    _wrapper.__unconverted__ = (_wrapper if convert is None else
+                                _setter(_fset, fi, changed, onchange, check._replace(convert=None)))
+    return _wrapper
+
+
+# noinspection PySuperArguments
+class PropertyMeta(type):
+    # noinspection SpellCheckingInspection,PyCompatibility
+    """
+    This metaclass allows you to create auto-implemented properties (like in C#, where you can declare properties
+    without explicitly defining a getter and setter), for which you can use an ellipsis or empty functions to indicate
+    that the Python itself would create the special accessor.
+
+    Detailed working principle:
+
+    1. Ordinary auto-implemented properties:
+
+        .. code-block:: python
+
+           property1 = property(..., ...)
+           property1 = property(..., ..., ...)
+
+        In this case, the following are created:
+
+            - **storage** for recording and retrieving the value: the ``__dict__`` of the instance, where the value is
+              kept under the name of the property (the property takes precedence over the instance attribute, so it is
+              only visible in ``vars(instance)``). If the instances have no ``__dict__`` (``__slots__``), a dictionary
+              (in the closure of the generated accessors) keyed by ``(instance,)`` is used instead;
+            - **getter** that returns a value from the storage (if the value is not in the storage, then the
+              ``AttributeError`` exception is thrown);
+            - **setter** that writes a value to the storage if there is no value yet, or the value differs from that
+              written in the storage;
+            - **deleter** that deletes a value from the storage if it exists (if the value is not in the storage,
+              then the ``AttributeError`` exception is thrown).
+
+    2. Readonly auto-implemented properties:
+
+        .. code-block:: python
+
+           property1 = property(...)
+
+        In this case, the following are created:
+
+            - **storage** for recording and retrieving the value (see paragraph 1);
+            - **getter** that returns a value from the storage (if the value is not in the storage, then the
+              ``AttributeError`` exception is thrown);
+            - **setter** that can be called only once while the instance is being initialized (when called again or
+              outside the initializer, the ``AttributeError`` exception is thrown). For this, the metaclass wraps the
+              ``__init__`` of the class: the wrapper opens the initialization window of the instance, calls the
+              initializer and closes the window. The window is opened only for the thread running the initializer.
+              The instance is created by the usual ``type.__call__``, so a custom ``__new__`` is honored. An instance
+              whose readonly properties are all set is not initialized again, so a ``__new__`` may return a cached
+              (interned) instance without guarding the ``__init__``;
+            - **deleter** that deletes a value from the storage if it exists (if the value is not in the storage,
+              then the ``AttributeError`` exception is thrown).
+
+    3. Auto-implemented properties with custom getter:
+
+        .. code-block:: python
+
+           # getter is not empty function
+           property1 = property(getter, ...)
+
+        In this case, a custom getter remains. Otherwise, everything is the same as in the previous paragraphs.
+
+    4. Auto-implemented properties with custom setter, deleter:
+
+        .. code-block:: python
+
+           # setter, deleter is not empty functions
+           property1 = property(..., setter)
+           property1 = property(..., ..., deleter)
+           property1 = property(..., setter, deleter)
+
+        In this case, the following are created:
+
+            - **storage** for recording and retrieving the value (see paragraph 1);
+            - **getter** that returns a value from the storage (if the value is not in the storage, then the
+              ``AttributeError`` exception is thrown);
+            - **setter** that preserves the functionality of the initially defined user setter (that is, after the new
+              value is written to the storage, the initially defined user setter is called).
+            - **deleter** that preserves the functionality of the initially defined user deleter (that is, after
+              deleting the value from the storage, the initially defined custom deleter is called).
+
+    5. Change detection:
+
+        .. code-block:: python
+
+           __changepolicy__ = 'identity'
+           __changepolicy__ = {'property1': 'always', 'property2': comparator}
+           __notifyonchange__ = True
+
+        The generated setter writes a new value only if it differs from the stored one. How values are compared is
+        defined by the ``__changepolicy__`` class attribute, common to all properties of the class or given per
+        property name: ``'equality'`` (default, ``old != new``), ``'identity'`` (``old is not new``), ``'always'`` (the
+        value is written without comparison) or a custom ``comparator(old, new)`` that returns True if the value has
+        changed. For large containers or arrays ``'identity'`` or ``'always'`` avoid the cost (and, for arrays, the
+        ambiguity) of ``!=``.
+
+        By default, a custom setter (paragraph 4) is called on every assignment. If ``__notifyonchange__`` (common or
+        per property) is true, it is called only when the value is written for the first time or has changed.
+
+    6. Auto-implemented properties in shared memory:
+
+        .. code-block:: python
+
+           __sharedfields__ = {'property1': 'd'}
+           __sharedcapacity__ = 4096
+
+           property1 = property(..., ...)
+
+        Properties listed in the ``__sharedfields__`` class attribute (property name to `struct` format character)
+        keep their values in a `SharedFieldStore` instead of the ``__dict__`` of the instances, so other processes can
+        attach to it and read the values zero-copy. The store holds the values of at most ``__sharedcapacity__``
+        instances at the same time (1024 by default, `SharedFieldStoreFull` is raised beyond it, so set the capacity to
+        the maximum number of the live instances with values), its block is created by the first write, and it can be
+        obtained by ``cls.sharedstore(name)``. Otherwise, everything is the same as in the previous paragraphs.
+
+    7. Inherited and overridden auto-implemented properties:
+
+        The metaclass keeps a plan (kind, storage and generated accessors) of every auto-implemented property of the
+        class. Subclasses reuse the plans of the inherited properties without processing them again. If a subclass
+        overrides an auto-implemented property with the same declaration, the generated property of the base class is
+        reused; if only the accessors differ, the new accessors share the storage of the base class property.
+
+    8. Frozen classes:
+
+        .. code-block:: python
+
+           __frozen__ = True
+
+           property1 = property(..., ...)
+
+        All auto-implemented properties of a class with a true ``__frozen__`` attribute (and of its subclasses) are
+        readonly (paragraph 2) and cannot be deleted, also the inherited ones. Unless the class defines them, the
+        ``__eq__``, ``__hash__`` and ``__repr__`` methods are generated from the values of the properties in the order
+        of their declaration. The hash is computed on the first call after the initialization and cached in the
+        instance. The instances must have ``__dict__``, and custom setters and deleters are not allowed.
+
+    9. Change journal:
+
+        .. code-block:: python
+
+           __changejournal__ = 1024
+           __journalcaller__ = True
+           __journalrepr__ = True
+
+        The writes and deletes of the auto-implemented properties of a class with the ``__changejournal__`` class
+        attribute (the number of the retained changes) are recorded in a `ChangeJournal` returned by
+        ``cls.changejournal()``: the instance, the property, the old and the new stored value (after the conversion),
+        the time and, if ``__journalcaller__`` is true, the code of the caller. Writes skipped by the change policy
+        (that leave the same object stored) are not recorded. If ``__journalrepr__`` is true, the ``repr`` of the
+        values is recorded instead of the values. Subclasses record their changes in the journal of the base class
+        unless they declare their own one. Writes without a journal have no overhead.
+
+    10. Computed properties:
+
+        .. code-block:: python
+
+           __computed__ = {'full_name': ('first_name', 'last_name')}
+
+           @property
+           def full_name(self):
+               return '%s %s' % (self.first_name, self.last_name)
+
+        The getter of a property listed in the ``__computed__`` class attribute (property name to the names of its
+        dependencies) is called on the first read, and its result is kept in the storage of the property (see
+        paragraph 1) and returned by the following reads. The kept value is discarded when a dependency (an
+        auto-implemented property or another computed property) is set or deleted through its generated accessors, or
+        when the computed property itself is deleted. Computed properties have no setter and are not the values of
+        frozen classes.
+
+    11. Default values:
+
+        .. code-block:: python
+
+           __fielddefaults__ = {'nickname': None}
+           __fieldfactories__ = {'tags': list}
+
+           nickname = property(..., ...)
+           tags = property(..., ...)
+
+        The generated getter of an auto-implemented property listed in the ``__fielddefaults__`` class attribute
+        returns the default value instead of throwing the ``AttributeError`` exception while the value is not set, so
+        reading sparse fields costs as much as reading set ones. The getter of a property listed in
+        ``__fieldfactories__`` calls the factory on the first read of the unset value and keeps the result in the
+        storage, so every instance gets its own value. The defaults apply to the properties declared in the class
+        (an inherited property gets a new default when it is overridden).
+
+    12. Typed auto-implemented properties:
+
+        .. code-block:: python
+
+           __checktypes__ = True
+           __fieldconverters__ = {'price': float}
+           __fieldvalidators__ = {'price': lambda value: value >= 0}
+
+           price: float = property(..., ...)
+           tags: Optional[List[str]] = property(..., ...)
+
+        If the ``__checktypes__`` class attribute is true, the generated setter of an annotated auto-implemented
+        property checks the type of the assigned value and throws the ``TypeError`` exception if it does not match
+        (the annotations are not enforced by default). Classes, tuples of classes, ``Optional`` and ``Union``
+        annotations are checked by ``isinstance`` (``float`` accepts ``int``, ``complex`` accepts ``int`` and
+        ``float``), generic annotations (like ``List[str]``) are checked by their origin (``list``), ``Any`` and type
+        variables are not checked. String annotations and forward references are resolved in the module of the class
+        (the class itself can be referenced) when the class is created, and an annotation that cannot be resolved
+        there (like a type local to a function) throws the ``TypeError`` exception. The converter of the property (in
+        the ``__fieldconverters__`` class attribute) is applied to the value before the check, and the validator (in
+        ``__fieldvalidators__``) is called after it and throws the ``ValueError`` exception if it returns false. The
+        checks are built into the generated setters once per property (also of the readonly properties and of the
+        properties with custom setters stored in the ``__dict__``), so assignments pay neither for an extra call nor
+        for a generic dispatch.
+
+    13. Indexes of values:
+
+        .. code-block:: python
+
+           __indexes__ = {'email': 'unique', 'city': 'hash'}
+
+           email = property(..., ...)
+           city = property(..., ...)
+
+        The generated setters and deleters of the auto-implemented properties listed in the ``__indexes__`` class
+        attribute keep the instances in hash indexes by the values of the properties, so ``cls.lookup(name, value)``
+        finds the instances without scanning them: it returns the instance (or None) for a ``'unique'`` index and the
+        list of the instances for a ``'hash'`` index. Assigning the value of a unique property that another instance
+        already has throws the ``ValueError`` exception. The values must be hashable, and the instances must support
+        weak references: the indexes hold them by weak references and forget them when they are collected. Subclasses
+        keep their instances in the indexes of the base class.
+
+    14. Pools of instances:
+
+        .. code-block:: python
+
+           __poolsize__ = 1024
+
+        ``cls.release(instance)`` clears the auto-implemented properties of the released instance of a class with the
+        ``__poolsize__`` class attribute by their deleters (so the indexes, journals and computed values are updated),
+        clears its ``__dict__`` and keeps it in a pool of at most ``__poolsize__`` instances. The constructor of the
+        class initializes a pooled instance instead of allocating a new one. A pooled instance that is still referenced
+        (or weakly referenced) when the constructor takes it is dropped instead of being reused, so keeping a reference
+        to a released instance does not let it change under the feet. Every subclass has its own pool. The pool trades
+        throughput for memory churn: the release and the reusing constructor run in Python, so a construction and a
+        release of a pooled instance cost more than a plain allocation freed by reference counting, but the pooled
+        instances are not allocated anew and their reference cycles are broken by the release, so a high-churn class
+        of cyclic instances does not trigger the collections (and the pauses) of the garbage collector.
+
+    15. Copies of instances:
+
+        ``copy.copy``, ``copy.deepcopy`` and ``instance.clone(**overrides)`` (unless the class defines its own
+        ``__copy__``, ``__deepcopy__`` or ``clone``) copy the values of all auto-implemented properties in one pass,
+        also the values kept outside of the ``__dict__`` (in shared memory or for the instances without ``__dict__``).
+        The values of the journaled properties are written by their setters, so the copying is recorded. The copies
+        (as well as the unpickled instances) are not added to the indexes until their indexed properties are assigned,
+        so copying an instance with a unique value does not fail, and ``lookup`` keeps finding the original. ``clone``
+        assigns the given values to the copy (or the new attributes), readonly properties included, as the initializer
+        of the copy would do, so the copy is indexed by the overridden values.
+
+    16. Records of values:
+
+        ``cls.autoproperties()`` returns the names of the auto-implemented properties whose values are stored (not
+        computed). ``instance.todict()`` and ``instance.totuple()`` read all their values in one pass (the unset
+        properties are omitted from the dictionary and are None in the tuple), and ``cls.fromdict(data)`` creates the
+        instance from such a dictionary without calling the initializer, assigning the readonly properties as the
+        initializer would (unless the class defines its own ``todict``, ``totuple`` or ``fromdict``).
+        ``cls.dumpjsonlines(instances, stream)`` writes the dictionaries of the instances to the stream in JSON lines.
+
+    17. Thread safety:
+
+        The values of the instances with ``__dict__`` are kept in the instances themselves, and the initialization
+        windows of readonly properties are kept per thread, so threads working with different instances share no
+        mutable state and do not contend (this also holds for free-threaded builds of Python). Accesses to the same
+        instance from several threads are as safe as accesses to its ``__dict__``. `SharedFieldStore` allocates and
+        releases slots under a lock.
+
+    18. Properties that will not be processed by the PropertyMeta metaclass:
+
+        .. code-block:: python
+
+           # getter, setter, deleter is not empty functions (and the property is not computed)
+           property1 = property(getter)
+           property1 = property(getter, setter)
+           property1 = property(getter, setter, deleter)
+           property1 = property(getter, setter, ...)
+
+    Examples:
+        1. Import the PropertyMeta metaclass and assign it as a metaclass for the desired class:
+
+        .. code-block:: python
+
+           from pymagic9 import PropertyMeta
+
+
+           class Person(metaclass=PropertyMeta):
+               pass
+
+        2. Create properties in this class with empty accessors (using empty function or ellipsis) to indicate that
+        this property will be auto-implemented:
+
+        .. code-block:: python
+
+           from pymagic9 import PropertyMeta
+
+
+           class Person(metaclass=PropertyMeta):
+               \"""class Person\"""
+               def __init__(self, name):
+                   self.name = name
+
+               name = property(fget=...,)           # readonly property
+               age = property(fget=..., fset=...,)  # ordinary property
+
+        3. Now for an `ordinary` property we can get and put values into it at any time. But for a `readonly` property,
+        you can put a value into it only once, at the time of creating an instance of the class:
+
+        .. code-block:: python
+
+           from pymagic9 import PropertyMeta
+
+
+           class Person(metaclass=PropertyMeta):
+               \"""class Person\"""
+               def __init__(self, name):
+                   self.name = name
+                   # self.name = "Sam"  # raise AttributeError: 'property' is readonly (reassigning value)
+
+               name = property(fget=...,)           # readonly property
+               age = property(fget=..., fset=...,)  # ordinary property
+
+
+           if __name__ == "__main__":
+               person = Person("Tom")
+               person.age = 24
+               print(person.name + ',', person.age)  # Tom, 24
+               # person.name = "Sam"  # raise AttributeError: 'property' is readonly
+
+        4. To delete a property value, use the `del` operator:
+
+        .. code-block:: python
+
+           from pymagic9 import PropertyMeta
+
+
+           class Person(metaclass=PropertyMeta):
+               \"""class Person\"""
+               def __init__(self, name):
+                   self.name = name
+
+               name = property(fget=...,)           # readonly property
+               age = property(fget=..., fset=...,)  # ordinary property
+
+
+           if __name__ == "__main__":
+               person = Person("Tom")
+               person.age = 24
+               print(person.name + ',', person.age)  # Tom, 24
+               del person.name
+               # print(person.name)  # raise AttributeError: auto-implemented field does not exist or has already been
+                                     # erased
+
+        5. If the `getter` is specified by an empty accessor (using empty function or ellipsis), and the `setter` is
+        not an empty function, then `setter` will also be called. This can be used as a callback when assigning a value
+        to a property:
+
+        .. code-block:: python
+
+           from pymagic9 import nameof, PropertyMeta
+
+
+           def NotifyPropertyChanged(propertyname, value):
+               \"""Notify property changed\"""
+               # Do something
+               print(propertyname + ',', value)
+
+
+           class Person(metaclass=PropertyMeta):
+               \"""class Person\"""
+               def __init__(self, name):
+                   self.name = name
+
+               name = property(fget=...,)           # readonly property
+               age = property(fget=..., fset=...,)  # ordinary property
+
+               @property
+               def height(self):
+                   \"""Person height in cm\"""
+                   return
+
+               @height.setter
+               def height(self, value):
+                   NotifyPropertyChanged(nameof(self.height), value)
+
+
+           if __name__ == "__main__":
+               person = Person("Tom")
+               person.age = 24
+               print(person.name + ',', person.age)  # Tom, 24
+               person.height = 180  # height, 180
+
+        6. Similar code for `Python 2.7` looks like this:
+
+        .. code-block:: python
+
+           from pymagic9 import nameof, PropertyMeta
+
+           __metaclass__ = PropertyMeta
+
+
+           def NotifyPropertyChanged(propertyname, value):
+               \"""Notify property changed\"""
+               # Do something
+               print(propertyname + ', ' + str(value))
+
+
+           class Person:
+               \"""class Person\"""
+               def __init__(self, name):
+                   self.name = name
+
+               name = property(fget=Ellipsis,)                # readonly property
+               age = property(fget=Ellipsis, fset=Ellipsis,)  # ordinary property
+
+               @property
+               def height(self):
+                   \"""Person height in cm\"""
+                   return
+
+               @height.setter
+               def height(self, value):
+                   NotifyPropertyChanged(nameof(self.height), value)
+
+
+           if __name__ == "__main__":
+               person = Person("Tom")
+               person.age = 24
+               print(person.name + ', ' + str(person.age))  # Tom, 24
+               person.height = 180  # height, 180
+
+    """
+
+    # noinspection SpellCheckingInspection,PySuperArguments
+    def __init__(cls, name, bases, attrs):
+        super(PropertyMeta, cls).__init__(name, bases, attrs)
+        # plans of the inherited properties are reused as is
+        plans = _inheritedplans(cls)
+        shared = getattr(cls, "__sharedfields__", None) or {}  # type: Dict[str, str]
+        capacity = getattr(cls, "__sharedcapacity__", _SHARED_CAPACITY)  # type: int
+        policy = getattr(cls, "__changepolicy__", "equality")
+        onchange = getattr(cls, "__notifyonchange__", False)
+        computed = getattr(cls, "__computed__", None) or {}  # type: Dict[str, Tuple[str, ...]]
+        defaults = getattr(cls, "__fielddefaults__", None) or {}  # type: Dict[str, Any]
+        factories = getattr(cls, "__fieldfactories__", None) or {}  # type: Dict[str, Callable[[], Any]]
+        annotations = attrs.get("__annotations__", {}) if getattr(cls, "__checktypes__", False) else {}
+        converters = getattr(cls, "__fieldconverters__", None) or {}  # type: Dict[str, Callable[[Any], Any]]
+        validators = getattr(cls, "__fieldvalidators__", None) or {}  # type: Dict[str, Callable[[Any], bool]]
+        for key, obj in attrs.items():
+            base = plans.pop(key, None)
+            if not isinstance(obj, property):
+                continue
+
+            if key in computed:
+                plan = cls.__computedplan(key, obj, base, tuple(computed[key]))
+            else:
+                types = _annotationtypes(key, annotations[key], cls) if key in annotations else None
+                check = _TypeCheck(key, types, converters.get(key), validators.get(key))
+                plan = cls.__plan(key, obj, base, shared.get(key), capacity, policy, onchange,
+                                  defaults.get(key, _MISSING), factories.get(key), check if any(check[1:]) else None)
+
+            if plan is None:
+                if key in shared:
+                    raise TypeError("'%s' is not an auto-implemented property and cannot be shared" % key)
+
+                if key in defaults or key in factories:
+                    raise TypeError("'%s' is not an auto-implemented property and cannot have a default" % key)
+
+                continue
+
+            setattr(cls, key, plan.prop)
+            plans[key] = plan
+
+        if getattr(cls, "__frozen__", False):
+            cls.__freeze(plans, attrs)
+
+        if computed:
+            cls.__invalidate(plans)
+
+        if attrs.get("__indexes__"):
+            cls.__addindexes(plans, attrs["__indexes__"])
+
+        indexes = getattr(cls, "_PropertyMeta__indexes", None)
+        if indexes:
+            cls.__index(plans, indexes)
+
+        if attrs.get("__changejournal__"):
+            cls.__changejournal = ChangeJournal(attrs["__changejournal__"], getattr(cls, "__journalcaller__", False),
+                                                getattr(cls, "__journalrepr__", False))
+
+        journal = getattr(cls, "_PropertyMeta__changejournal", None)
+        if journal is not None:
+            cls.__journal(plans, journal)
+
+        if getattr(cls, "__poolsize__", 0):
+            cls.__pool = _InstancePool(getattr(cls, "__poolsize__"), plans)
+            new = cls.__new__
+            cls.__new__ = staticmethod(_pooled(getattr(new, "__unpooled__", new), cls.__pool))
+
+        cls.__plans = plans
+        cls.__copying = _copying(cls, plans)
+        for name, method in (("__copy__", _copy), ("__deepcopy__", _deepcopy), ("clone", _clone)):
+            if _defined(cls, name) is None:
+                setattr(cls, name, method)
+
+        cls.__autoproperties, todict, totuple, fromdict = _records(plans)
+        for name, method in (("todict", todict), ("totuple", totuple), ("fromdict", fromdict)):
+            defined = _defined(cls, name)
+            if defined is None or hasattr(getattr(defined, "__func__", defined), "__records__"):
+                setattr(cls, name, method)
+
+        init, readonly = cls.__init__, [_peeker(p.fields) for p in plans.values() if p.kind == "readonly"]
+        if not getattr(init, "__initializer__", False) and readonly:
+            cls.__init__ = _initializer(init, readonly)
+
+        _CLASSES.add(cls)
+        if "timing" in _INSTRUMENTATION:
+            instrument(cls, _INSTRUMENTATION["timing"])
+
+    # noinspection SpellCheckingInspection
+    def __plan(cls, key, obj, base, storage, capacity, policy, onchange, default, factory, check):
+        """
+        Makes the plan of the auto-implemented property (None if the property is not auto-implemented). The plan of the
+        overridden property of the base class is reused if the declarations are the same, and its storage is reused if
+        the storage formats are the same.
+
+        """
+        fget = obj.fget  # type: Union[Optional[Callable[[Any], Any]], ellipsis]  # noqa: F821
+        fset = obj.fset  # type: Union[Optional[Callable[[Any, Any], None]], ellipsis]  # noqa: F821
+        fdel = obj.fdel  # type: Union[Optional[Callable[[Any], None]], ellipsis]  # noqa: F821
+        is_accessor_gen = _is_autoimplemented_accessor(fget)
+        kind = "deleter"  # only the deleter is auto-implemented
+        if is_accessor_gen:
+            fget, kind = _AUTO, "readonly" if fset is None else "custom"
+
+        if _is_autoimplemented_accessor(fset):
+            fset, is_accessor_gen, kind = _AUTO, True, "ordinary"
+
+        if fdel is None and is_accessor_gen:
+            fdel = _AUTO
+
+        if _is_autoimplemented_accessor(fdel):
+            fdel, is_accessor_gen = _AUTO, True
+
+        if not is_accessor_gen:
+            return None
+
+        changed = _get_change_policy(policy, key) if kind in ("ordinary", "custom") else None
+        if (default is not _MISSING or factory is not None) and fget is not _AUTO:
+            raise TypeError("'%s' has a custom getter and cannot have a default" % key)
+
+        signature = (fget, fset, fdel, changed, bool(_get_option(onchange, key)), storage, default, factory, check)
+        if base is not None and base.signature == signature:
+            return base
+
+        if base is not None and base.storage == storage:
+            fields = base.fields
+        elif storage is not None:
+            fields = SharedFieldStore(storage, capacity)
+        elif cls.__dictoffset__:
+            fields = _InstanceFields(key)
+        else:  # the instances have no __dict__
+            fields = {}
+
+        if factory is not None:
+            fget = _getter(_factory(factory), fields)
+        elif default is not _MISSING:
+            fget = _getter(fields, default)
+        elif fget is _AUTO:
+            fget = _getter(fields)
+
+        if kind == "ordinary":
+            fset = _setter(fields, changed) if check is None else _setter(fields, changed, check)
+        elif kind == "readonly":  # for readonly properties (initialize in constructor of class)
+            fset = _setter(fields, _INITIALIZING) if check is None else _setter(fields, _INITIALIZING, check)
+        elif kind == "custom":
+            fset = (_setter(fset, fields, changed, signature[4]) if check is None else
+                    _setter(fset, fields, changed, signature[4], check))
+
+        if fdel is _AUTO:
+            fdel = _deleter(fields)
+        elif fdel is not None:
+            fdel = _deleter(fdel, fields)
+
+        prop = property(fget, fset, fdel, obj.doc if hasattr(obj, 'doc') else None)  # type: ignore
+        return _PropertyPlan(kind, storage, fields, signature, prop)
+
+    # noinspection SpellCheckingInspection
+    def __computedplan(cls, key, obj, base, dependencies):
+        """
+        Makes the plan of the computed property: the getter computes the value on the first read and keeps it in the
+        storage until a dependency is changed, the deleter discards the kept value.
+
+        """
+        if obj.fget is None or _is_autoimplemented_accessor(obj.fget) or obj.fset is not None:
+            raise TypeError("computed property '%s' must have a getter and no setter" % key)
+
+        signature = ("computed", obj.fget, dependencies)
+        if base is not None and base.signature == signature:
+            return base
+
+        if base is not None and base.kind == "computed":
+            fields = base.fields
+        elif cls.__dictoffset__:
+            fields = _InstanceFields(key)
+        else:  # the instances have no __dict__
+            fields = {}
+
+        prop = property(_getter(obj.fget, fields), None, _deleter(_discard, fields), obj.__doc__)
+        return _PropertyPlan("computed", None, fields, signature, prop)
+
+    # noinspection SpellCheckingInspection
+    def __invalidate(cls, plans):
+        """
+        Swaps in the setters and the deleters of the dependencies of the computed properties that discard the computed
+        values of the dependent properties (directly or through other computed properties).
+
+        """
+        dependents = {}  # type: Dict[str, List[str]]
+        for key, plan in plans.items():
+            if plan.kind == "computed":
+                for dependency in plan.signature[2]:
+                    if dependency not in plans:
+                        raise TypeError("computed property '%s' depends on '%s' which is not an auto-implemented "
+                                        "property" % (key, dependency))
+
+                    dependents.setdefault(dependency, []).append(key)
+
+        for key, plan in list(plans.items()):
+            # all properties whose values are computed from the value of this one
+            affected, stack = [], list(dependents.get(key, ()))
+            while stack:
+                dependent = stack.pop()
+                if dependent not in affected:
+                    affected.append(dependent)
+                    stack.extend(dependents.get(dependent, ()))
+
+            prop = plan.prop
+            storages = tuple(plans[dependent].fields for dependent in sorted(affected))
+            if (getattr(prop.fset or prop.fdel, "__dependents__", None) or ()) == storages:
+                continue
+
+            fset, fdel = (getattr(f, "__invalidated__", f) for f in (prop.fset, prop.fdel))
+            prop = property(prop.fget, _invalidating(fset, storages), _invalidating(fdel, storages, True), prop.__doc__)
+            plans[key] = plan._replace(prop=prop)
+            setattr(cls, key, prop)
+
+    # noinspection SpellCheckingInspection
+    def __freeze(cls, plans, attrs):
+        """
+        Makes all auto-implemented properties of the frozen class readonly without deleters and generates the
+        ``__eq__``, ``__hash__`` and ``__repr__`` methods (unless they are defined in the class) by the values of the
+        properties.
+
+        """
+        if not cls.__dictoffset__:
+            raise TypeError("the instances of the frozen class '%s' must have __dict__" % cls.__name__)
+
+        for key, plan in list(plans.items()):
+            if plan.signature[0] in ("frozen", "computed"):
+                continue
+
+            fget, fset, fdel = plan.signature[:3]
+            if fset not in (_AUTO, None) or fdel not in (_AUTO, None):
+                raise TypeError("'%s' cannot have a custom setter or deleter in a frozen class" % key)
+
+            check = plan.signature[8]
+            fset = _setter(plan.fields, _INITIALIZING) if check is None else _setter(plan.fields, _INITIALIZING, check)
+
+            prop = property(plan.prop.fget, fset, None, plan.prop.__doc__)
+            plans[key] = _PropertyPlan("readonly", plan.storage, plan.fields, ("frozen",) + plan.signature, prop)
+            setattr(cls, key, prop)
+
+        fields = dict((key, plan) for key, plan in plans.items() if plan.kind != "computed")
+        values = _values(fields)
+        if _generatable(cls, "__eq__", attrs):
+            cls.__eq__ = _eq(values)
+            if sys.version_info < (3,):  # pragma: no cover
+                cls.__ne__ = _ne(values)
+
+        if _generatable(cls, "__hash__", attrs):
+            cls.__hash__ = _hash(fields, values)
+
+        if _generatable(cls, "__repr__", attrs):
+            cls.__repr__ = _repr(tuple(fields), values)
+
+        if getattr(cls, "__getstate__", None) is getattr(object, "__getstate__", None):
+            cls.__getstate__ = _getstate
+
+    # noinspection SpellCheckingInspection
+    def __addindexes(cls, plans, declared):
+        """
+        Creates the indexes declared by the ``__indexes__`` class attribute (the inherited indexes are kept).
+
+        """
+        if not cls.__weakrefoffset__:
+            raise TypeError("the instances of the class '%s' with indexed properties must support weak references" %
+                            cls.__name__)
+
+        indexes = dict(getattr(cls, "_PropertyMeta__indexes", None) or {})
+        for key, kind in declared.items():
+            plan = plans.get(key)
+            if plan is None or plan.kind == "computed":
+                raise TypeError("'%s' is not an auto-implemented property and cannot be indexed" % key)
+
+            if kind not in ("hash", "unique"):
+                raise ValueError("unknown index %r of '%s'" % (kind, key))
+
+            indexes[key] = _ValueIndex(key, kind == "unique")
+
+        cls.__indexes = indexes
+
+    # noinspection SpellCheckingInspection
+    def __index(cls, plans, indexes):
+        """
+        Swaps in the setters and the deleters of the indexed auto-implemented properties that keep the instances in the
+        indexes.
+
+        """
+        for key, index in indexes.items():
+            plan = plans.get(key)
+            if plan is None or plan.kind == "computed":  # the indexed property is overridden by another property
+                raise TypeError("'%s' is not an auto-implemented property and cannot be indexed" % key)
+
+            prop = plan.prop
+            if getattr(prop.fset or prop.fdel, "__index__", None) is index:
+                continue
+
+            fset, fdel = (getattr(f, "__unindexed__", f) for f in (prop.fset, prop.fdel))
+            check = plan.signature[-1]  # the last item of the signatures of auto-implemented properties
+            convert = check.convert if isinstance(check, _TypeCheck) else None
+            if convert is not None and fset is not None:
+                fset = _unconverted(fset)  # the values are converted once by the index
+            prop = property(prop.fget, _indexed(fset, plan.fields, index, convert=convert),
+                            _indexed(fdel, plan.fields, index, True), prop.__doc__)
+            plans[key] = plan._replace(prop=prop)
+            setattr(cls, key, prop)
+
+    def release(cls, instance):
+        """
+        Clears the released instance of the class with the ``__poolsize__`` class attribute and puts it into the pool
+        of the instances reused by the constructor.
+
+        Args:
+            instance (Any): The instance that is no longer used.
+
+        Returns:
+            bool: Whether the instance is put into the pool (False if the pool is full).
+
+        Raises:
+            TypeError: If the class has no pool or the instance is not an instance of the class (but of a subclass).
+            ValueError: If the instance is already released.
+        """
+        pool = cls.__dict__.get("_PropertyMeta__pool")
+        if pool is None:
+            raise TypeError("'%s' has no pool of instances" % cls.__name__)
+
+        if type(instance) is not cls:
+            raise TypeError("the instance of '%s' cannot be released to the pool of '%s'" % (
+                type(instance).__name__, cls.__name__))
+
+        instances, key = pool.instances, id(instance)
+        if key in instances:
+            raise ValueError("the instance is already released")
+
+        for peek, fdel in pool.clearers:
+            if peek(instance) is not _MISSING:
+                fdel(instance)
+
+        fields = getattr(instance, "__dict__", None)
+        if fields:
+            fields.clear()
+
+        if len(instances) >= pool.capacity:
+            return False
+
+        instances[key] = instance
+        return True
+
+    def lookup(cls, name, value):
+        """
+        Looks up the instances by the value of the indexed auto-implemented property declared in ``__indexes__``.
+
+        Args:
+            name (str): The name of the property.
+            value (Any): The value of the property.
+
+        Returns:
+            The instance with the value (or None) if the index is unique, otherwise the list of the instances with the
+            value.
+
+        Raises:
+            AttributeError: If the property is not indexed.
+        """
+        index = (getattr(cls, "_PropertyMeta__indexes", None) or {}).get(name)
+        if index is None:
+            raise AttributeError("'%s' is not an indexed auto-implemented property" % name)
+
+        return index.lookup(value)
+
+    # noinspection SpellCheckingInspection
+    def __journal(cls, plans, journal):
+        """
+        Swaps in the setters and the deleters of the auto-implemented properties that record the changes in the journal
+        (the inherited properties recorded in another journal are recorded in this one instead).
+
+        """
+        for key, plan in list(plans.items()):
+            prop = plan.prop
+            fset, fdel = prop.fset, prop.fdel
+            if getattr(fset or fdel, "__journal__", None) is journal:
+                continue
+
+            fset, fdel = getattr(fset, "__accessor__", fset), getattr(fdel, "__accessor__", fdel)
+            fields = plan.fields
+            prop = property(prop.fget, _journaled(fset, fields, key, journal),
+                            _journaled(fdel, fields, key, journal, True), prop.__doc__)
+            plans[key] = plan._replace(prop=prop)
+            setattr(cls, key, prop)
+
+    def autoproperties(cls):
+        """
+        Returns the names of the auto-implemented properties of the class whose values are stored (not computed), in
+        the order of ``todict`` and ``totuple``.
+
+        Returns:
+            Tuple[str, ...]: The names of the properties, the inherited ones first.
+        """
+        return cls.__autoproperties
+
+    def dumpjsonlines(cls, instances, stream, **kwargs):
+        """
+        Writes the values of the auto-implemented properties of the instances to the stream in JSON lines: one JSON
+        object (as returned by ``todict``) per line.
+
+        Args:
+            instances (Iterable[Any]): The instances of the class (or of its subclasses).
+            stream (TextIO): The text stream.
+            **kwargs: The keyword arguments of `json.JSONEncoder` (like ``default`` for the values that are not
+             serializable).
+
+        Returns:
+            int: The number of the written instances.
+
+        Examples:
+            >>> stream = io.StringIO()  # doctest:+SKIP
+            >>> Point.dumpjsonlines([Point(1, 2), Point(3, 4)], stream)  # doctest:+SKIP
+            2
+            >>> stream.getvalue()  # doctest:+SKIP
+            '{"x": 1, "y": 2}\\n{"x": 3, "y": 4}\\n'
+        """
+        import json
+
+        encode = json.JSONEncoder(**kwargs).encode
+        lines = []
+        count = 0
+        for instance in instances:
+            lines.append(encode(instance.todict()))
+            if len(lines) == 1024:  # the lines are written in chunks
+                stream.write("\n".join(lines) + "\n")
+                count += len(lines)
+                del lines[:]
+
+        if lines:
+            stream.write("\n".join(lines) + "\n")
+            count += len(lines)
+
+        return count
+
+    def changejournal(cls):
+        """
+        Returns the `ChangeJournal` of the class declared by the ``__changejournal__`` class attribute (or inherited).
+
+        Returns:
+            ChangeJournal: The journal of the changes of the auto-implemented properties, or None.
+        """
+        return getattr(cls, "_PropertyMeta__changejournal", None)
+
+    def sharedstore(cls, name):
+        """
+        Returns the `SharedFieldStore` of the auto-implemented property declared in ``__sharedfields__``.
+
+        Args:
+            name (str): The name of the property.
+
+        Returns:
+            SharedFieldStore: The store of the property values.
+
+        Raises:
+            AttributeError: If the property is not stored in shared memory.
+        """
+        plan = getattr(cls, "_PropertyMeta__plans", {}).get(name)
+        if plan is None or plan.storage is None:
+            raise AttributeError("'%s' is not a shared auto-implemented property" % name)
+
+        return plan.fields
+
+    def staleinstances(cls):
+        """
+        Returns the instances of the class (or of its subclasses) with values in the stores of its auto-implemented
+        properties that are referenced only by the stores: the instances without ``__dict__`` and the instances with
+        shared properties stay alive until their values are deleted.
+
+        Returns:
+            List[Any]: The stale instances. Deleting their properties (or the values from the stores) frees them.
+        """
+        holders = _holders()
+        instances = {}  # type: Dict[int, Any]
+        for plan in cls.__plans.values():
+            fields = plan.fields
+            if isinstance(fields, _FIELDS_TYPES):
+                keys = fields._heldkeys() if isinstance(fields, SharedFieldStore) else fields
+                for instance in _stale(keys, holders):
+                    instances.setdefault(id(instance), instance)
+
+        return list(instances.values())
+
+
+# noinspection SpellCheckingInspection
+def instrument(cls=None, timing=False):
+    """
+    Swaps in counting (and, optionally, timing) accessors for the auto-implemented properties.
+
+    Args:
+        cls (PropertyMeta, optional): The class to instrument. If omitted, all existing classes created by the
+         `PropertyMeta` metaclass are instrumented, as well as the classes created later (until `uninstrument` is called
+         without arguments).
+        timing (bool, optional): Whether to measure the time spent in the accessors. Default is False.
+
+    Raises:
+        TypeError: If the class is not created by the `PropertyMeta` metaclass.
+
+    The instrumented accessors count reads, writes and deletes of every auto-implemented property of the class
+    (including inherited ones). The counters are not synchronized, so concurrent accesses from several threads may be
+    undercounted. Instrumenting an already instrumented class resets its statistics. The uninstrumented
+    accessors are restored by `uninstrument`, so there is no overhead when the instrumentation is disabled.
+
+    Examples:
+        >>> class Person(metaclass=PropertyMeta):  # doctest:+SKIP
+        ...     age = property(..., ...)
+        ...
+        >>> instrument(Person)  # doctest:+SKIP
+        >>> person = Person()  # doctest:+SKIP
+        >>> person.age = 24  # doctest:+SKIP
+        >>> accessstats(Person)[_qualname(Person)]["properties"]["age"]["writes"]  # doctest:+SKIP
+        1
+        >>> uninstrument(Person)  # doctest:+SKIP
+    """
+    if cls is None:
+        _INSTRUMENTATION["timing"] = timing
+        for cls in list(_CLASSES):
+            instrument(cls, timing)
+
+        return
+
+    if not isinstance(cls, PropertyMeta):
+        raise TypeError("'cls' must be created by the PropertyMeta metaclass")
+
+    uninstrument(cls)
+    plans = getattr(cls, "_PropertyMeta__plans")  # type: Dict[str, _PropertyPlan]
+    stats = {}  # type: Dict[str, List[Any]]
+    originals = {}  # type: Dict[str, Optional[property]]
+    for key, plan in plans.items():
+        counters = stats[key] = [0, 0, 0, 0.0, 0.0, 0.0]  # reads, writes, deletes and their seconds
+        prop = plan.prop
+        originals[key] = cls.__dict__.get(key)
+        setattr(cls, key, property(
+            _counter(prop.fget, counters, 0, timing),
+            _counter(prop.fset, counters, 1, timing),
+            _counter(prop.fdel, counters, 2, timing),
+            prop.__doc__
+        ))
+
+    _INSTRUMENTED[cls] = (stats, originals, timing, _timer())
+
+
+# noinspection SpellCheckingInspection
+def uninstrument(cls=None):
+    """
+    Restores the uninstrumented accessors of the auto-implemented properties and discards the statistics.
+
+    Args:
+        cls (PropertyMeta, optional): The class to uninstrument. If omitted, all classes are uninstrumented and the
+         global instrumentation enabled by `instrument` is disabled.
+    """
+    if cls is None:
+        _INSTRUMENTATION.pop("timing", None)
+        for cls in list(_INSTRUMENTED.keys()):
+            uninstrument(cls)
+
+        return
+
+    try:
+        _, originals, _, _ = _INSTRUMENTED.pop(cls)
+    except KeyError:
+        return
+
+    for key, prop in originals.items():
+        if prop is None:
+            delattr(cls, key)
+        else:
+            setattr(cls, key, prop)
+
+
+# noinspection SpellCheckingInspection
+def accessstats(cls=None, fmt="dict"):
+    """
+    Returns the access statistics of the instrumented auto-implemented properties.
+
+    Args:
+        cls (PropertyMeta, optional): The class whose statistics are returned. If omitted, the statistics of all
+         instrumented classes are returned.
+        fmt (str, optional): ``'dict'`` (default) or ``'prometheus'`` (the text exposition format).
+
+    Returns:
+        dict or str: The statistics by the qualified names of the classes. For every class, ``elapsed`` is the number of
+        seconds since the class was instrumented and ``properties`` contains the numbers of ``reads``, ``writes`` and
+        ``deletes`` of every property (and ``read_seconds``, ``write_seconds``, ``delete_seconds`` if the timing is
+        enabled).
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if fmt not in ("dict", "prometheus"):
+        raise ValueError("unknown format %r" % (fmt,))
+
+    now = _timer()
+    result = {}  # type: Dict[str, Dict[str, Any]]
+    for _cls, (stats, _, timing, started) in list(_INSTRUMENTED.items()):
+        if cls is not None and _cls is not cls:
+            continue
+
+        properties = {}  # type: Dict[str, Dict[str, Any]]
+        for key, counters in stats.items():
+            entry = properties[key] = dict(zip(_ACCESSES, counters[:3]))
+            if timing:
+                entry.update(zip(_ACCESS_SECONDS, counters[3:]))
+
+        result[_qualname(_cls)] = {"elapsed": now - started, "properties": properties}
+
+    if fmt == "dict":
+        return result
+
+    lines = [
+        "# HELP pymagic9_property_accesses_total Accesses of auto-implemented properties.",
+        "# TYPE pymagic9_property_accesses_total counter",
+    ]
+    seconds = [
+        "# HELP pymagic9_property_access_seconds_total Time spent in accessors of auto-implemented properties.",
+        "# TYPE pymagic9_property_access_seconds_total counter",
+    ]
+    elapsed = [
+        "# HELP pymagic9_instrumented_seconds Time since the class was instrumented.",
+        "# TYPE pymagic9_instrumented_seconds gauge",
+    ]
+    for name, entry in sorted(result.items()):
+        elapsed.append('pymagic9_instrumented_seconds{class="%s"} %r' % (name, entry["elapsed"]))
+        for key, counters in sorted(entry["properties"].items()):
+            for access, counter, second in zip(("read", "write", "delete"), _ACCESSES, _ACCESS_SECONDS):
+                labels = 'class="%s",property="%s",access="%s"' % (name, key, access)
+                lines.append("pymagic9_property_accesses_total{%s} %d" % (labels, counters[counter]))
+                if second in counters:
+                    seconds.append("pymagic9_property_access_seconds_total{%s} %r" % (labels, counters[second]))
+
+    if len(seconds) == 2:
+        del seconds[:]
+
+    return "\n".join(lines + seconds + elapsed) + "\n"
+
+
+# noinspection SpellCheckingInspection
+def memoryusage(cls=None, fmt="dict", deep=False):
+    """
+    Returns the memory accounting of the stores of the auto-implemented properties.
+
+    Args:
+        cls (PropertyMeta, optional): The class whose stores are accounted. If omitted, the stores of all classes
+         created by `PropertyMeta` are accounted.
+        fmt (str, optional): ``'dict'`` (default) or ``'prometheus'`` (the text exposition format).
+        deep (bool, optional): Whether to account the items of the stored lists, tuples, sets and dictionaries
+         recursively (every object is accounted once). Default is False.
+
+    Returns:
+        dict or str: The accounting by the qualified names of the classes. For every class, ``properties`` contains the
+        ``storage`` of every property (``'instance'``, ``'keyed'`` or ``'shared'``), the number of the stored
+        ``entries``, their approximate size in ``bytes`` (by `sys.getsizeof` of the store, its keys and the values, and
+        the size of the shared memory block) and the number of the ``stale`` entries, whose instances are referenced
+        only by the stores (see `PropertyMeta.staleinstances`).
+
+    Raises:
+        ValueError: If the format is unknown.
+
+    The values of the instances with ``__dict__`` are kept in the instances themselves (the ``'instance'`` storage):
+    their ``entries`` and ``bytes`` are counted in the ``__dict__`` of the live instances of the class and of its
+    subclasses (the ``bytes`` are the sizes of the values only), and they are never ``stale``, as they are freed with
+    the instances. The ``'keyed'`` storage of the instances without ``__dict__`` and the ``'shared'`` storage keep the
+    instances alive until the values are deleted. A store of an inherited property is accounted for every class that
+    inherits it. The accounting takes time proportional to the number of the stored values (of all classes, as the
+    stale entries are counted by the references of all stores) and, if a property has the ``'instance'`` storage, to
+    the number of the objects tracked by the garbage collector (the instances are found among them).
+
+    Examples:
+        >>> class Point(metaclass=PropertyMeta):  # doctest:+SKIP
+        ...     __slots__ = ()
+        ...     x = property(..., ...)
+        ...
+        >>> Point().x = 1  # doctest:+SKIP
+        >>> memoryusage(Point)[_qualname(Point)]["properties"]["x"]  # doctest:+SKIP
+        {'storage': 'keyed', 'entries': 1, 'bytes': 332, 'stale': 1}
+    """
+    if fmt not in ("dict", "prometheus"):
+        raise ValueError("unknown format %r" % (fmt,))
+
+    holders = _holders()
+    seen = set() if deep else None  # type: Optional[Set[int]]
+    classes = [cls] if cls is not None else list(_CLASSES)
+    instanceusage = _instanceusage(classes, seen)
+    result = {}  # type: Dict[str, Dict[str, Any]]
+    for _cls in classes:
+        properties = {}  # type: Dict[str, Dict[str, Any]]
+        for key, plan in getattr(_cls, "_PropertyMeta__plans").items():
+            if plan.kind == "computed":
+                continue
+
+            fields = plan.fields
+            if isinstance(fields, _InstanceFields):
+                entries, size = instanceusage[_cls][key]
+                properties[key] = {"storage": "instance", "entries": entries, "bytes": size, "stale": 0}
+                continue
+
+            if isinstance(fields, SharedFieldStore):
+                keys = fields._heldkeys()
+                size = fields.nbytes + sys.getsizeof(fields._slots) + sys.getsizeof(fields._refs)
+                size += len(fields._refs) * sys.getsizeof(weakref.ref(SharedFieldStore))  # mostly weak references
+            else:
+                keys = fields
+                size = sys.getsizeof(keys) + len(keys) * sys.getsizeof((None, ))  # the keys are (instance,)
+
+            if keys is fields and seen is None:
+                size += sum(map(sys.getsizeof, fields.values()))
+            elif keys is fields:
+                size += sum(_sizeof(value, seen) for value in fields.values())
+
+            properties[key] = {"storage": "keyed" if keys is fields else "shared", "entries": len(fields),
+                               "bytes": size, "stale": len(_stale(keys, holders))}
+
+        result[_qualname(_cls)] = {"properties": properties}
+
+    if fmt == "dict":
+        return result
+
+    lines = []
+    for metric, text in (("entries", "Values in stores of auto-implemented properties."),
+                         ("bytes", "Approximate size of stores of auto-implemented properties."),
+                         ("stale", "Values of instances referenced only by stores of auto-implemented properties.")):
+        lines.append("# HELP pymagic9_property_store_%s %s" % (metric, text))
+        lines.append("# TYPE pymagic9_property_store_%s gauge" % metric)
+        for name, entry in sorted(result.items()):
+            for key, usage in sorted(entry["properties"].items()):
+                if usage[metric] is not None:
+                    labels = 'class="%s",property="%s",storage="%s"' % (name, key, usage["storage"])
+                    lines.append("pymagic9_property_store_%s{%s} %d" % (metric, labels, usage[metric]))
+
+    return "\n".join(lines) + "\n"
+
+
+def _instanceusage(classes, seen):
+    """
+    Returns the numbers and the sizes of the values kept in the ``__dict__`` of the instances (and of the instances of
+    the subclasses) of the classes by the auto-implemented properties with the ``'instance'`` storage by the classes.
+    The instances are found among the objects tracked by the garbage collector, in one pass for all classes, and no
+    reference to them is kept (so the stale entries of the other stores are still counted right).
+
+    """
+    names = {}  # type: Dict[Any, List[str]]
+    for cls in classes:
+        names[cls] = [key for key, plan in getattr(cls, "_PropertyMeta__plans").items()
+                      if plan.kind != "computed" and isinstance(plan.fields, _InstanceFields)]
+
+    usage = dict((cls, dict((key, [0, 0]) for key in keys)) for cls, keys in names.items())
+    targets = [cls for cls, keys in names.items() if keys]
+    if not targets:
+        return usage
+
+    accounted = {}  # type: Dict[type, List[Any]]  # the accounted classes by the types of the objects
+    for obj in gc.get_objects():
+        kind = type(obj)
+        try:
+            bases = accounted[kind]
+        except KeyError:
+            bases = accounted[kind] = [cls for cls in targets if issubclass(kind, cls)]
+
+        for cls in bases:
+            fields = getattr(obj, "__dict__", None) or {}
+            for key in names[cls]:
+                if key in fields:
+                    entry = usage[cls][key]
+                    entry[0] += 1
+                    entry[1] += _sizeof(fields[key], seen)
+
+    return usage
+
+
+def _sizeof(value, seen):
+    """
+    Returns the size of the value, and of its items recursively if ``seen`` (the ids of the accounted objects) is
+    given.
+
+    """
+    if seen is None:
+        return sys.getsizeof(value)
+
+    if id(value) in seen:
+        return 0
+
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for item in value.items():
+            size += _sizeof(item[0], seen) + _sizeof(item[1], seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += _sizeof(item, seen)
+
+    return size
+
+
+def _holders():
+    """
+    Returns the numbers of the keys referencing the instances in the stores of all classes by the ids of the instances.
+
+    """
+    stores = {}  # type: Dict[int, Any]
+    for cls in list(_CLASSES):
+        for plan in getattr(cls, "_PropertyMeta__plans").values():
+            fields = plan.fields
+            if isinstance(fields, _FIELDS_TYPES):
+                keys = fields._heldkeys() if isinstance(fields, SharedFieldStore) else fields
+                stores[id(keys)] = keys
+
+    holders = Counter()  # type: Counter[int]
+    for keys in stores.values():
+        holders.update(map(id, map(_FIRST, list(keys))))
+
+    return holders
+
+
+def _stale(keys, holders):
+    """
+    Returns the instances among the keys of the store that are referenced only by the keys of the stores.
+
+    """
+    if _KEYREFS is None:  # pragma: no cover
+        return []
+
+    keys = list(keys)
+    # the reference counts of the instances taken from the keys, without the references of the keys themselves
+    refs = map(operator.sub, map(sys.getrefcount, map(_FIRST, keys)), itertools.repeat(_KEYREFS))
+    return [key[0] for key, count, ident in zip(keys, refs, map(id, map(_FIRST, keys))) if count == holders[ident]]
+
+
+def _keyrefs():
+    """
+    Returns the reference count of an instance taken from a key by `_stale` that is referenced only by the key, without
+    the reference of the key (None if the reference counts are not available).
+
+    """
+    if not hasattr(sys, "getrefcount"):  # pragma: no cover
+        return None
+
+    return next(iter(map(sys.getrefcount, map(_FIRST, [(object(), )])))) - 1
+
+
+_FIRST = operator.itemgetter(0)
+_KEYREFS = _keyrefs()
+
+
+def _counter(accessor, counters, index, timing):
+    """
+    Wraps the accessor to count its calls in ``counters[index]`` (and the time in ``counters[index + 3]``).
+
+    """
+    if accessor is None:
+        return None
+
+    if not timing:
+        def _wrapper(self, *args):
+            counters[index] += 1
+            return accessor(self, *args)
+
+        return _wrapper
+
+    def _wrapper(self, *args):  # noqa: F811
+        start = _timer()
+        try:
+            return accessor(self, *args)
+        finally:
+            counters[index] += 1
+            counters[index + 3] += _timer() - start
+
+    return _wrapper
+
+
+def _qualname(cls):
+    """
+    Returns the qualified name of the class with its module.
+
+    """
+    return "%s.%s" % (cls.__module__, getattr(cls, "__qualname__", cls.__name__))
+
+
+_ACCESSES = ("reads", "writes", "deletes")
+_ACCESS_SECONDS = ("read_seconds", "write_seconds", "delete_seconds")
+# classes created by PropertyMeta
+_CLASSES = weakref.WeakSet()  # type: weakref.WeakSet[PropertyMeta]
+# global instrumentation ("timing" is present while it is enabled)
+_INSTRUMENTATION = {}  # type: Dict[str, bool]
+# instrumented classes: (counters by properties, original properties, timing, start time)
+_INSTRUMENTED = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary[PropertyMeta, Tuple[Any, ...]]
+_timer = getattr(time, "perf_counter", time.time)
+_monotonic = getattr(time, "monotonic", time.time)
+
+
+def _is_autoimplemented_accessor(accessor):
+    """
+    Accessor is auto-implemented if it is an ellipsis or an empty function.
+
+    """
+    if accessor is None:
+        return False
+    elif accessor is Ellipsis:
+        return True
+
+    code = getattr(accessor, "__code__", None)
+    try:
+        return _EMPTY_CODES[code]
+    except (KeyError, TypeError):
+        pass
+
+    result = _EMPTY_CODES[code] = isemptyfunction(accessor)
+    return result
+
+
+# results of `isemptyfunction` by code objects of accessors
+_EMPTY_CODES = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary[CodeType, bool]
+
+
+def _get_option(option, key, default=None):
+    """
+    Returns the value of a class option for the property: an option is either common to all properties of the class or
+    a dictionary of values by property names.
+
+    """
+    if isinstance(option, dict):
+        return option.get(key, default)
+
+    return option
+
+
+def _get_change_policy(policy, key):
+    """
+    Returns the function that determines whether a new value differs from the old one (None means always write).
+
+    """
+    policy = _get_option(policy, key, "equality")
+    if callable(policy):
+        return policy
+
+    try:
+        return _CHANGE_POLICIES[policy]
+    except (KeyError, TypeError):
+        raise ValueError("unknown change policy %r of the '%s' property" % (policy, key))
+
+
+_CHANGE_POLICIES = {
+    "always": None,
+    "equality": operator.ne,
+    "identity": operator.is_not,
+}  # type: Dict[str, Optional[Callable[[Any, Any], Any]]]
@@ -0,0 +1,120 @@
+import threading
+from types import CodeType
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, TextIO, Tuple, Union
+
+__all__: List[str]
+
+class SharedFieldStoreFull(Exception): ...
+
+class SharedFieldStore(object):
+    format: str
+    capacity: int
+
+    def __init__(self, fmt: str, capacity: int, name: Optional[str] = ...) -> None: ...
+
+    @classmethod
+    def attach(cls, name: str, fmt: str, capacity: int) -> SharedFieldStore: ...
+
+    def open(self, name: Optional[str] = ...) -> SharedFieldStore: ...
+
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def values(self) -> memoryview: ...
+
+    @property
+    def present(self) -> memoryview: ...
+
+    @property
+    def nbytes(self) -> int: ...
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, key: Tuple[Any]) -> bool: ...
+
+    def __getitem__(self, key: Tuple[Any]) -> Any: ...
+
+    def get(self, key: Tuple[Any], default: Any = ...) -> Any: ...
+
+    def __setitem__(self, key: Tuple[Any], value: Any) -> None: ...
+
+    def __delitem__(self, key: Tuple[Any]) -> None: ...
+
+    def slot(self, instance: Any) -> int: ...
+
+    def close(self) -> None: ...
+
+    def unlink(self) -> None: ...
+
+class ChangeJournal(object):
+    class Entry(NamedTuple):
+        sequence: int
+        timestamp: float
+        instance: int
+        name: str
+        action: str
+        old: Any
+        new: Any
+        caller: Optional[CodeType]
+
+    capacity: int
+    caller: bool
+    userepr: bool
+
+    def __init__(self, capacity: int, caller: bool = ..., userepr: bool = ...) -> None: ...
+
+    def __len__(self) -> int: ...
+
+    def entries(self) -> List[ChangeJournal.Entry]: ...
+
+    def dump(self, stream: Optional[TextIO] = ...) -> None: ...
+
+    def clear(self) -> None: ...
+
+# TODO: PropertyMeta: write annotations
+class PropertyMeta(type):
+    def __init__(cls, name, bases, attrs) -> None: ...
+
+    def autoproperties(cls) -> Tuple[str, ...]: ...
+
+    def changejournal(cls) -> Optional[ChangeJournal]: ...
+
+    def dumpjsonlines(cls, instances: Iterable[Any], stream: TextIO, **kwargs: Any) -> int: ...
+
+    def lookup(cls, name: str, value: Any) -> Any: ...
+
+    def release(cls, instance: Any) -> bool: ...
+
+    def sharedstore(cls, name: str) -> SharedFieldStore: ...
+
+    def staleinstances(cls) -> List[Any]: ...
+
+# noinspection SpellCheckingInspection
+def instrument(cls: Optional[PropertyMeta] = ..., timing: bool = ...) -> None: ...
+
+# noinspection SpellCheckingInspection
+def uninstrument(cls: Optional[PropertyMeta] = ...) -> None: ...
+
+# noinspection SpellCheckingInspection
+def accessstats(cls: Optional[PropertyMeta] = ..., fmt: str = ...) -> Union[Dict[str, Dict[str, Any]], str]: ...
+
+# noinspection SpellCheckingInspection
+def memoryusage(cls: Optional[PropertyMeta] = ..., fmt: str = ...,
+                deep: bool = ...) -> Union[Dict[str, Dict[str, Any]], str]: ...
+
+def _qualname(cls: type) -> str: ...
+
+def _initializer(init: Callable[..., None]) -> Callable[..., None]: ...
+
+class _InitializationWindow(threading.local):
+    ids: Set[int]
+
+_INITIALIZING: _InitializationWindow
+
+def _is_autoimplemented_accessor(accessor: Union[Callable[..., Any], ellipsis, None]) -> bool: ...
+def _get_option(option: Any, key: str, default: Any = ...) -> Any: ...
+
+def _get_change_policy(policy: Any, key: str) -> Optional[Callable[[Any, Any], Any]]: ...
+
+_CHANGE_POLICIES: Dict[str, Optional[Callable[[Any, Any], Any]]]
@@ -2,11 +2,14 @@
 """
 Tests for pymagic9.py module
 """
+import os
+import pymagic9.frames as frames
+import pymagic9.properties as properties
 import pymagic9.pymagic9 as pm
 import pytest
 import sys
 
-from six import add_metaclass
+from six import add_metaclass, StringIO
 
 
 # noinspection SpellCheckingInspection
@@ -83,6 +86,152 @@ def test_isfunctionincallchain_invalid():
         pm.isfunctionincallchain(None)
 
 
+# noinspection SpellCheckingInspection
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="requires sys.monitoring")
+def test_trackcallchain():
+    # noinspection PyMissingOrEmptyDocstring
+    def f(o):
+        return pm.isfunctionincallchain(o)
+
+    # noinspection PyMissingOrEmptyDocstring
+    def g(depth):
+        return g(depth - 1) if depth else (f(g), f(h))
+
+    # noinspection PyMissingOrEmptyDocstring
+    def h():
+        yield f(h)
+        pm.trackcallchain(h)  # already active
+        yield f(h)
+
+    # noinspection PyMissingOrEmptyDocstring
+    def fail():
+        raise ValueError
+
+    pm.trackcallchain(g, fail)
+    try:
+        assert g(3) == (True, False) and f(g) is False
+        with pytest.raises(ValueError):
+            fail()
+
+        assert f(fail) is False
+        generator = h()
+        assert next(generator) is True and next(generator) is True and f(h) is False
+        generator.close()
+        assert f(h) is False
+        with pytest.raises(TypeError, match=r"\'o\' must be code or function"):
+            pm.trackcallchain(None)
+    finally:
+        pm.untrackcallchain()
+
+    assert frames._TOOL is None and g(1) == (True, False)
+
+
+# noinspection SpellCheckingInspection
+@pytest.mark.skipif(sys.version_info >= (3, 12), reason="sys.monitoring is available")
+def test_trackcallchain_unavailable():
+    with pytest.raises(RuntimeError, match=r"'sys.monitoring' is not available"):
+        pm.trackcallchain(test_trackcallchain_unavailable)
+
+
+# noinspection SpellCheckingInspection
+def test_findrunning():
+    import threading
+
+    # noinspection PyMissingOrEmptyDocstring
+    def job(event, depth):
+        return job(event, depth - 1) if depth else event.wait()
+
+    # noinspection PyMissingOrEmptyDocstring
+    def query(*args):
+        return pm.findrunning(*args)
+
+    event = threading.Event()
+    threads = [threading.Thread(target=job, args=(event, i)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        found = query([job, query])
+        assert [(ident, code) for ident, depth, code in found if depth == 0] == [
+            (threading.current_thread().ident, query.__code__)]
+        assert sorted(ident for ident, _, code in found if code is job.__code__) == sorted(
+            [threads[0].ident] + [threads[1].ident] * 2 + [threads[2].ident] * 3)
+        targets = frozenset([job])
+        assert len(pm.findrunning(targets)) == len(pm.findrunning(targets)) == 6 and pm.findrunning(job, 1) == []
+        assert [(ident, code) for ident, _, code in pm.findrunning(iter([query, test_findrunning]))] == [
+            (threading.current_thread().ident, test_findrunning.__code__)]
+        with pytest.raises(TypeError, match=r"\'o\' must be code or function"):
+            pm.findrunning(None)
+
+        with pytest.raises(TypeError, match=r"\'o\' must be code or function"):
+            pm.findrunning(frozenset(["job"]))
+    finally:
+        event.set()
+        for thread in threads:
+            thread.join()
+
+    assert pm.findrunning(job) == []
+
+
+# noinspection SpellCheckingInspection
+def test_caller_helpers():
+    class A(object):
+        # noinspection PyMissingOrEmptyDocstring
+        @staticmethod
+        def f(*args, **kwargs):
+            return pm.callername(*args, **kwargs), pm.callermodule(*args), pm.callerlocation(*args)
+
+    # noinspection PyMissingOrEmptyDocstring
+    def g(*args, **kwargs):
+        return A.f(*args, **kwargs), sys._getframe().f_lineno
+
+    (name, module, (filename, line)), lineno = g()
+    assert (name, module, filename, line) == ("g", __name__, __file__, lineno)
+    assert pm.callername(0) == "test_caller_helpers" and g(0)[0][0] == "f"
+    if sys.version_info >= (3, ):
+        qualname = "test_caller_helpers.<locals>.A.f"
+        assert g(0, qualified=True)[0][0] == g(0, qualified=True)[0][0] == qualname
+        assert sys.version_info >= (3, 11) or A.f.__code__ in frames._QUALNAMES
+
+    with pytest.raises(ValueError, match=r"call stack is not deep enough"):
+        pm.callername(1000000000)
+
+
+# noinspection SpellCheckingInspection
+def test_findlocal():
+    # noinspection PyMissingOrEmptyDocstring
+    def f(*args):
+        return pm.findlocal("request_id", *args)
+
+    # noinspection PyMissingOrEmptyDocstring,PyUnusedLocal
+    def g(*args):
+        if not args:
+            request_id = "g"  # noqa: F841
+
+        return f(*args)
+
+    # noinspection PyMissingOrEmptyDocstring
+    def h(*args):
+        request_id = "h"
+
+        def k():
+            return request_id, g(*(args or (-1, )))
+
+        return k()
+
+    assert g() == "g" and h() == ("h", "h") and h(2, None) == ("h", None) and h(3, None) == ("h", "h")
+
+    with pytest.raises(NameError, match=r"name 'request_id' is not found in the call chain"):
+        f()
+
+    lambda_ = eval('lambda: findlocal("request_id", 1, None)', {"findlocal": pm.findlocal})
+    assert lambda_() is None and id(lambda_.__code__) in frames._LOCALNAMES
+
+    code_id = id(lambda_.__code__)
+    del lambda_
+    assert code_id not in frames._LOCALNAMES
+
+
 # noinspection SpellCheckingInspection
 @pytest.mark.parametrize("name",
                          [
@@ -232,6 +381,50 @@ def test_isemptyfunction_invalid_input():
         pm.isemptyfunction(None)
 
 
+# noinspection SpellCheckingInspection
+def test_analysis_cache(tmp_path, monkeypatch):
+    from pymagic9 import names
+
+    path = str(tmp_path / "__pycache__" / "pymagic9.cache")
+
+    # noinspection PyMissingOrEmptyDocstring
+    def analyze():
+        return pm.nameof(empty_function_1), pm.nameof(sys.version)
+
+    cache = pm.enablecache(path)
+    assert names._CACHE is cache and len(cache) == 0
+    assert analyze() == analyze() == ("empty_function_1", "version") and len(cache) == 2
+    pm.disablecache()
+    assert names._CACHE is None
+
+    # the results are read from the file
+    monkeypatch.setattr(names, "_nameof", None)
+    cache = pm.enablecache(path)
+    assert len(cache) == 2 and analyze() == ("empty_function_1", "version")
+    with pytest.raises(TypeError):
+        pm.nameof(not_empty_function_1)
+
+    pm.savecache()
+    pm.disablecache()
+    monkeypatch.undo()
+
+    # a file of another format is ignored
+    with open(path, "wb") as f:
+        f.write(b"PM9A")
+
+    cache = pm.enablecache(path)
+    assert len(cache) == 0 and analyze() == ("empty_function_1", "version")
+    pm.disablecache()
+
+    # a relative path is resolved when the cache is enabled
+    monkeypatch.chdir(str(tmp_path))
+    cache = pm.enablecache()
+    monkeypatch.chdir(str(tmp_path / "__pycache__"))
+    analyze()
+    pm.disablecache()
+    assert os.path.dirname(cache.path) == str(tmp_path / "__pycache__") and os.path.exists(cache.path)
+
+
 # noinspection PyMissingOrEmptyDocstring
 @pytest.fixture(scope="class")
 def create_PropertyMeta():
@@ -350,3 +543,1082 @@ def test__is_auto_implemented_accessor(func):
 
     # noinspection PyUnresolvedReferences
     assert expected is pm._is_autoimplemented_accessor(func)
+
+
+# noinspection PyMissingOrEmptyDocstring
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="requires multiprocessing.shared_memory")
+def test_shared_field_store():
+    import pickle
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class _(object):
+        __sharedfields__ = {"x": "d"}
+        __sharedcapacity__ = 2
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        x = property(Ellipsis, Ellipsis)
+
+    first, second, third = _(), _(), _()
+    store = _.sharedstore("x")
+    assert store.nbytes == 0  # the block is created by the first write
+    first.x, second.x = 1.5, 2.5
+    try:
+        assert store.nbytes == 2 * 8 + 2
+        assert first.x == 1.5 and store.values[store.slot(second)] == 2.5
+        usage = pm.memoryusage(_)[properties._qualname(_)]["properties"]["x"]
+        assert (usage["storage"], usage["entries"], usage["stale"]) == ("shared", 2, 0)
+        with pytest.raises(pm.SharedFieldStoreFull, match=r"shared field store is full \(capacity 2\)"):
+            third.x = 3.5
+
+        del first.x
+        with pytest.raises(AttributeError, match=r"auto-implemented field does not exist"):
+            first.x  # noqa
+
+        third.x = 3.5
+        attached = pickle.loads(pickle.dumps(store))
+        assert attached.name == store.name and attached.values[store.slot(third)] == 3.5
+        assert attached.present.tolist() == [1, 1]
+        attached.close()
+
+        worker = pm.SharedFieldStore("d", 2).open(store.name)
+        assert worker.values.tolist() == store.values.tolist() and worker.nbytes == store.nbytes
+        worker.unlink()  # only closes the block, as the store is not its owner
+        assert worker.nbytes == 0 and store.values[store.slot(third)] == 3.5
+
+        # the slots of the collected instances are released
+        slot = store.slot(second)
+        del second
+        assert store.present[slot] == 0 and len(store) == 1
+        for i in range(10):
+            _().x = float(i)
+
+        assert len(store) == 1 and store.values[store.slot(third)] == 3.5
+    finally:
+        store.unlink()
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Slotted(object):
+        __slots__ = ()
+
+    store, key = pm.SharedFieldStore("d", 1), (Slotted(), )
+    try:
+        store[key] = 1.0  # kept alive by the store, as it cannot be referenced weakly
+        assert store[key] == 1.0 and store._heldkeys() == [key]
+        del store[key]
+        assert key not in store and store._heldkeys() == []
+    finally:
+        store.unlink()
+
+    with pytest.raises(AttributeError, match=r"'y' is not a shared auto-implemented property"):
+        _.sharedstore("y")
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="requires multiprocessing.shared_memory")
+def test_shared_field_store_invalid():
+    with pytest.raises(ValueError, match=r"'fmt' must be a single fixed-width format character"):
+        pm.SharedFieldStore("dd", 1)
+
+    with pytest.raises(TypeError, match=r"'x' is not an auto-implemented property and cannot be shared"):
+        pm.PropertyMeta("Meta", (), {"__sharedfields__": {"x": "d"}, "x": property(lambda self: 0)})
+
+
+# noinspection PyMissingOrEmptyDocstring
+@pytest.mark.parametrize(("policy", "onchange", "expected_values", "expected_calls"), [
+    ("equality", False, [[1], [1], [2]], 3),
+    ("equality", True, [[1], [1], [2]], 2),
+    ("identity", True, [[1], [1], [2]], 3),
+    ("always", True, [[1], [1], [2]], 3),
+    ({"prop": lambda old, new: len(old) != len(new)}, True, [[1], [1], [1]], 1),
+])
+def test_change_policy(policy, onchange, expected_values, expected_calls):
+    calls = []
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class _(object):
+        __changepolicy__ = policy
+        __notifyonchange__ = onchange
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        plain = property(Ellipsis, Ellipsis)
+
+        # noinspection PyPropertyDefinition
+        @property
+        def prop(self):
+            pass
+
+        @prop.setter
+        def prop(self, value):
+            calls.append(value)
+
+    instance = _()
+    values = []
+    for value in ([1], [1], [2]):
+        instance.prop = value
+        values.append(instance.prop)
+
+    assert values == expected_values and len(calls) == expected_calls
+
+    for value in ([1], [1]):
+        instance.plain = value
+
+    assert (instance.plain is value) is (properties._get_option(policy, "plain", "equality") in ("identity", "always"))
+
+
+def test_change_policy_invalid():
+    with pytest.raises(ValueError, match=r"unknown change policy 'unknown' of the 'x' property"):
+        pm.PropertyMeta("Meta", (), {"__changepolicy__": "unknown", "x": property(Ellipsis, Ellipsis)})
+
+
+# noinspection PyMissingOrEmptyDocstring,PyUnresolvedReferences
+def test_property_plans():
+    calls = []
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Base(object):
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        x = property(Ellipsis, Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        y = property(Ellipsis, Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        z = property(Ellipsis, Ellipsis)
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Sub(Base):
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        y = property(Ellipsis, Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        z = property(Ellipsis, lambda self, value: calls.append(value))
+
+    base_plans, sub_plans = Base._PropertyMeta__plans, Sub._PropertyMeta__plans
+    assert sorted(sub_plans) == ["x", "y", "z"] and sub_plans["x"] is base_plans["x"]
+    assert sub_plans["y"] is base_plans["y"] and Sub.__dict__["y"] is Base.__dict__["y"]
+    assert sub_plans["z"].kind == "custom" and sub_plans["z"].fields is base_plans["z"].fields
+
+    instance = Sub()
+    instance.z = 1
+    assert Base.z.fget(instance) == 1 and calls == [1]
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Plain(Sub):
+        z = None
+
+    assert sorted(Plain._PropertyMeta__plans) == ["x", "y"]
+
+
+# noinspection PyMissingOrEmptyDocstring,PyPropertyAccess
+def test_readonly_initialization_window():
+    cache = {}
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Base(object):
+        def __new__(cls, name):
+            if name not in cache:
+                cache[name] = object.__new__(cls)
+
+            return cache[name]
+
+        def __init__(self, name):
+            self._set_name(name)
+
+        def _set_name(self, name):
+            self.name = name
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        name = property(Ellipsis)
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Sub(Base):
+        def __init__(self, name):
+            super(Sub, self).__init__(name)
+            self.upper = name.upper()
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        upper = property(Ellipsis)
+
+    assert Base("a") is Base("a") and Base("a").name == "a"
+    sub = Sub("b")
+    assert (sub.name, sub.upper) == ("b", "B") and not properties._INITIALIZING.ids
+    with pytest.raises(AttributeError, match=r"'property' is readonly"):
+        sub._set_name("c")
+
+    # the interned instances are not initialized again
+    assert Sub("b") is sub and Base("a") is cache["a"]
+    Sub.__init__(sub, "d")
+    assert (sub.name, sub.upper) == ("b", "B") and not properties._INITIALIZING.ids
+    del sub.upper  # an instance with an unset readonly property is initialized again
+    with pytest.raises(AttributeError, match=r"'property' is readonly"):
+        Sub.__init__(sub, "d")
+
+    assert not properties._INITIALIZING.ids
+
+    assert getattr(Base.__init__, "__initializer__") and Base.__init__.__name__ == "__init__"
+
+
+# noinspection PyMissingOrEmptyDocstring,PyPropertyAccess
+def test_instance_storage():
+    import threading
+
+    errors = []
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class A(object):
+        def __init__(self, x):
+            # another thread cannot write readonly properties of the instance being initialized
+            thread = threading.Thread(target=self._set_x, args=(0, ))
+            thread.start()
+            thread.join()
+            self._set_x(x)
+
+        def _set_x(self, x):
+            try:
+                self.x = x
+            except AttributeError as e:
+                errors.append(str(e))
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        x = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        y = property(Ellipsis, Ellipsis)
+
+    a = A(1)
+    a.y = 2
+    assert vars(a) == {"x": 1, "y": 2} and errors == ["'property' is readonly"]
+    del a.y
+    assert vars(a) == {"x": 1}
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class B(object):
+        __slots__ = ()
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        y = property(Ellipsis, Ellipsis)
+
+    b = B()
+    b.y = 3
+    assert b.y == 3 and isinstance(getattr(B, "_PropertyMeta__plans")["y"].fields, dict)
+
+
+def test_frozen():
+    import copy
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Point(object):
+        __frozen__ = True
+
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        x = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        y = property(Ellipsis, Ellipsis)
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Point3(Point):
+        def __init__(self, x, y, z):
+            super(Point3, self).__init__(x, y)
+            hash(self)  # not cached before the end of the initialization
+            self.z = z
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        z = property(Ellipsis, Ellipsis, Ellipsis)
+
+    a, b = Point(1, 2), Point(1, 2)
+    assert a == b and not a != b and a != Point(2, 1) and len({a, b}) == 1
+    assert repr(a).endswith("Point(x=1, y=2)") and vars(a)["_PropertyMeta__hash"] == hash((1, 2))
+    assert copy.copy(a) == a and "_PropertyMeta__hash" not in a.__getstate__()
+    with pytest.raises(AttributeError):
+        a.y = 3
+
+    with pytest.raises(AttributeError):
+        del a.y
+
+    c = Point3(1, 2, 3)
+    assert hash(c) == hash((1, 2, 3)) and c != a and repr(c).endswith(".Point3(x=1, y=2, z=3)")
+    with pytest.raises(AttributeError):
+        c.z = 4
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Sized(object):
+        __frozen__ = True
+        __fielddefaults__ = {"size": 0}
+
+        def __init__(self, name, size=None):
+            self.name = name
+            if size is not None:
+                self.size = size
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        name = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        size = property(Ellipsis)
+
+    # the hash of the defaulted values equals the hash of the same values set explicitly
+    defaulted, explicit = Sized("a"), Sized("a", 0)
+    assert defaulted == explicit and hash(defaulted) == hash(explicit) == hash(("a", 0))
+    assert vars(defaulted)["_PropertyMeta__hash"] == vars(explicit)["_PropertyMeta__hash"]
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Base(object):
+        def __init__(self, x):
+            self.x = x
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        x = property(Ellipsis)
+
+        def __eq__(self, other):
+            return True
+
+        def __hash__(self):
+            return 0
+
+        def __repr__(self):
+            return "Base"
+
+    # noinspection PyMissingOrEmptyDocstring
+    class FrozenBase(Base):
+        __frozen__ = True
+
+    assert FrozenBase(1) == FrozenBase(2) and hash(FrozenBase(1)) == 0 and repr(FrozenBase(1)) == "Base"
+
+    with pytest.raises(TypeError):
+        @add_metaclass(pm.PropertyMeta)
+        # noinspection PyMissingOrEmptyDocstring
+        class Custom(object):
+            __frozen__ = True
+
+            # noinspection PyTypeChecker,PyPropertyDefinition
+            x = property(Ellipsis, lambda self, value: sys.stdout.write(value))
+
+
+def test_change_journal():
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Account(object):
+        __changejournal__ = 3
+        __journalcaller__ = True
+
+        def __init__(self, owner):
+            self.owner = owner
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        owner = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        balance = property(Ellipsis, Ellipsis, Ellipsis)
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Savings(Account):
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        rate = property(Ellipsis, Ellipsis)
+
+    journal = Account.changejournal()
+    account = Savings("bob")
+    assert Savings.changejournal() is journal and len(journal) == 1
+    account.balance = 100
+    account.balance = 50
+    del account.balance
+    with pytest.raises(AttributeError):
+        account.owner = "alice"  # failed changes are not recorded
+
+    account.rate = 0.1
+    entries = journal.entries()
+    assert [(e.sequence, e.name, e.action, e.old, e.new) for e in entries] == [
+        (2, "balance", "set", 100, 50), (3, "balance", "delete", 50, None), (4, "rate", "create", None, 0.1)
+    ]
+    code = sys._getframe().f_code
+    assert all(e.instance == id(account) and e.caller is code for e in entries)
+    stream = StringIO()
+    journal.dump(stream)
+    assert stream.getvalue().splitlines()[0].endswith(
+        "balance set 100 -> 50 at %s:%d test_change_journal" % (code.co_filename, code.co_firstlineno))
+
+    journal.clear()
+    assert not journal.entries()
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Reprs(Account):
+        __changejournal__ = 10
+        __journalrepr__ = True
+
+    reprs = Reprs("carol")
+    reprs.balance = [1]
+    assert not journal.entries() and [e.new for e in Reprs.changejournal().entries()] == ["'carol'", "[1]"]
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Converted(Account):
+        __changejournal__ = 10
+        __fieldconverters__ = {"balance": float}
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        balance = property(Ellipsis, Ellipsis)
+
+    converted = Converted("dave")
+    converted.balance = "1.5"
+    converted.balance = 1.5  # not changed
+    converted.balance = "2"
+    assert [(e.action, e.old, e.new) for e in Converted.changejournal().entries()][1:] == [
+        ("create", None, 1.5), ("set", 1.5, 2.0)
+    ]
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Array(object):
+        def __ne__(self, other):
+            return self  # like the element-wise comparison of arrays
+
+        def __bool__(self):
+            raise ValueError("the truth value of an array is ambiguous")
+
+        __nonzero__ = __bool__
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Policies(Account):
+        __changejournal__ = 10
+        __changepolicy__ = {"balance": "identity", "rate": "always"}
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        balance = property(Ellipsis, Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        rate = property(Ellipsis, Ellipsis)
+
+    first, second = Array(), Array()
+    policies = Policies("erin")
+    policies.balance = first
+    policies.balance = second
+    policies.balance = second  # the same object is not written
+    policies.rate = 1.0
+    policies.rate = float("1")  # equal, but written by the policy
+    assert [(e.name, e.action, e.old, e.new) for e in Policies.changejournal().entries()][1:] == [
+        ("balance", "create", None, first), ("balance", "set", first, second), ("rate", "create", None, 1.0),
+        ("rate", "set", 1.0, 1.0)
+    ]
+
+
+def test_computed():
+    calls = []
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Person(object):
+        __computed__ = {"full_name": ("first", "last"), "title": ("full_name", )}
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        first = property(Ellipsis, Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        last = property(Ellipsis, Ellipsis)
+
+        @property
+        def full_name(self):
+            calls.append("full_name")
+            return "%s %s" % (self.first, self.last)
+
+        @property
+        def title(self):
+            return self.full_name.title()
+
+    person = Person()
+    person.first, person.last = "ada", "lovelace"
+    assert person.title == "Ada Lovelace" and person.full_name == "ada lovelace" and calls == ["full_name"]
+    person.last = "byron"  # invalidates full_name and, through it, title
+    assert "full_name" not in vars(person) and "title" not in vars(person)
+    assert person.title == "Ada Byron" and len(calls) == 2
+    del person.full_name
+    assert "title" not in vars(person) and person.full_name == "ada byron" and len(calls) == 3
+    del person.first
+    with pytest.raises(AttributeError):
+        person.full_name
+
+    with pytest.raises(AttributeError):
+        person.full_name = "bob"
+
+    with pytest.raises(TypeError):
+        @add_metaclass(pm.PropertyMeta)
+        # noinspection PyMissingOrEmptyDocstring
+        class Broken(object):
+            __computed__ = {"y": ("x", )}
+
+            y = property(lambda self: self.x)
+
+
+@pytest.mark.parametrize("slots", [False, True])
+def test_defaults(slots):
+    namespace = {
+        "__fielddefaults__": {"nickname": None, "age": 0},
+        "__fieldfactories__": {"tags": list},
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        "nickname": property(Ellipsis, Ellipsis),
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        "age": property(Ellipsis),
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        "tags": property(Ellipsis, Ellipsis),
+    }
+    if slots:
+        namespace["__slots__"] = ("__weakref__", )
+
+    Person = pm.PropertyMeta("Person", (object, ), namespace)
+    a, b = Person(), Person()
+    assert a.nickname is None and a.age == 0 and getattr(a, "nickname", 1) is None
+    a.tags.append("x")
+    assert a.tags == ["x"] and b.tags == [] and a.tags is not b.tags
+    a.nickname = "al"
+    del a.nickname
+    assert a.nickname is None
+    with pytest.raises(AttributeError):
+        del a.nickname
+
+    with pytest.raises(TypeError):
+        pm.PropertyMeta("Custom", (object, ), {"__fielddefaults__": {"x": 1}, "x": property(lambda self: 1, Ellipsis)})
+
+
+def test_typed():
+    from typing import Any, List, Optional
+
+    namespace = {
+        "__checktypes__": True,
+        "__annotations__": {"age": int, "name": Optional[str], "tags": List[str], "any": Any, "price": "float",
+                            "ident": int, "rate": float, "signal": complex},
+        "__fieldconverters__": {"price": float},
+        "__fieldvalidators__": {"age": lambda value: value >= 0},
+        "__init__": lambda self, ident: setattr(self, "ident", ident),
+    }
+    for key in ("age", "name", "tags", "any", "price", "rate", "signal"):
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        namespace[key] = property(Ellipsis, Ellipsis)
+
+    # noinspection PyTypeChecker,PyPropertyDefinition
+    namespace["ident"] = property(Ellipsis)
+    Item = pm.PropertyMeta("Item", (object, ), namespace)
+    item = Item(1)
+    item.age, item.name, item.tags, item.any, item.price = 3, None, ["x"], object(), "1.5"
+    item.name = "book"
+    assert item.age == 3 and item.name == "book" and item.price == 1.5
+    for key, value, error in (("age", "3", TypeError), ("age", -1, ValueError), ("name", 1, TypeError),
+                              ("tags", ("x", ), TypeError), ("price", "x", ValueError)):
+        with pytest.raises(error):
+            setattr(item, key, value)
+
+    with pytest.raises(TypeError, match="'ident' must be int, not str"):
+        Item("1")
+
+    item.rate, item.signal = 1, 1.5
+    assert (item.rate, item.signal) == (1, 1.5)
+    item.signal = 1j
+    with pytest.raises(TypeError):
+        item.rate = 1j
+
+    # forward references are resolved in the module of the class, which can reference itself
+    nodename, localname = "Node", "Local"  # the forward references
+    namespace = {"__checktypes__": True, "__annotations__": {"parent": nodename, "child": Optional[nodename]},
+                 "parent": property(Ellipsis, Ellipsis), "child": property(Ellipsis, Ellipsis)}  # type: ignore
+    Node = pm.PropertyMeta("Node", (object, ), namespace)
+    node = Node()
+    node.parent, node.child = Node(), None
+    with pytest.raises(TypeError, match="'child' must be Node or NoneType, not int"):
+        node.child = 1
+
+    # unresolvable annotations are rejected when the class is created instead of being left unchecked
+    for annotation in (localname, Optional[localname]):
+        namespace = {"__checktypes__": True, "__annotations__": {"x": annotation}, "x": property(Ellipsis, Ellipsis)}
+        with pytest.raises(TypeError, match="the annotation 'Local' of 'x' cannot be resolved"):
+            pm.PropertyMeta("Unresolved", (object, ), namespace)
+
+    # the checks are also built into the readonly setters and the custom setters
+    calls = []
+    namespace = {
+        "__checktypes__": True, "__annotations__": {"ident": int, "score": int},
+        "__fieldconverters__": {"ident": int}, "__fieldvalidators__": {"score": lambda value: value >= 0},
+        "__init__": lambda self, ident: setattr(self, "ident", ident),
+        "ident": property(Ellipsis), "score": property(Ellipsis, lambda self, value: calls.append(value)),
+    }  # type: ignore
+    Record = pm.PropertyMeta("Record", (object, ), namespace)
+    record = Record("7")
+    record.score = 3
+    assert (record.ident, record.score, calls) == (7, 3, [3])
+    with pytest.raises(TypeError, match="'score' must be int, not str"):
+        record.score = "3"
+
+    with pytest.raises(ValueError, match="invalid value of 'score': -1"):
+        record.score = -1
+
+    with pytest.raises(AttributeError, match="'property' is readonly"):
+        record.ident = 8
+
+    assert (record.ident, record.score, calls) == (7, 3, [3])
+
+    # annotations are not enforced without __checktypes__
+    namespace = {"__annotations__": {"age": int}, "age": property(Ellipsis, Ellipsis)}  # type: ignore
+    Plain = pm.PropertyMeta("Plain", (object, ), namespace)
+    plain = Plain()
+    plain.age = "3"
+    assert plain.age == "3"
+
+
+def test_indexes():
+    import gc
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Person(object):
+        __indexes__ = {"email": "unique", "city": "hash"}
+
+        def __init__(self, email, city):
+            self.email, self.city = email, city
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        email = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        city = property(Ellipsis, Ellipsis)
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Employee(Person):
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        city = property(Ellipsis, Ellipsis)
+
+    a, b, c = Person("a@x", "riga"), Person("b@x", "riga"), Employee("c@x", "oslo")
+    assert Person.lookup("email", "a@x") is a and Person.lookup("email", "x@x") is None
+    assert sorted(Person.lookup("city", "riga"), key=id) == sorted([a, b], key=id)
+    assert Employee.lookup("city", "oslo") == [c] and Person.lookup("city", "paris") == []
+    with pytest.raises(ValueError):
+        Person("a@x", "paris")
+
+    b.city = "oslo"
+    assert Person.lookup("city", "riga") == [a]
+    del b.city
+    assert Person.lookup("city", "oslo") == [c]
+    del a
+    gc.collect()
+    assert Person.lookup("email", "a@x") is None and Person.lookup("city", "riga") == []
+    with pytest.raises(AttributeError):
+        Person.lookup("name", "a")
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Member(Person):
+        __fieldconverters__ = {"email": str.lower}
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        email = property(Ellipsis)
+
+    d = Member("D@X", "riga")
+    assert Person.lookup("email", "d@x") is d and Person.lookup("email", "D@X") is None
+    with pytest.raises(ValueError):
+        Member("D@x", "oslo")
+
+    with pytest.raises(TypeError):
+        d.city = ["riga"]
+
+    assert d.city == "riga" and Person.lookup("city", "riga") == [d]
+    conversions = []
+
+    # noinspection PyMissingOrEmptyDocstring
+    def lower(value):
+        conversions.append(value)
+        return value.lower()
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Guest(Person):
+        __fieldconverters__ = {"email": lower, "city": lower}
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        email = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        city = property(Ellipsis, Ellipsis)
+
+    e = Guest("E@X", "Riga")
+    e.city = "Oslo"
+    assert conversions == ["E@X", "Riga", "Oslo"]  # converted once per assignment
+    assert Person.lookup("email", "e@x") is e and e in Person.lookup("city", "oslo")
+
+    with pytest.raises(TypeError, match=r"'email' is not an auto-implemented property and cannot be indexed"):
+        # noinspection PyMissingOrEmptyDocstring
+        class _(Person):
+            email = property(lambda self: "x@x")
+
+    with pytest.raises(TypeError):
+        @add_metaclass(pm.PropertyMeta)
+        # noinspection PyMissingOrEmptyDocstring
+        class Slotted(object):
+            __slots__ = ()
+            __indexes__ = {"x": "hash"}
+
+            # noinspection PyTypeChecker,PyPropertyDefinition
+            x = property(Ellipsis, Ellipsis)
+
+
+def test_pool():
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Message(object):
+        __poolsize__ = 1
+        __indexes__ = {"key": "unique"}
+
+        def __init__(self, key, body=None):
+            self.key, self.body = key, body
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        key = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        body = property(Ellipsis, Ellipsis)
+
+    message = Message(1, "a")
+    ident = id(message)
+    assert Message.release(message) and vars(message) == {} and Message.lookup("key", 1) is None
+    with pytest.raises(ValueError):
+        Message.release(message)
+
+    del message
+    reused = Message(2)
+    assert id(reused) == ident and (reused.key, reused.body) == (2, None)
+    assert Message.release(reused)
+    fresh = Message(3)
+    assert fresh is not reused  # still referenced, so it is dropped
+    first, second = Message(4), Message(5)
+    assert Message.release(first) and not Message.release(second)  # the pool is full
+    with pytest.raises(TypeError):
+        pm.PropertyMeta.release(add_metaclass(pm.PropertyMeta)(type("Plain", (object, ), {})), fresh)
+
+
+@add_metaclass(pm.PropertyMeta)
+# noinspection PyMissingOrEmptyDocstring
+class IndexedUser(object):  # module level to be pickled
+    __indexes__ = {"email": "unique", "city": "hash"}
+
+    def __init__(self, email, city):
+        self.email, self.city = email, city
+
+    # noinspection PyTypeChecker,PyPropertyDefinition
+    email = property(Ellipsis, Ellipsis)
+    # noinspection PyTypeChecker,PyPropertyDefinition
+    city = property(Ellipsis, Ellipsis)
+
+
+def test_copy():
+    import copy
+    import pickle
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class User(object):
+        __indexes__ = {"email": "unique"}
+        __computed__ = {"title": ("name", )}
+
+        def __init__(self, name, email, tags):
+            self.name, self.email, self.tags = name, email, tags
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        name = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        email = property(Ellipsis, Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        tags = property(Ellipsis, Ellipsis)
+        title = property(lambda self: self.name.title())
+
+    user = User("ann", "ann@x", ["a"])
+    assert user.title == "Ann"
+    copied, deep = copy.copy(user), copy.deepcopy(user)  # the copies are not indexed by the unique email
+    assert copied.email == deep.email == "ann@x" and User.lookup("email", "ann@x") is user
+    with pytest.raises(ValueError):
+        copied.email = "ann@x"
+
+    copied.email = "cat@x"
+    assert User.lookup("email", "cat@x") is copied and User.lookup("email", "ann@x") is user
+
+    clone = user.clone(name="bob", email="bob@x")
+    assert (clone.name, clone.email, clone.title, clone.tags is user.tags) == ("bob", "bob@x", "Bob", True)
+    assert User.lookup("email", "bob@x") is clone and User.lookup("email", "ann@x") is user
+    with pytest.raises(AttributeError):
+        clone.name = "eve"
+
+    # copied and unpickled instances follow the same rule
+    original = IndexedUser("dan@x", "riga")
+    for other in (copy.copy(original), pickle.loads(pickle.dumps(original))):
+        assert (other.email, other.city) == ("dan@x", "riga")
+        assert IndexedUser.lookup("email", "dan@x") is original and IndexedUser.lookup("city", "riga") == [original]
+        other.city = "oslo"
+        assert IndexedUser.lookup("city", "oslo") == [other]
+        del other.city
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Point(object):
+        __slots__ = ("__weakref__", "label")
+
+        def __init__(self, x, label):
+            self.x, self.label = x, label
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        x = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        y = property(Ellipsis, Ellipsis)
+
+    point = Point([1], "p")
+    point.y = 0.5
+    copied, deep = copy.copy(point), copy.deepcopy(point)
+    assert (copied.x is point.x, copied.label, deep.x == point.x, deep.x is point.x) == (True, "p", True, False)
+    assert (copied.y, deep.y, point.clone(x=2).x, point.clone(y=1.5).y, point.y) == (0.5, 0.5, 2, 1.5, 0.5)
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Version(object):
+        __frozen__ = True
+
+        def __init__(self, major, minor):
+            self.major, self.minor = major, minor
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        major = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        minor = property(Ellipsis)
+
+    version = Version(1, 2)
+    assert hash(version) and copy.copy(version) == version
+    assert version.clone(minor=3) == Version(1, 3) and hash(version.clone(minor=3)) == hash(Version(1, 3))
+
+
+def test_records():
+    import json
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class User(object):
+        __fielddefaults__ = {"tags": ()}
+        __fieldconverters__ = {"age": int}
+        __indexes__ = {"email": "unique"}
+        __computed__ = {"title": ("name", )}
+
+        def __init__(self, name, email, age):
+            self.name, self.email, self.age = name, email, age
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        name = property(Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        email = property(Ellipsis, Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        age = property(Ellipsis, Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        tags = property(Ellipsis, Ellipsis)
+        title = property(lambda self: self.name.title())
+
+    user = User("ann", "ann@x", 30)
+    assert user.title == "Ann" and User.autoproperties() == ("name", "email", "age", "tags")
+    assert user.todict() == {"name": "ann", "email": "ann@x", "age": 30, "tags": ()}
+    assert user.totuple() == ("ann", "ann@x", 30, ())
+    loaded = User.fromdict({"name": "bob", "email": "bob@x", "age": "31"})
+    assert loaded.totuple() == ("bob", "bob@x", 31, ()) and User.lookup("email", "bob@x") is loaded
+    with pytest.raises(AttributeError):
+        loaded.name = "eve"
+
+    with pytest.raises(TypeError, match=r"'nick' is not an auto-implemented property of 'User'"):
+        User.fromdict({"nick": "bob"})
+
+    stream = StringIO()
+    assert User.dumpjsonlines(iter([user, loaded]), stream) == 2
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+        {"name": "ann", "email": "ann@x", "age": 30, "tags": []},
+        {"name": "bob", "email": "bob@x", "age": 31, "tags": []}]
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Point(object):
+        __slots__ = ()
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        x = property(Ellipsis, Ellipsis)
+
+    point = Point()
+    assert (point.todict(), point.totuple(), Point.fromdict({"x": 1}).todict()) == ({}, (None, ), {"x": 1})
+
+
+def test_multiple_inheritance():
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class A(object):
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        a = property(Ellipsis, Ellipsis)
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class B(object):
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        b = property(Ellipsis, Ellipsis)
+
+    # noinspection PyMissingOrEmptyDocstring
+    class C(A, B):
+        def __init__(self, a, b, c):
+            self.a, self.b, self.c = a, b, c
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        c = property(Ellipsis, Ellipsis)
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Frozen(C):
+        __frozen__ = True
+
+    assert sorted(C.autoproperties()) == ["a", "b", "c"] and C(1, 2, 3).todict() == {"a": 1, "b": 2, "c": 3}
+    assert C(1, 2, 3).clone(c=4).totuple() == C(1, 2, 4).totuple()
+    assert Frozen(1, 2, 3) != Frozen(1, 5, 3) and Frozen(1, 2, 3) == Frozen(1, 2, 3)
+    with pytest.raises(AttributeError):
+        Frozen(1, 2, 3).b = 5
+
+
+def test_memory_usage():
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Point(object):
+        __slots__ = ()
+
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        x = property(Ellipsis, Ellipsis)
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        y = property(Ellipsis, Ellipsis)
+        z = property(lambda self: 0)
+
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class User(object):
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        name = property(Ellipsis, Ellipsis)
+
+    kept = Point()
+    kept.x, kept.y = [1, {"a": 2}], 3
+    for i in range(3):
+        Point().x = [i]
+
+    usage = pm.memoryusage(Point)[properties._qualname(Point)]["properties"]
+    assert sorted(usage) == ["x", "y"] and (usage["x"]["storage"], usage["x"]["entries"], usage["x"]["stale"]) == (
+        "keyed", 4, 3)
+    assert usage["y"]["entries"] == 1 and usage["y"]["stale"] == 0 and usage["x"]["bytes"] > usage["y"]["bytes"]
+    deep = pm.memoryusage(Point, deep=True)[properties._qualname(Point)]["properties"]
+    assert deep["x"]["bytes"] > usage["x"]["bytes"]
+    assert pm.memoryusage(User)[properties._qualname(User)]["properties"]["name"] == {
+        "storage": "instance", "entries": 0, "bytes": 0, "stale": 0}
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Admin(User):
+        pass
+
+    users, name = [User(), User(), Admin()], "x" * 100
+    users[0].name = users[2].name = name
+    usage = pm.memoryusage(User)[properties._qualname(User)]["properties"]["name"]
+    assert usage == {"storage": "instance", "entries": 2, "bytes": 2 * sys.getsizeof(name), "stale": 0}
+    assert pm.memoryusage(User, deep=True)[properties._qualname(User)]["properties"]["name"]["bytes"] == sys.getsizeof(
+        name)  # every object is accounted once
+    assert pm.memoryusage(Admin)[properties._qualname(Admin)]["properties"]["name"]["entries"] == 1
+
+    stale = Point.staleinstances()
+    assert len(stale) == 3 and kept not in stale
+    for point in stale:
+        del point.x
+
+    del stale, point
+    assert Point.staleinstances() == [] and pm.memoryusage(Point)[properties._qualname(Point)]["properties"]["x"][
+        "entries"] == 1
+    text = pm.memoryusage(fmt="prometheus")
+    assert 'pymagic9_property_store_entries{class="%s",property="x",storage="keyed"} 1' % properties._qualname(
+        Point) in text
+    assert 'pymagic9_property_store_entries{class="%s",property="name",storage="instance"} 2' % properties._qualname(
+        User) in text
+    del users
+    assert pm.memoryusage(User)[properties._qualname(User)]["properties"]["name"]["entries"] == 0
+    with pytest.raises(ValueError):
+        pm.memoryusage(fmt="xml")
+
+
+# noinspection PyMissingOrEmptyDocstring,PyUnresolvedReferences
+@pytest.mark.parametrize("timing", [False, True])
+def test_instrument(timing):
+    @add_metaclass(pm.PropertyMeta)
+    # noinspection PyMissingOrEmptyDocstring
+    class Base(object):
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        x = property(Ellipsis, Ellipsis)
+
+    # noinspection PyMissingOrEmptyDocstring
+    class Sub(Base):
+        # noinspection PyTypeChecker,PyPropertyDefinition
+        y = property(Ellipsis, Ellipsis)
+
+    fast = dict(Sub.__dict__)
+    pm.instrument(Sub, timing=timing)
+    try:
+        instance = Sub()
+        instance.x = instance.y = 1
+        assert instance.x == 1
+        del instance.x
+
+        stats = pm.accessstats(Sub)[properties._qualname(Sub)]["properties"]
+        assert (stats["x"]["reads"], stats["x"]["writes"], stats["x"]["deletes"]) == (1, 1, 1)
+        assert (stats["y"]["reads"], stats["y"]["writes"], stats["y"]["deletes"]) == (0, 1, 0)
+        assert ("read_seconds" in stats["x"]) is timing and pm.accessstats(Base) == {}
+
+        text = pm.accessstats(fmt="prometheus")
+        labels = 'class="%s",property="x",access="read"' % properties._qualname(Sub)
+        assert "pymagic9_property_accesses_total{%s} 1" % labels in text
+        assert ("pymagic9_property_access_seconds_total" in text) is timing
+
+        # noinspection PyMissingOrEmptyDocstring
+        class Leaf(Sub):  # created while the base is instrumented
+            pass
+
+        assert Leaf.autoproperties() == ("x", "y")
+    finally:
+        pm.uninstrument(Sub)
+
+    assert dict(Sub.__dict__) == fast and pm.accessstats(Sub) == {}
+
+    with pytest.raises(ValueError, match=r"unknown format 'xml'"):
+        pm.accessstats(fmt="xml")
+
+    with pytest.raises(TypeError, match=r"'cls' must be created by the PropertyMeta metaclass"):
+        pm.instrument(object)
+
+
+# noinspection PyMissingOrEmptyDocstring,PyUnresolvedReferences
+def test_instrument_globally():
+    import copy
+
+    pm.instrument()
+    try:
+        @add_metaclass(pm.PropertyMeta)
+        # noinspection PyMissingOrEmptyDocstring
+        class _(object):
+            # noinspection PyTypeChecker,PyPropertyDefinition
+            x = property(Ellipsis, Ellipsis)
+
+        _().x = 1
+        assert pm.accessstats()[properties._qualname(_)]["properties"]["x"]["writes"] == 1
+
+        # noinspection PyMissingOrEmptyDocstring
+        class Sub(_):
+            __slots__ = ()
+
+            # noinspection PyTypeChecker,PyPropertyDefinition
+            y = property(Ellipsis, Ellipsis)
+
+        sub = Sub()
+        sub.x, sub.y = 1, 2
+        assert Sub.autoproperties() == ("x", "y") and sub.todict() == {"x": 1, "y": 2}
+        assert copy.copy(sub).todict() == {"x": 1, "y": 2}
+    finally:
+        pm.uninstrument()
+
+    assert Sub.autoproperties() == ("x", "y") and copy.copy(sub).todict() == {"x": 1, "y": 2}
+
+    assert pm.accessstats() == {} and _.__dict__["x"] is _._PropertyMeta__plans["x"].prop
+
+
+def test_lazy_exports():
+    import pymagic9
+
+    for name in pymagic9.__all__:
+        assert getattr(pymagic9, name) is getattr(pm, name) and name in dir(pymagic9)
+
+    with pytest.raises(AttributeError, match=r"module 'pymagic9' has no attribute 'unknown'"):
+        getattr(pymagic9, "unknown")